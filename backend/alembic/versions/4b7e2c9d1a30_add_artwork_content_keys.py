@@ -0,0 +1,30 @@
+"""Add artwork content keys
+
+Revision ID: 4b7e2c9d1a30
+Revises: 991395711148
+Create Date: 2026-10-17 10:12:41.532118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2c9d1a30'
+down_revision: Union[str, None] = '991395711148'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('artworks', sa.Column('name_key', sa.String(length=200), nullable=True))
+    op.add_column('artworks', sa.Column('year_text', sa.String(length=50), nullable=True))
+    op.create_index(op.f('ix_artworks_name_key'), 'artworks', ['name_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_artworks_name_key'), table_name='artworks')
+    op.drop_column('artworks', 'year_text')
+    op.drop_column('artworks', 'name_key')
@@ -0,0 +1,42 @@
+"""Add artwork catalog columns
+
+Revision ID: 7c1d5e8f2a64
+Revises: 4b7e2c9d1a30
+Create Date: 2026-10-17 14:03:18.204615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1d5e8f2a64'
+down_revision: Union[str, None] = '4b7e2c9d1a30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('artworks', sa.Column('external_id', sa.String(length=50), nullable=True))
+    op.add_column('artworks', sa.Column('period', sa.String(length=100), nullable=True))
+    op.add_column('artworks', sa.Column('style', sa.String(length=100), nullable=True))
+    op.add_column('artworks', sa.Column('culture', sa.String(length=100), nullable=True))
+    op.add_column('artworks', sa.Column('medium', sa.String(length=255), nullable=True))
+    op.create_index(op.f('ix_artworks_external_id'), 'artworks', ['external_id'], unique=True)
+    op.create_index(op.f('ix_artworks_period'), 'artworks', ['period'], unique=False)
+    op.create_index(op.f('ix_artworks_style'), 'artworks', ['style'], unique=False)
+    op.create_index(op.f('ix_artworks_culture'), 'artworks', ['culture'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_artworks_culture'), table_name='artworks')
+    op.drop_index(op.f('ix_artworks_style'), table_name='artworks')
+    op.drop_index(op.f('ix_artworks_period'), table_name='artworks')
+    op.drop_index(op.f('ix_artworks_external_id'), table_name='artworks')
+    op.drop_column('artworks', 'medium')
+    op.drop_column('artworks', 'culture')
+    op.drop_column('artworks', 'style')
+    op.drop_column('artworks', 'period')
+    op.drop_column('artworks', 'external_id')
@@ -0,0 +1,130 @@
+"""
+Artwork Catalog for ArtStoryAI
+Shared, versioned snapshot of every artwork known to the recommendation system
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogSnapshot(tuple):
+    """
+    Immutable list of catalog artworks tagged with a version number.
+
+    Snapshots are shared between requests: callers must treat the artwork
+    dicts as read-only and copy before modifying.
+    """
+
+    def __new__(cls, artworks: Iterable[Dict], version: int):
+        snapshot = super().__new__(cls, artworks)
+        snapshot.version = version
+        return snapshot
+
+
+class ArtworkCatalog:
+    """Builds the catalog once and rebuilds it only when its sources change"""
+
+    def __init__(self):
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._source_version: Optional[Tuple[int, int]] = None
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _current_source_version() -> Tuple[int, int]:
+        from app.manual_artworks import manual_artwork_manager
+        from app.manual_image_manager import manual_image_manager
+        return (manual_artwork_manager.version, manual_image_manager.version)
+
+    @staticmethod
+    def _manual_artworks() -> list:
+        """Manuel eserleri katalog formatına çevirir"""
+        from app.manual_artworks import manual_artwork_manager
+
+        artworks = []
+        for art_name, artwork_data in list(manual_artwork_manager.manual_artworks.items()):
+            artworks.append({
+                'art_name': art_name,
+                'artist': artwork_data.get('artist', 'Unknown'),
+                'year': artwork_data.get('year', 0),
+                'movement': artwork_data.get('movement', 'Unknown'),
+                'story': artwork_data.get('story', ''),
+                'image_url': artwork_data.get('image_url', ''),
+                'style': artwork_data.get('style', ''),
+                'technique': artwork_data.get('style', ''),
+                'dimensions': '',
+                'location': artwork_data.get('museum', ''),
+                'value': '',
+                'significance': artwork_data.get('description', ''),
+                'source': 'manual'
+            })
+        return artworks
+
+    @staticmethod
+    def _recommendation_artworks() -> list:
+        """Recommendation system eserlerini katalog formatına çevirir"""
+        from app.recommendation_system import recommendation_system
+
+        artworks = []
+        for art_name, features in getattr(recommendation_system, 'artwork_features', {}).items():
+            artworks.append({
+                'art_name': art_name,
+                'artist': features.get('artist', 'Unknown'),
+                'year': features.get('year', 0),
+                'movement': features.get('movement', 'Unknown'),
+                'story': features.get('description', ''),
+                'image_url': features.get('image_url', ''),
+                'style': features.get('style', ''),
+                'technique': features.get('technique', ''),
+                'dimensions': features.get('dimensions', ''),
+                'location': features.get('location', ''),
+                'value': features.get('value', ''),
+                'significance': features.get('significance', ''),
+                'source': 'recommendation'
+            })
+        return artworks
+
+    def _build(self) -> list:
+        artworks = []
+        for loader in (self._manual_artworks, self._recommendation_artworks):
+            try:
+                artworks.extend(loader())
+            except Exception as e:
+                logger.error(f"Catalog source {loader.__name__} failed: {e}")
+        # Boş eserleri filtrele
+        return [artwork for artwork in artworks if artwork.get('art_name')]
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Current catalog; rebuilt only after manual artworks or images change"""
+        source_version = self._current_source_version()
+        snapshot = self._snapshot
+        if snapshot is not None and source_version == self._source_version:
+            return snapshot
+
+        with self._lock:
+            # Başka bir thread bu sırada yeniden oluşturmuş olabilir
+            source_version = self._current_source_version()
+            if self._snapshot is None or source_version != self._source_version:
+                self._version += 1
+                self._snapshot = CatalogSnapshot(self._build(), self._version)
+                self._source_version = source_version
+                logger.info(
+                    f"Artwork catalog v{self._version} built with {len(self._snapshot)} artworks"
+                )
+            return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next access"""
+        with self._lock:
+            self._source_version = None
+
+
+# Global instance
+artwork_catalog = ArtworkCatalog()
@@ -3,31 +3,33 @@ Artwork Service for ArtStoryAI
 Handles artwork information retrieval and processing
 """
 
+import asyncio
 import urllib.parse
-import json
-from typing import Dict, List, Optional
-from openai import OpenAI
-from app.features.image_sources import (
-    get_art_institute_image,
-    get_met_museum_image,
-    get_wikimedia_image,
-    search_artwork_image
-)
+from typing import Dict, Iterable, List, Optional, Sequence
+from app.artwork_catalog import artwork_catalog
+from app.cache_policy import NS_ARTWORK_IMAGE, NS_ARTWORK_INFO, cache_key, unwrap
+from app.cache_service import artwork_cache
+from app.features.image_resolver import image_resolver, PLACEHOLDER_IMAGE_URL
 from app.features.fallback import get_fallback_images
-from app.features.openai_story import (
-    generate_story_with_openai, 
-    generate_artist_bio_with_openai, 
-    generate_movement_desc_with_openai
-)
+from app.features.openai_story import generate_artwork_content_async
+from app.services.content_store import artwork_content_store
+from app.services.image_url_store import image_url_store
+from app.single_flight import image_flights, name_key
 # Cache temporarily disabled for stability
 from app.manual_artworks import manual_artwork_manager
 from app.manual_image_manager import manual_image_manager
 
+# Stale-while-revalidate süreleri (saniye): soft sonrası arka planda yenilenir, hard sonrası silinir
+ARTWORK_INFO_SOFT_TTL = 3600
+ARTWORK_INFO_HARD_TTL = 24 * 3600
+IMAGE_URL_SOFT_TTL = 6 * 3600
+IMAGE_URL_HARD_TTL = 7 * 24 * 3600
+
 class ArtworkService:
     """Service class for handling artwork operations"""
     
     @staticmethod
-    def get_artwork_image(art_name: str) -> str:
+    async def get_artwork_image(art_name: str) -> str:
         """Get artwork image URL from various sources"""
         decoded_name = urllib.parse.unquote(art_name)
         
@@ -38,13 +40,18 @@ class ArtworkService:
             # Local dosya yolu yerine API endpoint'i döndür
             return f"/manual-images/{decoded_name}"
         
-        # 2. Manuel eserlerde ara
+        # 2. Kayıtlı (daha önce çözümlenmiş / tohumlanmış) görsel URL'si
+        stored_image_url = image_url_store.get(decoded_name)
+        if stored_image_url:
+            return stored_image_url
+        
+        # 3. Manuel eserlerde ara
         manual_artwork = manual_artwork_manager.get_manual_artwork(decoded_name)
         if manual_artwork and manual_artwork.get("image_url"):
             print(f"Manuel eser resmi bulundu: {decoded_name}")
             return manual_artwork["image_url"]
         
-        # 3. Recommendation system'de görsel var mı kontrol et
+        # 4. Recommendation system'de görsel var mı kontrol et
         try:
             from app.recommendation_system import recommendation_system
             if decoded_name in recommendation_system.artwork_features:
@@ -55,62 +62,91 @@ class ArtworkService:
         except Exception as e:
             print(f"Recommendation system kontrol hatası: {e}")
         
-        # 4. Fallback görseli dene
+        # 5. Fallback görseli dene
         image_url = get_fallback_images(decoded_name)
         
-        # 5. Fallback yoksa gelişmiş arama sistemi
-        if not image_url:
-            image_url = search_artwork_image(decoded_name)
-        
-        # 6. Hala yoksa diğer API'leri sırayla dene
+        # 6. Fallback yoksa tüm API'leri ve isim varyasyonlarını eşzamanlı sorgula
         if not image_url:
-            image_url = get_art_institute_image(decoded_name)
-        if not image_url:
-            image_url = get_met_museum_image(decoded_name)
-        if not image_url:
-            image_url = get_wikimedia_image(decoded_name)
-            # Alternatif isimlerle dene
-            if not image_url:
-                alternatives = [
-                    "The " + decoded_name,
-                    decoded_name + " painting",
-                    decoded_name + " (painting)",
-                    decoded_name.replace("'", ""),
-                ]
-                for alt_name in alternatives:
-                    image_url = get_wikimedia_image(alt_name)
-                    if image_url:
-                        break
+            image_url = await artwork_cache.get_or_refresh(
+                cache_key(NS_ARTWORK_IMAGE, name_key(decoded_name)),
+                lambda: ArtworkService._resolve_image(decoded_name),
+                soft_ttl=IMAGE_URL_SOFT_TTL,
+                hard_ttl=IMAGE_URL_HARD_TTL
+            )
         
         # 7. Hiçbiri bulunamazsa placeholder resim
         if not image_url:
-            image_url = "https://upload.wikimedia.org/wikipedia/commons/thumb/a/ac/No_image_available.svg/300px-No_image_available.svg.png"
+            image_url = PLACEHOLDER_IMAGE_URL
+        
+        return image_url
+    
+    @staticmethod
+    async def get_cached_image_urls(art_names: Iterable[str]) -> Dict[str, str]:
+        """Daha önce çözümlenmiş görsel URL'lerini tek önbellek round-trip'inde getirir (listeler için)"""
+        image_urls = {}
+        keys = {}
+        for art_name in art_names:
+            if not art_name:
+                continue
+            stored_image_url = image_url_store.get(art_name)
+            if stored_image_url:
+                image_urls[art_name] = stored_image_url
+            else:
+                keys[art_name] = cache_key(NS_ARTWORK_IMAGE, name_key(art_name))
         
+        found = await artwork_cache.get_many(keys.values()) if keys else {}
+        for art_name, key in keys.items():
+            image_url = unwrap(found.get(key))
+            if image_url:
+                image_urls[art_name] = image_url
+        return image_urls
+    
+    @staticmethod
+    async def _resolve_image(decoded_name: str) -> Optional[str]:
+        # Aynı eser için eşzamanlı istekler tek bir çözümlemeyi bekler
+        return await image_flights.do(
+            name_key(decoded_name), lambda: ArtworkService._resolve_and_record(decoded_name)
+        )
+    
+    @staticmethod
+    async def _resolve_and_record(decoded_name: str) -> Optional[str]:
+        resolved = await image_resolver.resolve_with_provider(decoded_name)
+        if not resolved:
+            return None
+        image_url, provider = resolved
+        await image_url_store.record(decoded_name, image_url, provider)
         return image_url
     
     @staticmethod
-    def generate_artwork_content(art_name: str) -> Dict[str, str]:
+    async def generate_artwork_content(art_name: str) -> Dict:
         """Generate AI content for artwork"""
         decoded_name = urllib.parse.unquote(art_name)
         
-        # AI ile tüm bilgileri üret
-        story = generate_story_with_openai(decoded_name)
-        artist_bio = generate_artist_bio_with_openai(decoded_name)
-        movement_desc = generate_movement_desc_with_openai(decoded_name)
-        artwork_details = generate_artwork_details_with_openai(decoded_name)
-        
-        return {
-            "story": story,
-            "artist_bio": artist_bio,
-            "movement_desc": movement_desc,
-            "artwork_details": artwork_details
-        }
+        # AI ile tüm bilgileri eşzamanlı (veya tek yapılandırılmış istekle) üret
+        return await generate_artwork_content_async(decoded_name)
     
     @staticmethod
-    def get_artwork_info(art_name: str) -> Dict:
-        """Get complete artwork information with fuzzy matching"""
+    async def get_artwork_info(art_name: str) -> Dict:
+        """Get complete artwork information (stale-while-revalidate cached)"""
         decoded_name = urllib.parse.unquote(art_name)
-        
+        info = await artwork_cache.get_or_refresh(
+            cache_key(NS_ARTWORK_INFO, name_key(decoded_name)),
+            lambda: ArtworkService._build_artwork_info(decoded_name),
+            soft_ttl=ARTWORK_INFO_SOFT_TTL,
+            hard_ttl=ARTWORK_INFO_HARD_TTL,
+            cacheable=ArtworkService._is_cacheable_info
+        )
+        # Anahtar normalize ad; yanıt istenen yazımı taşır
+        return {**info, "art_name": decoded_name}
+    
+    @staticmethod
+    def _is_cacheable_info(info: Dict) -> bool:
+        """Yedek (eksik) AI içeriği önbelleğe alınmaz, sonraki istekte yeniden üretilir"""
+        return info.get("source") == "manual" or artwork_content_store.is_complete(info)
+    
+    @staticmethod
+    async def _build_artwork_info(decoded_name: str) -> Dict:
+        """Get complete artwork information with fuzzy matching"""
         # Önce manuel eserlerde ara (fuzzy match ile)
         manual_artwork = manual_artwork_manager.get_manual_artwork(decoded_name)
         if manual_artwork:
@@ -141,17 +177,28 @@ class ArtworkService:
                 "source": "manual"
             }
         
-        # Manuel eser bulunamazsa AI ile üret
-        print(f"❌ Manuel eser bulunamadı, AI ile üretiliyor: {decoded_name}")
-        
-        # Get image (direct call)
-        image_url = ArtworkService.get_artwork_image(decoded_name)
+        # Manuel eser bulunamazsa kayıtlı AI içeriğini kullan, yoksa üret
+        record = await artwork_content_store.get_or_generate(
+            decoded_name,
+            lambda: ArtworkService.generate_ai_artwork(decoded_name)
+        )
         
-        # Generate content (direct call)
-        content = ArtworkService.generate_artwork_content(decoded_name)
+        return {
+            **{k: v for k, v in record.items() if k != "updated_at"},
+            "art_name": decoded_name,
+            "similar_artworks": get_similar_artworks(decoded_name, record)
+        }
+
+    @staticmethod
+    async def generate_ai_artwork(decoded_name: str) -> Dict:
+        """Eser kaydını görsel çözümleme ve AI içerik üretimiyle oluşturur"""
+        print(f"❌ Manuel eser bulunamadı, AI ile üretiliyor: {decoded_name}")
         
-        # Get similar artworks
-        similar_artworks = get_similar_artworks(decoded_name, content["artwork_details"])
+        # Görsel çözümleme ve içerik üretimi birbirinden bağımsız, aynı anda çalışır
+        image_url, content = await asyncio.gather(
+            ArtworkService.get_artwork_image(decoded_name),
+            ArtworkService.generate_artwork_content(decoded_name)
+        )
         
         return {
             "art_name": decoded_name,
@@ -163,163 +210,18 @@ class ArtworkService:
             "story": content["story"],
             "artist_bio": content["artist_bio"],
             "movement_desc": content["movement_desc"],
-            "similar_artworks": similar_artworks,
             "source": "ai"
         }
 
     @staticmethod
-    def get_all_artworks() -> List[Dict]:
-        """Get all available artworks for recommendation system"""
-        try:
-            # Manuel eserlerden başla - eser verilerini al, sadece isimleri değil
-            manual_artworks = []
-            try:
-                from app.manual_artworks import manual_artwork_manager
-                # Tüm manuel eserleri al
-                for art_name in manual_artwork_manager.get_all_manual_artworks():
-                    artwork_data = manual_artwork_manager.get_manual_artwork(art_name)
-                    if artwork_data:
-                        manual_artworks.append({
-                            'art_name': art_name,
-                            'artist': artwork_data.get('artist', 'Unknown'),
-                            'year': artwork_data.get('year', 0),
-                            'movement': artwork_data.get('movement', 'Unknown'),
-                            'story': artwork_data.get('story', ''),
-                            'image_url': artwork_data.get('image_url', ''),
-                            'style': artwork_data.get('style', ''),
-                            'technique': artwork_data.get('style', ''),
-                            'dimensions': '',
-                            'location': artwork_data.get('museum', ''),
-                            'value': '',
-                            'significance': artwork_data.get('description', '')
-                        })
-            except Exception as e:
-                print(f"Manuel eser veri alma hatası: {e}")
-            
-            print(f"Manuel eserler bulundu: {len(manual_artworks)}")
-            
-            # Recommendation system'den eserleri al
-            recommendation_artworks = []
-            try:
-                from app.recommendation_system import recommendation_system
-                if hasattr(recommendation_system, 'artwork_features'):
-                    for art_name, features in recommendation_system.artwork_features.items():
-                        recommendation_artworks.append({
-                            'art_name': art_name,
-                            'artist': features.get('artist', 'Unknown'),
-                            'year': features.get('year', 0),
-                            'movement': features.get('movement', 'Unknown'),
-                            'story': features.get('description', ''),
-                            'image_url': features.get('image_url', ''),
-                            'style': features.get('style', ''),
-                            'technique': features.get('technique', ''),
-                            'dimensions': features.get('dimensions', ''),
-                            'location': features.get('location', ''),
-                            'value': features.get('value', ''),
-                            'significance': features.get('significance', '')
-                        })
-            except Exception as e:
-                print(f"Recommendation system veri alma hatası: {e}")
-            
-            print(f"Recommendation system eserleri: {len(recommendation_artworks)}")
-            
-            # Tüm eserleri birleştir
-            all_artworks = manual_artworks + recommendation_artworks
-            
-            # Boş eserleri filtrele
-            all_artworks = [art for art in all_artworks if art.get('art_name')]
-            
-            print(f"Toplam {len(all_artworks)} eser bulundu")
-            
-            # Debug: İlk birkaç eseri göster
-            if all_artworks:
-                print("İlk eserler:")
-                for i, artwork in enumerate(all_artworks[:3]):
-                    print(f"  {i+1}. {artwork.get('art_name')} - {artwork.get('artist')}")
-            
-            return all_artworks
-            
-        except Exception as e:
-            print(f"get_all_artworks hatası: {e}")
-            import traceback
-            traceback.print_exc()
-            # Fallback: Manuel eserlerden sadece temel bilgileri döndür
-            try:
-                from app.manual_artworks import manual_artwork_manager
-                fallback_artworks = []
-                for art_name in manual_artwork_manager.get_all_manual_artworks():
-                    artwork_data = manual_artwork_manager.get_manual_artwork(art_name)
-                    if artwork_data:
-                        fallback_artworks.append({
-                            'art_name': art_name,
-                            'artist': artwork_data.get('artist', 'Unknown'),
-                            'year': artwork_data.get('year', 0),
-                            'movement': artwork_data.get('movement', 'Unknown'),
-                            'story': artwork_data.get('story', ''),
-                            'image_url': artwork_data.get('image_url', ''),
-                            'style': '',
-                            'technique': '',
-                            'dimensions': '',
-                            'location': '',
-                            'value': '',
-                            'significance': ''
-                        })
-                print(f"Fallback: {len(fallback_artworks)} eser bulundu")
-                return fallback_artworks
-            except Exception as fallback_error:
-                print(f"Fallback hatası: {fallback_error}")
-                return []
-
-def generate_artwork_details_with_openai(art_name: str) -> Dict:
-    """Generate artwork details using OpenAI"""
-    try:
-        import os
-        from dotenv import load_dotenv
-        load_dotenv()
-        
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
-        prompt = f"""
-        Aşağıdaki sanat eseri için JSON formatında bilgi ver:
-        {{
-            "artist": "Sanatçı adı",
-            "year": "Yapım yılı",
-            "movement": "Sanat akımı",
-            "museum": "Bulunduğu müze"
-        }}
-        
-        Sanat eseri: {art_name}
-        
-        Örnek format:
-        {{
-            "artist": "Vincent van Gogh",
-            "year": "1889",
-            "movement": "Post-İzlenimcilik",
-            "museum": "Museum of Modern Art, New York"
-        }}
+    def get_all_artworks() -> Sequence[Dict]:
         """
+        Get all available artworks for recommendation system
 
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "Sen bir sanat tarihi uzmanısın. Sadece JSON formatında cevap ver."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=200,
-            temperature=0.3
-        )
-
-        result = json.loads(response.choices[0].message.content)
-        return result
-
-    except Exception as e:
-        print(f"OpenAI API hatası (sanat eseri detayları): {e}")
-        return {
-            "artist": "AI ile üretiliyor...",
-            "year": "AI ile üretiliyor...",
-            "movement": "AI ile üretiliyor...",
-            "museum": "AI ile üretiliyor..."
-        }
+        Returns the shared catalog snapshot; it is rebuilt only when manual
+        artworks or images change, so callers must not modify it.
+        """
+        return artwork_catalog.snapshot()
 
 def get_similar_artworks(art_name: str, artwork_details: dict) -> List[Dict]:
     """Benzer sanat eserlerini bulur - Yeni embedding tabanlı sistem kullanır"""
@@ -0,0 +1,72 @@
+"""
+BK-Tree for ArtStoryAI
+Hamming distance index for 64-bit perceptual hashes
+
+Her düğümün çocukları, düğüme olan uzaklıklarına göre tutulur. Üçgen
+eşitsizliği sayesinde arama yalnızca |d - r| .. d + r aralığındaki
+çocuklara iner; küçük eşiklerde ağacın çok küçük bir kısmı ziyaret edilir.
+"""
+
+from typing import Dict, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def hamming(a: int, b: int) -> int:
+    """İki hash arasındaki farklı bit sayısı"""
+    return bin(a ^ b).count("1")
+
+
+class _Node(Generic[T]):
+    __slots__ = ("value", "items", "children")
+
+    def __init__(self, value: int, item: T):
+        self.value = value
+        self.items: List[T] = [item]
+        self.children: Dict[int, "_Node[T]"] = {}
+
+
+class BKTree(Generic[T]):
+    """Metric tree over integer hashes; equal hashes share one node"""
+
+    def __init__(self):
+        self._root: Optional[_Node[T]] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int, item: T) -> None:
+        self._size += 1
+        if self._root is None:
+            self._root = _Node(value, item)
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node.value)
+            if distance == 0:
+                node.items.append(item)
+                return
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _Node(value, item)
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, T]]:
+        """max_distance içindeki (uzaklık, öğe) çiftleri, yakından uzağa"""
+        results: List[Tuple[int, T]] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node.value)
+            if distance <= max_distance:
+                results.extend((distance, item) for item in node.items)
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for d, child in node.children.items() if low <= d <= high)
+        results.sort(key=lambda pair: pair[0])
+        return results
+
+    def nearest(self, value: int, max_distance: int) -> Optional[Tuple[int, T]]:
+        results = self.search(value, max_distance)
+        return results[0] if results else None
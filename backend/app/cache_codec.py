@@ -0,0 +1,91 @@
+"""
+Cache Codec for ArtStoryAI
+Önbellek değerleri için kompakt ikili serileştirme
+
+Biçim: 2 baytlık başlık + gövde
+- 1. bayt: b"M" msgpack, b"J" JSON (orjson varsa orjson ile)
+- 2. bayt: b"Z" zstd ile sıkıştırılmış, b"0" ham
+msgpack, orjson ve zstandard isteğe bağlıdır; kurulu olmayanlar atlanır.
+Başlıksız değerler eski JSON metni olarak okunur.
+"""
+
+import json
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+FORMAT_MSGPACK = b"M"
+FORMAT_JSON = b"J"
+COMPRESSION_ZSTD = b"Z"
+COMPRESSION_NONE = b"0"
+
+# Bu boyutun üzerindeki gövdeler (ör. hikaye metinleri) sıkıştırılır
+ZSTD_MIN_BYTES = 2048
+ZSTD_LEVEL = 3
+
+_compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL) if zstandard else None
+_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+
+def _dumps_json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _loads_json(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def encode(value: Any) -> bytes:
+    """Değeri başlıklı ikili gövdeye çevirir"""
+    if msgpack is not None:
+        fmt = FORMAT_MSGPACK
+        body = msgpack.packb(value, use_bin_type=True, default=str)
+    else:
+        fmt = FORMAT_JSON
+        body = _dumps_json(value)
+
+    if _compressor is not None and len(body) >= ZSTD_MIN_BYTES:
+        return fmt + COMPRESSION_ZSTD + _compressor.compress(body)
+    return fmt + COMPRESSION_NONE + body
+
+
+def decode(raw: bytes) -> Any:
+    """encode çıktısını (veya eski JSON metnini) çözer"""
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    fmt, compression, body = raw[:1], raw[1:2], raw[2:]
+
+    if fmt not in (FORMAT_MSGPACK, FORMAT_JSON) or compression not in (COMPRESSION_ZSTD, COMPRESSION_NONE):
+        # Başlıksız: eski sürümlerin yazdığı JSON metni
+        return _loads_json(raw)
+
+    if compression == COMPRESSION_ZSTD:
+        if _decompressor is None:
+            raise ValueError("zstd ile sıkıştırılmış değer için zstandard gerekli")
+        body = _decompressor.decompress(body)
+
+    if fmt == FORMAT_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack değeri için msgpack gerekli")
+        return msgpack.unpackb(body, raw=False)
+    return _loads_json(body)
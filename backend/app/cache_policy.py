@@ -0,0 +1,109 @@
+"""
+Cache Policy for ArtStoryAI
+Stale-while-revalidate okuma ve TTL jitter yardımcıları
+
+Değerler bir zarf içinde saklanır: {"value": ..., "refresh_at": zaman}.
+- refresh_at (soft TTL) geçmeden: değer doğrudan döner
+- soft TTL geçtiyse: eski değer hemen döner, arka planda yenilenir
+- hard TTL: arka uçtaki gerçek TTL; dolunca kayıt silinir, sonraki istek
+  değeri senkron olarak üretir
+Aynı anahtarın eşzamanlı üretimi/yenilemesi tek uçuşta birleştirilir.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional, Set, TypeVar
+
+from app.single_flight import refresh_flights
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# TTL'lere uygulanan rastgele sapma oranı (±%10)
+DEFAULT_JITTER = 0.1
+
+ENVELOPE_VALUE = "value"
+ENVELOPE_REFRESH_AT = "refresh_at"
+
+# Önbellek anahtar şeması: "<ad alanı>:<parça>:..." (Redis'te ayrıca REDIS_KEY_PREFIX eklenir)
+NS_ARTWORK_INFO = "artwork_info"
+NS_ARTWORK_IMAGE = "artwork_image"
+NS_ARTWORK_RECORD = "artwork_record"
+NS_SIMILAR = "similar"
+NS_MEMO = "memo"
+
+# Çalışan arka plan yenilemeleri (görevler çöp toplanmasın diye tutulur)
+_background_refreshes: Set[asyncio.Task] = set()
+
+
+def cache_key(namespace: str, *parts: Any) -> str:
+    """Tüm önbellek katmanlarında ortak anahtar biçimi"""
+    return ":".join([namespace, *(str(part) for part in parts)])
+
+
+def jittered(ttl: float, jitter: float = DEFAULT_JITTER) -> float:
+    """Birlikte yazılan kayıtların aynı anda düşmemesi için TTL'i rastgele kaydırır"""
+    if not ttl or jitter <= 0:
+        return ttl
+    return ttl * random.uniform(1 - jitter, 1 + jitter)
+
+
+def _is_envelope(entry: Any) -> bool:
+    return isinstance(entry, dict) and ENVELOPE_REFRESH_AT in entry and ENVELOPE_VALUE in entry
+
+
+def unwrap(entry: Any) -> Any:
+    """get_or_refresh ile yazılmış kaydın değeri (toplu okumalar için)"""
+    return entry[ENVELOPE_VALUE] if _is_envelope(entry) else entry
+
+
+async def _load_and_store(cache, key: str, loader: Callable[[], Awaitable[T]],
+                          soft_ttl: float, hard_ttl: float,
+                          cacheable: Optional[Callable[[T], bool]]) -> T:
+    value = await loader()
+    if value is not None and (cacheable is None or cacheable(value)):
+        soft = jittered(soft_ttl)
+        # Kayıt, yenilenme anından en az soft TTL kadar sonra silinir
+        hard = max(jittered(hard_ttl), soft + 1)
+        envelope = {ENVELOPE_VALUE: value, ENVELOPE_REFRESH_AT: time.time() + soft}
+        await cache.set(key, envelope, int(hard))
+    return value
+
+
+def _schedule_refresh(cache, key: str, loader, soft_ttl: float, hard_ttl: float, cacheable) -> None:
+    async def _refresh():
+        try:
+            await refresh_flights.do(
+                key, lambda: _load_and_store(cache, key, loader, soft_ttl, hard_ttl, cacheable)
+            )
+        except Exception as e:
+            logger.warning(f"Background cache refresh failed for {key}: {e}")
+
+    task = asyncio.create_task(_refresh())
+    _background_refreshes.add(task)
+    task.add_done_callback(_background_refreshes.discard)
+
+
+async def get_or_refresh(cache, key: str, loader: Callable[[], Awaitable[T]],
+                         soft_ttl: float, hard_ttl: Optional[float] = None,
+                         cacheable: Optional[Callable[[T], bool]] = None) -> T:
+    """
+    Stale-while-revalidate okuma.
+
+    cache: async get(key) / set(key, value, ttl) sağlayan herhangi bir
+    önbellek (ArtworkCache, SimpleCacheService, RedisCacheService).
+    cacheable: False dönerse sonuç saklanmaz (ör. yedek içerik).
+    """
+    hard_ttl = hard_ttl or soft_ttl * 4
+    entry = await cache.get(key)
+    if _is_envelope(entry):
+        if time.time() >= entry[ENVELOPE_REFRESH_AT] and key not in refresh_flights:
+            _schedule_refresh(cache, key, loader, soft_ttl, hard_ttl, cacheable)
+        return entry[ENVELOPE_VALUE]
+
+    return await refresh_flights.do(
+        key, lambda: _load_and_store(cache, key, loader, soft_ttl, hard_ttl, cacheable)
+    )
@@ -1,25 +1,34 @@
 """
 Cache Service for ArtStoryAI
-Provides hybrid caching (in-memory + Redis) for artwork information and images
+Provides two-tier caching for artwork information and images:
+L1 bounded in-process cache (W-TinyLFU, byte budget) and L2 Redis
 """
 
-import time
-from typing import Dict, Any, Optional
-from functools import lru_cache
+import os
+from typing import Dict, Any, Iterable, List, Mapping, Optional
 import hashlib
 import json
 import logging
 
+from app.cache_policy import get_or_refresh, jittered
+from app.memoize import memoize
+from app.memory_cache import TinyLFUCache
+
 logger = logging.getLogger(__name__)
 
+# L1 bellek bütçesi (bayt)
+DEFAULT_L1_MAX_BYTES = 64 * 1024 * 1024
+
 class ArtworkCache:
-    """Hybrid cache for artwork data (in-memory + Redis)"""
+    """Two-tier cache for artwork data (L1 in-memory + L2 Redis)"""
     
-    def __init__(self):
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.cache_ttl: Dict[str, float] = {}
+    def __init__(self, max_bytes: Optional[int] = None):
         self.default_ttl = 3600  # 1 saat
+        self.cache = TinyLFUCache(
+            max_bytes or int(os.getenv("ARTWORK_CACHE_MAX_BYTES", DEFAULT_L1_MAX_BYTES))
+        )
         self.redis_enabled = False
+        self.l2_hits = 0
         
         # Try to import Redis cache
         try:
@@ -35,118 +44,158 @@ class ArtworkCache:
         """Generate cache key from data"""
         return hashlib.md5(data.encode()).hexdigest()
     
+    def _promote(self, key: str, value: Any, remaining: Optional[float]) -> None:
+        """L2 kaydını L1'e taşır; L1 kopyası Redis'te kalan süreden uzun yaşamaz"""
+        ttl = self.default_ttl if remaining is None else min(remaining, self.default_ttl)
+        if ttl >= 1:
+            self.cache.set(key, value, ttl)
+    
     async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache if not expired (Redis first, then in-memory)"""
-        # Try Redis first if available
+        """Get value from cache (L1 first, then Redis; L2 hits are promoted to L1)"""
+        value = self.cache.get(key)
+        if value is not None:
+            logger.debug(f"L1 cache hit for key: {key}")
+            return value
+        
         if self.redis_enabled and self.redis_cache:
             try:
-                redis_result = await self.redis_cache.get(key)
-                if redis_result is not None:
-                    logger.info(f"Redis cache hit for key: {key}")
-                    return redis_result
+                found = await self.redis_cache.get_with_ttl(key)
+                if found is not None:
+                    logger.debug(f"Redis cache hit for key: {key}")
+                    self.l2_hits += 1
+                    value, remaining = found
+                    self._promote(key, value, remaining)
+                    return value
             except Exception as e:
-                logger.warning(f"Redis get error, falling back to in-memory: {e}")
-        
-        # Fallback to in-memory cache
-        if key not in self.cache:
-            return None
-        
-        # Check if expired
-        if time.time() > self.cache_ttl.get(key, 0):
-            self.delete(key)
-            return None
+                logger.warning(f"Redis get error: {e}")
+        return None
+    
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Birden çok anahtar: L1'de tek geçiş, eksikler için tek Redis pipeline'ı (MGET + PTTL)"""
+        keys = list(dict.fromkeys(keys))
+        results = self.cache.get_many(keys)
+        missing = [key for key in keys if key not in results]
         
-        logger.info(f"In-memory cache hit for key: {key}")
-        return self.cache[key]
+        if missing and self.redis_enabled and self.redis_cache:
+            try:
+                found = await self.redis_cache.get_many_with_ttl(missing)
+                self.l2_hits += len(found)
+                for key, (value, remaining) in found.items():
+                    self._promote(key, value, remaining)
+                    results[key] = value
+            except Exception as e:
+                logger.warning(f"Redis mget error: {e}")
+        return results
     
     async def set(self, key: str, value: Any, ttl: int = None) -> None:
-        """Set value in cache with TTL (Redis first, then in-memory)"""
-        # Try Redis first if available
+        """Set value in both tiers with (jittered) TTL"""
+        ttl = int(jittered(ttl or self.default_ttl))
+        self.cache.set(key, value, ttl)
+        
         if self.redis_enabled and self.redis_cache:
             try:
-                await self.redis_cache.set(key, value, ttl or self.default_ttl)
-                logger.info(f"Value cached in Redis for key: {key}")
+                await self.redis_cache.set(key, value, ttl)
             except Exception as e:
-                logger.warning(f"Redis set error, falling back to in-memory: {e}")
+                logger.warning(f"Redis set error, value kept in memory only: {e}")
+    
+    async def set_many(self, items: Mapping[str, Any], ttl: int = None) -> None:
+        """Birden çok anahtarı iki katmana yazar (Redis'e tek pipeline ile)"""
+        ttl = int(jittered(ttl or self.default_ttl))
+        self.cache.set_many(items, ttl)
         
-        # Always set in in-memory cache as backup
-        self.cache[key] = value
-        self.cache_ttl[key] = time.time() + (ttl or self.default_ttl)
-        logger.info(f"Value cached in memory for key: {key}")
+        if self.redis_enabled and self.redis_cache:
+            try:
+                await self.redis_cache.set_many(items, ttl)
+            except Exception as e:
+                logger.warning(f"Redis pipeline set error, values kept in memory only: {e}")
+    
+    async def get_or_refresh(self, key: str, loader, soft_ttl: int, hard_ttl: int = None,
+                             cacheable=None) -> Any:
+        """Stale-while-revalidate: soft TTL sonrası eski değer döner, arka planda yenilenir"""
+        return await get_or_refresh(self, key, loader, soft_ttl, hard_ttl, cacheable)
     
     def delete(self, key: str) -> None:
-        """Delete key from cache"""
-        if key in self.cache:
-            del self.cache[key]
-        if key in self.cache_ttl:
-            del self.cache_ttl[key]
+        """Delete key from L1"""
+        self.cache.delete(key)
+    
+    async def invalidate(self, key: str) -> None:
+        """Delete key from both tiers"""
+        self.cache.delete(key)
+        if self.redis_enabled and self.redis_cache:
+            await self.redis_cache.delete(key)
     
     def clear(self) -> None:
-        """Clear all cache"""
+        """Clear L1 cache"""
         self.cache.clear()
-        self.cache_ttl.clear()
+    
+    def keys(self, limit: Optional[int] = None) -> List[str]:
+        """L1 anahtarları (en fazla limit kadar)"""
+        return self.cache.keys(limit)
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics"""
-        return {
-            "total_keys": len(self.cache),
-            "memory_usage": len(str(self.cache)),
-            "expired_keys": len([k for k, v in self.cache_ttl.items() if time.time() > v])
-        }
-    
-    # Sync methods for backward compatibility
+        """Get cache statistics (O(1): counters are maintained on every operation)"""
+        stats = self.cache.stats()
+        stats["l2_hits"] = self.l2_hits
+        return stats
+    
+    # Sync methods for backward compatibility (L1 only)
     def get_sync(self, key: str) -> Optional[Any]:
         """Synchronous version of get for backward compatibility"""
-        if key not in self.cache:
-            return None
-        
-        # Check if expired
-        if time.time() > self.cache_ttl.get(key, 0):
-            self.delete(key)
-            return None
-        
-        return self.cache[key]
+        return self.cache.get(key)
     
     def set_sync(self, key: str, value: Any, ttl: int = None) -> None:
         """Synchronous version of set for backward compatibility"""
-        self.cache[key] = value
-        self.cache_ttl[key] = time.time() + (ttl or self.default_ttl)
+        self.cache.set(key, value, jittered(ttl or self.default_ttl))
+    
+    # İki katmanlı sync erişim (Redis'e bloklayan istemciyle); sync memoize yolu için
+    def get_shared_sync(self, key: str) -> Optional[Any]:
+        """L1, yoksa Redis; Redis kaydı kalan süresiyle L1'e taşınır"""
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+        
+        if self.redis_enabled and self.redis_cache:
+            found = self.redis_cache.get_with_ttl_sync(key)
+            if found is not None:
+                self.l2_hits += 1
+                value, remaining = found
+                self._promote(key, value, remaining)
+                return value
+        return None
+    
+    def set_shared_sync(self, key: str, value: Any, ttl: int = None) -> None:
+        """Değeri iki katmana yazar (sync)"""
+        ttl = int(jittered(ttl or self.default_ttl))
+        self.cache.set(key, value, ttl)
+        if self.redis_enabled and self.redis_cache:
+            self.redis_cache.set_sync(key, value, ttl)
 
 # Global cache instance
 artwork_cache = ArtworkCache()
 
 # Decorator for caching functions
-def cache_result(ttl: int = 3600):
-    """Decorator to cache function results"""
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            cache_key = f"{func.__name__}:{hash(str(args) + str(kwargs))}"
-            
-            # Try to get from cache (sync version for backward compatibility)
-            cached_result = artwork_cache.get_sync(cache_key)
-            if cached_result is not None:
-                print(f"Cache hit for {func.__name__}")
-                return cached_result
-            
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            artwork_cache.set_sync(cache_key, result, ttl)
-            print(f"Cache miss for {func.__name__}, cached for {ttl}s")
-            
-            return result
-        return wrapper
-    return decorator
+def cache_result(ttl: int = 3600, **options):
+    """Decorator to cache function results (sync or async, stable keys); see app.memoize"""
+    return memoize(ttl=ttl, **options)
 
-# LRU cache for expensive operations
-@lru_cache(maxsize=1000)
-def get_cached_artwork_image(art_name: str) -> str:
+async def get_cached_artwork_image(art_name: str) -> str:
     """Cached version of artwork image retrieval"""
     from app.artwork_service import ArtworkService
-    return ArtworkService.get_artwork_image(art_name)
+    cache_key = f"artwork_image:{art_name}"
+    cached_url = artwork_cache.get_sync(cache_key)
+    if cached_url is not None:
+        return cached_url
+    image_url = await ArtworkService.get_artwork_image(art_name)
+    artwork_cache.set_sync(cache_key, image_url)
+    return image_url
 
-@lru_cache(maxsize=500)
-def get_cached_artwork_content(art_name: str) -> Dict[str, str]:
+async def get_cached_artwork_content(art_name: str) -> Dict[str, Any]:
     """Cached version of artwork content generation"""
     from app.artwork_service import ArtworkService
-    return ArtworkService.generate_artwork_content(art_name)
+    cache_key = f"artwork_content:{art_name}"
+    cached_content = artwork_cache.get_sync(cache_key)
+    if cached_content is not None:
+        return cached_content
+    content = await ArtworkService.generate_artwork_content(art_name)
+    artwork_cache.set_sync(cache_key, content)
+    return content
@@ -0,0 +1,96 @@
+"""
+Color Features for ArtStoryAI
+Görsel renk özelliklerinin sabit düzenli vektörü ve renk etiketleri
+
+Vektör süreç havuzunda (image_processing.color_features) NumPy ile
+hesaplanır ve float16 olarak paketlenip saklanır (28 değer, 56 bayt).
+Filtredeki "Renk" seçenekleri bu vektörden eşiklerle türetilir.
+"""
+
+import struct
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+# k-means paletindeki renk sayısı
+PALETTE_COLORS = 5
+
+# Skaler özellikler (0..1 aralığında), vektörün başında bu sırayla
+STAT_NAMES = (
+    "warm_ratio",        # sıcak tonlu (kırmızı-sarı) renkli piksellerin oranı
+    "cool_ratio",        # soğuk tonlu (camgöbeği-mavi) renkli piksellerin oranı
+    "neutral_ratio",     # doygunluğu düşük (gri) piksellerin oranı
+    "saturation_mean",
+    "saturation_std",
+    "luminance_mean",
+    "luminance_std",
+    "colorfulness",      # Hasler-Süsstrunk renklilik ölçüsü / 100
+)
+# Ardından palet: her renk için (r, g, b, oran), oranı büyükten küçüğe
+FEATURE_LENGTH = len(STAT_NAMES) + PALETTE_COLORS * 4
+_PACK_FORMAT = f"<{FEATURE_LENGTH}e"
+
+# Filtre seçenekleriyle aynı adlar
+WARM = "Sıcak"
+COOL = "Soğuk"
+MONOCHROME = "Monokrom"
+COLORFUL = "Renkli"
+PASTEL = "Pastel"
+VIVID = "Canlı"
+COLOR_LABELS = (WARM, COOL, MONOCHROME, COLORFUL, PASTEL, VIVID)
+
+
+class ColorStats(NamedTuple):
+    warm_ratio: float
+    cool_ratio: float
+    neutral_ratio: float
+    saturation_mean: float
+    saturation_std: float
+    luminance_mean: float
+    luminance_std: float
+    colorfulness: float
+    palette: Tuple[Tuple[float, float, float, float], ...]
+
+
+def pack(features: Sequence[float]) -> bytes:
+    """Özellik vektörünü saklamak için paketler"""
+    return struct.pack(_PACK_FORMAT, *features)
+
+
+def unpack(blob: bytes) -> List[float]:
+    return list(struct.unpack(_PACK_FORMAT, blob))
+
+
+def to_stats(features: Sequence[float]) -> ColorStats:
+    stats = [float(value) for value in features[:len(STAT_NAMES)]]
+    rest = features[len(STAT_NAMES):]
+    palette = tuple(tuple(float(value) for value in rest[i:i + 4]) for i in range(0, len(rest), 4))
+    return ColorStats(*stats, palette=palette)
+
+
+def color_labels(features: Sequence[float]) -> List[str]:
+    """Vektörden filtre etiketleri; bir görsel birden fazla etiket alabilir"""
+    stats = to_stats(features)
+    labels = []
+    if stats.neutral_ratio >= 0.85 or stats.saturation_mean < 0.1:
+        # Gri tonlu, sepya veya tek renkli baskın görseller
+        labels.append(MONOCHROME)
+    else:
+        if stats.warm_ratio >= 0.3 and stats.warm_ratio >= 1.5 * stats.cool_ratio:
+            labels.append(WARM)
+        if stats.cool_ratio >= 0.3 and stats.cool_ratio >= 1.5 * stats.warm_ratio:
+            labels.append(COOL)
+        if stats.colorfulness >= 0.45:
+            labels.append(COLORFUL)
+    if stats.luminance_mean >= 0.6 and 0.1 <= stats.saturation_mean < 0.35:
+        labels.append(PASTEL)
+    if stats.saturation_mean >= 0.45 and stats.luminance_mean >= 0.25:
+        labels.append(VIVID)
+    return labels
+
+
+def palette_rgb(features: Sequence[float]) -> List[Dict]:
+    """Paleti 0..255 RGB ve oranlar olarak döner"""
+    return [
+        {"rgb": tuple(round(channel * 255) for channel in color[:3]), "ratio": round(color[3], 4)}
+        for color in to_stats(features).palette
+        if color[3] > 0
+    ]
@@ -0,0 +1,174 @@
+# Eşzamanlı görsel çözümleyici
+"""
+Tüm görsel sağlayıcılarını ve isim varyasyonlarını aynı anda sorgular.
+
+Eski şelale (waterfall) sırası öncelik olarak korunur: ilk kabul edilebilir
+sonuç geldiğinde, daha yüksek öncelikli istekler için kısa bir bekleme
+süresi tanınır, ardından en yüksek öncelikli sonuç döner ve kalan istekler
+iptal edilir.
+
+Hiçbir sağlayıcı görsel bulamazsa ıskalar eser adıyla kalıcı olarak
+kaydedilir; bekleme süresindeki sağlayıcılar o eser için sorgulanmaz.
+Boş sonuç ve 4xx yanıtları (429 hariç) kesin ıskadır; 5xx, 429 ve ağ
+hataları belirsizdir. Bir sağlayıcı en az bir sorguya kesin yanıt
+verdiyse ıska sayılır.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+
+from app.features.image_sources import (
+    RIJKSMUSEUM_API_KEY,
+    fetch_art_institute_image,
+    fetch_met_museum_image,
+    fetch_rijksmuseum_image,
+    fetch_wikimedia_image,
+    get_search_variations,
+)
+from app.services.image_miss_store import ImageMissStore, image_miss_store
+
+PLACEHOLDER_IMAGE_URL = "https://upload.wikimedia.org/wikipedia/commons/thumb/a/ac/No_image_available.svg/300px-No_image_available.svg.png"
+
+ProviderFunc = Callable[[str], Awaitable[Optional[str]]]
+
+
+class ImageResolver:
+    """Görsel sağlayıcılarını paralel sorgulayan çözümleyici"""
+
+    def __init__(self, grace_period: float = 0.3, miss_store: ImageMissStore = image_miss_store):
+        # İlk sonuçtan sonra yüksek öncelikli isteklere tanınan ek süre (saniye)
+        # Bağlantı havuzu ve sağlayıcı zaman aşımları app.http_client'ta
+        self.grace_period = grace_period
+        self.miss_store = miss_store
+        self.providers: List[ProviderFunc] = [
+            fetch_art_institute_image,
+            fetch_met_museum_image,
+            fetch_wikimedia_image,
+        ]
+        # Anahtarsız her istek 401 döner
+        if RIJKSMUSEUM_API_KEY:
+            self.providers.append(fetch_rijksmuseum_image)
+
+    def build_candidates(self, art_name: str) -> List[Tuple[ProviderFunc, str]]:
+        """(sağlayıcı, sorgu) çiftlerini eski şelale sırasıyla, tekrarsız döner"""
+        candidates: List[Tuple[ProviderFunc, str]] = []
+        # 1. Gelişmiş arama: her sağlayıcı her varyasyonla
+        for provider in self.providers:
+            for variation in get_search_variations(art_name):
+                candidates.append((provider, variation))
+        # 2. Tekil API denemeleri
+        for provider in (fetch_art_institute_image, fetch_met_museum_image, fetch_wikimedia_image):
+            candidates.append((provider, art_name))
+        # 3. Wikimedia alternatif isimleri
+        for alt_name in [
+            "The " + art_name,
+            art_name + " painting",
+            art_name + " (painting)",
+            art_name.replace("'", ""),
+        ]:
+            candidates.append((fetch_wikimedia_image, alt_name))
+
+        unique: List[Tuple[ProviderFunc, str]] = []
+        seen = set()
+        for provider, query in candidates:
+            key = (provider.__name__, query)
+            if key not in seen:
+                seen.add(key)
+                unique.append((provider, query))
+        return unique
+
+    async def _run_candidate(self, provider: ProviderFunc, query: str,
+                             answered: Optional[Set[str]] = None) -> Optional[str]:
+        """Sağlayıcıyı çağırır; kesin yanıt veren sağlayıcının adı answered'a eklenir"""
+        try:
+            image_url = await provider(query)
+        except asyncio.CancelledError:
+            raise
+        except aiohttp.ClientResponseError as e:
+            print(f"API hatası {provider.__name__} ({query}): HTTP {e.status}")
+            if 400 <= e.status < 500 and e.status != 429 and answered is not None:
+                answered.add(provider.__name__)
+            return None
+        except Exception as e:
+            print(f"API hatası {provider.__name__} ({query}): {e}")
+            return None
+        if answered is not None:
+            answered.add(provider.__name__)
+        if image_url and image_url.startswith("http"):
+            return image_url
+        return None
+
+    async def resolve(self, art_name: str) -> Optional[str]:
+        """Tüm sağlayıcıları aynı anda sorgular, en öncelikli kabul edilebilir sonucu döner"""
+        resolved = await self.resolve_with_provider(art_name)
+        return resolved[0] if resolved else None
+
+    async def resolve_with_provider(self, art_name: str) -> Optional[Tuple[str, str]]:
+        """resolve ile aynı; (görsel URL'si, sağlayıcı adı) döner"""
+        blocked = await self.miss_store.blocked_providers(art_name)
+        candidates = [
+            (provider, query) for provider, query in self.build_candidates(art_name)
+            if provider.__name__ not in blocked
+        ]
+        if not candidates:
+            print(f"Görsel aranmadı, tüm sağlayıcılar bekleme süresinde: {art_name}")
+            return None
+
+        answered: Set[str] = set()
+        resolved = await self._race(candidates, answered)
+        if resolved:
+            await self.miss_store.clear(art_name)
+        else:
+            # Sonuç yoksa tüm adaylar tamamlanmıştır; yalnızca kesin yanıt verenler ıska sayılır
+            await self.miss_store.record_misses(art_name, answered)
+        return resolved
+
+    async def _race(self, candidates: List[Tuple[ProviderFunc, str]],
+                    answered: Optional[Set[str]] = None) -> Optional[Tuple[str, str]]:
+        loop = asyncio.get_running_loop()
+        priorities: Dict[asyncio.Task, int] = {
+            asyncio.create_task(self._run_candidate(provider, query, answered)): priority
+            for priority, (provider, query) in enumerate(candidates)
+        }
+        pending = set(priorities)
+        best: Optional[Tuple[int, str]] = None
+        deadline: Optional[float] = None
+
+        try:
+            while pending:
+                wait_timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                done, pending = await asyncio.wait(
+                    pending, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Bekleme süresi doldu, eldeki en iyi sonuç geçerli
+                    break
+
+                for task in done:
+                    image_url = task.result()
+                    if image_url and (best is None or priorities[task] < best[0]):
+                        best = (priorities[task], image_url)
+
+                if best is not None:
+                    if all(priorities[task] > best[0] for task in pending):
+                        break
+                    if deadline is None:
+                        deadline = loop.time() + self.grace_period
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if best is None:
+            return None
+
+        provider, query = candidates[best[0]]
+        print(f"Görsel bulundu: {provider.__name__} - {query}")
+        return best[1], provider.__name__
+
+
+# Global instance
+image_resolver = ImageResolver()
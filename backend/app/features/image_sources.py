@@ -1,8 +1,21 @@
 # Tüm API'lerden görsel çekme fonksiyonları
-import requests
-from typing import Optional
+import aiohttp
+import os
+from typing import List, Optional
 import re
 
+from app.http_client import http_client
+from app.memoize import memoize
+
+# Sağlayıcı sonuçlarının önbellek süreleri (saniye); "bulunamadı" kısa süre saklanır
+PROVIDER_RESULT_TTL = 24 * 3600
+PROVIDER_NOT_FOUND_TTL = 10 * 60
+
+# Rijksmuseum API anahtarı zorunludur; tanımlı değilse sağlayıcı kullanılmaz
+RIJKSMUSEUM_API_KEY = os.getenv("RIJKSMUSEUM_API_KEY", "")
+
+provider_cache = memoize(ttl=PROVIDER_RESULT_TTL, namespace="image_provider", negative_ttl=PROVIDER_NOT_FOUND_TTL)
+
 def normalize_art_name(art_name: str) -> str:
     """Sanat eseri adını normalize eder"""
     # Küçük harfe çevir
@@ -13,6 +26,7 @@ def normalize_art_name(art_name: str) -> str:
     normalized = re.sub(r'\s+', ' ', normalized)
     return normalized
 
+@provider_cache
 def get_art_institute_image(art_name: str) -> Optional[str]:
     try:
         search_url = "https://api.artic.edu/api/v1/artworks/search"
@@ -21,7 +35,7 @@ def get_art_institute_image(art_name: str) -> Optional[str]:
             "fields": "id,title,artist_display,image_id",
             "limit": 5
         }
-        response = requests.get(search_url, params=params, timeout=10)
+        response = http_client.sync_session.get(search_url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         if data.get("data"):
@@ -34,6 +48,7 @@ def get_art_institute_image(art_name: str) -> Optional[str]:
         print(f"Art Institute API hatası: {e}")
     return None
 
+@provider_cache
 def get_met_museum_image(art_name: str) -> Optional[str]:
     try:
         search_url = "https://collectionapi.metmuseum.org/public/collection/v1/search"
@@ -41,14 +56,14 @@ def get_met_museum_image(art_name: str) -> Optional[str]:
             "q": art_name,
             "hasImages": "true"
         }
-        response = requests.get(search_url, params=params, timeout=10)
+        response = http_client.sync_session.get(search_url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         if data.get("objectIDs"):
             for obj_id in data["objectIDs"][:3]:
                 try:
                     obj_url = f"https://collectionapi.metmuseum.org/public/collection/v1/objects/{obj_id}"
-                    obj_response = requests.get(obj_url, timeout=10)
+                    obj_response = http_client.sync_session.get(obj_url, timeout=10)
                     obj_data = obj_response.json()
                     if obj_data.get("primaryImage"):
                         return obj_data["primaryImage"]
@@ -58,6 +73,7 @@ def get_met_museum_image(art_name: str) -> Optional[str]:
         print(f"MET Museum API hatası: {e}")
     return None
 
+@provider_cache
 def get_wikimedia_image(art_name: str) -> Optional[str]:
     try:
         url = "https://en.wikipedia.org/w/api.php"
@@ -68,7 +84,7 @@ def get_wikimedia_image(art_name: str) -> Optional[str]:
             "srsearch": f'"{art_name}" painting',
             "srlimit": 3
         }
-        response = requests.get(url, params=search_params, timeout=10)
+        response = http_client.sync_session.get(url, params=search_params, timeout=10)
         response.raise_for_status()
         data = response.json()
         search_results = data.get("query", {}).get("search", [])
@@ -82,7 +98,7 @@ def get_wikimedia_image(art_name: str) -> Optional[str]:
                 "pithumbsize": 800,
                 "pilimit": 5
             }
-            page_response = requests.get(url, params=params, timeout=10)
+            page_response = http_client.sync_session.get(url, params=params, timeout=10)
             page_data = page_response.json()
             pages = page_data.get("query", {}).get("pages", {})
             for page in pages.values():
@@ -104,7 +120,7 @@ def get_harvard_art_museums_image(art_name: str) -> Optional[str]:
             "size": 5,
             "hasimage": 1
         }
-        response = requests.get(search_url, params=params, timeout=10)
+        response = http_client.sync_session.get(search_url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         if data.get("records"):
@@ -119,14 +135,17 @@ def get_harvard_art_museums_image(art_name: str) -> Optional[str]:
 
 def get_rijksmuseum_image(art_name: str) -> Optional[str]:
     """Rijksmuseum API'den görsel çeker"""
+    if not RIJKSMUSEUM_API_KEY:
+        return None
     try:
         search_url = "https://www.rijksmuseum.nl/api/en/collection"
         params = {
+            "key": RIJKSMUSEUM_API_KEY,
             "q": art_name,
             "imgonly": True,
             "ps": 5
         }
-        response = requests.get(search_url, params=params, timeout=10)
+        response = http_client.sync_session.get(search_url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         if data.get("artObjects"):
@@ -151,7 +170,7 @@ def get_unsplash_art_image(art_name: str) -> Optional[str]:
             "per_page": 5,
             "orientation": "landscape"
         }
-        response = requests.get(search_url, headers=headers, params=params, timeout=10)
+        response = http_client.sync_session.get(search_url, headers=headers, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         if data.get("results"):
@@ -162,12 +181,10 @@ def get_unsplash_art_image(art_name: str) -> Optional[str]:
         print(f"Unsplash API hatası: {e}")
     return None
 
-def search_artwork_image(art_name: str) -> Optional[str]:
-    """Tüm API'leri sırayla dener ve en iyi görseli döner"""
+def get_search_variations(art_name: str) -> List[str]:
+    """Görsel aramasında denenecek isim varyasyonlarını öncelik sırasıyla döner"""
     normalized_name = normalize_art_name(art_name)
-    
-    # Arama stratejileri
-    search_variations = [
+    return [
         art_name,
         normalized_name,
         f"{art_name} painting",
@@ -176,6 +193,11 @@ def search_artwork_image(art_name: str) -> Optional[str]:
         art_name.replace("'", ""),
         art_name.replace("'", "'"),
     ]
+
+def search_artwork_image(art_name: str) -> Optional[str]:
+    """Tüm API'leri sırayla dener ve en iyi görseli döner"""
+    # Arama stratejileri
+    search_variations = get_search_variations(art_name)
     
     # Her API'yi her varyasyonla dene
     apis = [
@@ -197,3 +219,82 @@ def search_artwork_image(art_name: str) -> Optional[str]:
                 continue
     
     return None
+
+
+# Async sağlayıcılar - image_resolver tarafından eşzamanlı olarak çağrılır
+
+@provider_cache
+async def fetch_art_institute_image(art_name: str) -> Optional[str]:
+    """Art Institute of Chicago API'den görsel çeker (async)"""
+    params = {
+        "q": art_name,
+        "fields": "id,title,artist_display,image_id",
+        "limit": 5
+    }
+    data = await http_client.get_json("art_institute", "https://api.artic.edu/api/v1/artworks/search", params=params)
+    for artwork in data.get("data") or []:
+        if artwork.get("image_id"):
+            return f"https://www.artic.edu/iiif/2/{artwork['image_id']}/full/843,/0/default.jpg"
+    return None
+
+
+@provider_cache
+async def fetch_met_museum_image(art_name: str) -> Optional[str]:
+    """MET Museum API'den görsel çeker (async)"""
+    base_url = "https://collectionapi.metmuseum.org/public/collection/v1"
+    params = {
+        "q": art_name,
+        "hasImages": "true"
+    }
+    data = await http_client.get_json("met_museum", f"{base_url}/search", params=params)
+    for obj_id in (data.get("objectIDs") or [])[:3]:
+        try:
+            obj_data = await http_client.get_json("met_museum", f"{base_url}/objects/{obj_id}")
+            if obj_data.get("primaryImage"):
+                return obj_data["primaryImage"]
+        except aiohttp.ClientError:
+            continue
+    return None
+
+
+@provider_cache
+async def fetch_wikimedia_image(art_name: str) -> Optional[str]:
+    """Wikipedia sayfa görsellerinden görsel çeker (async)"""
+    url = "https://en.wikipedia.org/w/api.php"
+    search_params = {
+        "action": "query",
+        "format": "json",
+        "list": "search",
+        "srsearch": f'"{art_name}" painting',
+        "srlimit": 3
+    }
+    data = await http_client.get_json("wikimedia", url, params=search_params)
+    for result in data.get("query", {}).get("search", []):
+        params = {
+            "action": "query",
+            "format": "json",
+            "prop": "pageimages|images",
+            "titles": result["title"],
+            "pithumbsize": 800,
+            "pilimit": 5
+        }
+        page_data = await http_client.get_json("wikimedia", url, params=params)
+        for page in page_data.get("query", {}).get("pages", {}).values():
+            if "thumbnail" in page:
+                return page["thumbnail"]["source"]
+    return None
+
+
+async def fetch_rijksmuseum_image(art_name: str) -> Optional[str]:
+    """Rijksmuseum API'den görsel çeker (async); anahtar yoksa çağrılmaz"""
+    params = {
+        "key": RIJKSMUSEUM_API_KEY,
+        "q": art_name,
+        "imgonly": "True",
+        "ps": 5
+    }
+    data = await http_client.get_json("rijksmuseum", "https://www.rijksmuseum.nl/api/en/collection", params=params)
+    for artwork in data.get("artObjects") or []:
+        if artwork.get("webImage"):
+            return artwork["webImage"]["url"]
+    return None
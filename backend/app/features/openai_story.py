@@ -1,60 +1,290 @@
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+import asyncio
+import json
 import os
+from typing import Dict, Optional
 from dotenv import load_dotenv
 
+from app.memoize import memoize
+from app.single_flight import llm_flights, prompt_key
+
 load_dotenv()
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Tüm async üretimler tek bir paylaşılan istemci (bağlantı havuzu) kullanır
+async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def generate_story_with_openai(art_name: str) -> str:
+CONTENT_MODEL = "gpt-3.5-turbo"
+# JSON çıktı modunu (response_format) destekleyen model
+STRUCTURED_CONTENT_MODEL = os.getenv("OPENAI_STRUCTURED_MODEL", "gpt-3.5-turbo-1106")
+# "parallel": dört üretim eşzamanlı, "structured": tek istekte tüm içerik
+CONTENT_MODE = os.getenv("OPENAI_CONTENT_MODE", "parallel").lower()
+
+PENDING_TEXT = "AI ile üretiliyor..."
+
+FALLBACK_STORY = "AI ile hikaye üretilemedi."
+FALLBACK_ARTIST_BIO = "AI ile biyografi üretilemedi."
+FALLBACK_MOVEMENT_DESC = "AI ile akım açıklaması üretilemedi."
+
+
+def fallback_artwork_details() -> Dict[str, str]:
+    return {
+        "artist": PENDING_TEXT,
+        "year": PENDING_TEXT,
+        "movement": PENDING_TEXT,
+        "museum": PENDING_TEXT
+    }
+
+
+# Üretilen içeriğin önbellek süresi (saniye); yedek metinler saklanmaz
+GENERATED_CONTENT_TTL = 7 * 24 * 3600
+
+FALLBACK_TEXTS = {FALLBACK_STORY, FALLBACK_ARTIST_BIO, FALLBACK_MOVEMENT_DESC}
+
+
+def _is_generated(content) -> bool:
+    """Yedek içerik (API hatası) önbelleğe alınmaz"""
+    if isinstance(content, str):
+        return content not in FALLBACK_TEXTS
+    if isinstance(content, dict):
+        if "artwork_details" in content:
+            return all(_is_generated(value) for value in content.values())
+        # Eksik alanı yer tutucuyla doldurulmuş detaylar da saklanmaz
+        return PENDING_TEXT not in content.values()
+    return content is not None
+
+
+# Anahtarda model adı var: model değişince eski içerik kullanılmaz
+generated_content = memoize(ttl=GENERATED_CONTENT_TTL, namespace=f"openai:{CONTENT_MODEL}", cacheable=_is_generated)
+structured_content = memoize(ttl=GENERATED_CONTENT_TTL, namespace=f"openai:{STRUCTURED_CONTENT_MODEL}", cacheable=_is_generated)
+
+
+def _story_request(art_name: str) -> Dict:
     prompt = f"'{art_name}' adlı tablo için kısa, yaratıcı ve özgün bir hikaye yaz. Hikaye 3-4 cümle olsun."
+    return {
+        "messages": [
+            {"role": "system", "content": "Sen yaratıcı bir sanat hikayesi anlatıcısısın."},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": 200,
+        "temperature": 0.8
+    }
+
+
+def _artist_bio_request(artist_name: str) -> Dict:
+    prompt = f"'{artist_name}' adlı sanatçı için kısa, sade ve özgün bir biyografi yaz. 3-4 cümle olsun."
+    return {
+        "messages": [
+            {"role": "system", "content": "Sen bir sanat tarihçisi ve biyografi yazarı olarak yazıyorsun."},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": 200,
+        "temperature": 0.7
+    }
+
+
+def _movement_desc_request(movement_name: str) -> Dict:
+    prompt = f"'{movement_name}' sanat akımı için kısa, sade ve özgün bir açıklama yaz. 2-3 cümle olsun."
+    return {
+        "messages": [
+            {"role": "system", "content": "Sen bir sanat akımı uzmanı olarak yazıyorsun."},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": 150,
+        "temperature": 0.7
+    }
+
+
+def _artwork_details_request(art_name: str) -> Dict:
+    prompt = f"""
+        Aşağıdaki sanat eseri için JSON formatında bilgi ver:
+        {{
+            "artist": "Sanatçı adı",
+            "year": "Yapım yılı",
+            "movement": "Sanat akımı",
+            "museum": "Bulunduğu müze"
+        }}
+
+        Sanat eseri: {art_name}
+
+        Örnek format:
+        {{
+            "artist": "Vincent van Gogh",
+            "year": "1889",
+            "movement": "Post-İzlenimcilik",
+            "museum": "Museum of Modern Art, New York"
+        }}
+        """
+    return {
+        "messages": [
+            {"role": "system", "content": "Sen bir sanat tarihi uzmanısın. Sadece JSON formatında cevap ver."},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": 200,
+        "temperature": 0.3
+    }
+
+
+def _structured_content_request(art_name: str) -> Dict:
+    prompt = f"""
+        '{art_name}' adlı sanat eseri için aşağıdaki alanları içeren bir JSON nesnesi üret:
+        {{
+            "story": "Eser için kısa, yaratıcı ve özgün bir hikaye (3-4 cümle)",
+            "artist_bio": "Sanatçının kısa, sade ve özgün biyografisi (3-4 cümle)",
+            "movement_desc": "Eserin ait olduğu sanat akımının kısa açıklaması (2-3 cümle)",
+            "artwork_details": {{
+                "artist": "Sanatçı adı",
+                "year": "Yapım yılı",
+                "movement": "Sanat akımı",
+                "museum": "Bulunduğu müze"
+            }}
+        }}
+        """
+    return {
+        "messages": [
+            {"role": "system", "content": "Sen bir sanat tarihi uzmanı ve yaratıcı bir hikaye anlatıcısısın. Sadece JSON formatında cevap ver."},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": 700,
+        "temperature": 0.7
+    }
+
+
+@generated_content
+def generate_story_with_openai(art_name: str) -> str:
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "Sen yaratıcı bir sanat hikayesi anlatıcısısın."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=200,
-            temperature=0.8
-        )
+        response = client.chat.completions.create(model=CONTENT_MODEL, **_story_request(art_name))
         return response.choices[0].message.content.strip()
     except Exception as e:
         print("OpenAI API hatası:", e)
-        return "AI ile hikaye üretilemedi."
+        return FALLBACK_STORY
 
 
+@generated_content
 def generate_artist_bio_with_openai(artist_name: str) -> str:
-    prompt = f"'{artist_name}' adlı sanatçı için kısa, sade ve özgün bir biyografi yaz. 3-4 cümle olsun."
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "Sen bir sanat tarihçisi ve biyografi yazarı olarak yazıyorsun."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=200,
-            temperature=0.7
-        )
+        response = client.chat.completions.create(model=CONTENT_MODEL, **_artist_bio_request(artist_name))
         return response.choices[0].message.content.strip()
     except Exception as e:
         print("OpenAI API hatası (biyografi):", e)
-        return "AI ile biyografi üretilemedi."
+        return FALLBACK_ARTIST_BIO
 
 
+@generated_content
 def generate_movement_desc_with_openai(movement_name: str) -> str:
-    prompt = f"'{movement_name}' sanat akımı için kısa, sade ve özgün bir açıklama yaz. 2-3 cümle olsun."
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "Sen bir sanat akımı uzmanı olarak yazıyorsun."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=150,
-            temperature=0.7
-        )
+        response = client.chat.completions.create(model=CONTENT_MODEL, **_movement_desc_request(movement_name))
         return response.choices[0].message.content.strip()
     except Exception as e:
         print("OpenAI API hatası (akım açıklaması):", e)
-        return "AI ile akım açıklaması üretilemedi."
+        return FALLBACK_MOVEMENT_DESC
+
+
+@generated_content
+def generate_artwork_details_with_openai(art_name: str) -> Dict:
+    """Generate artwork details using OpenAI"""
+    try:
+        response = client.chat.completions.create(model=CONTENT_MODEL, **_artwork_details_request(art_name))
+        return json.loads(response.choices[0].message.content)
+    except Exception as e:
+        print(f"OpenAI API hatası (sanat eseri detayları): {e}")
+        return fallback_artwork_details()
+
+
+# Async üretim hattı
+
+async def _complete_async(request: Dict, model: str = CONTENT_MODEL, **kwargs) -> str:
+    # Aynı istem eşzamanlı gelirse OpenAI'a tek çağrı gider
+    async def _create() -> str:
+        response = await async_client.chat.completions.create(model=model, **request, **kwargs)
+        return response.choices[0].message.content.strip()
+
+    return await llm_flights.do(prompt_key(model, request, kwargs), _create)
+
+
+@generated_content
+async def generate_story_async(art_name: str) -> str:
+    try:
+        return await _complete_async(_story_request(art_name))
+    except Exception as e:
+        print("OpenAI API hatası:", e)
+        return FALLBACK_STORY
+
+
+@generated_content
+async def generate_artist_bio_async(artist_name: str) -> str:
+    try:
+        return await _complete_async(_artist_bio_request(artist_name))
+    except Exception as e:
+        print("OpenAI API hatası (biyografi):", e)
+        return FALLBACK_ARTIST_BIO
+
+
+@generated_content
+async def generate_movement_desc_async(movement_name: str) -> str:
+    try:
+        return await _complete_async(_movement_desc_request(movement_name))
+    except Exception as e:
+        print("OpenAI API hatası (akım açıklaması):", e)
+        return FALLBACK_MOVEMENT_DESC
+
+
+@generated_content
+async def generate_artwork_details_async(art_name: str) -> Dict:
+    try:
+        return json.loads(await _complete_async(_artwork_details_request(art_name)))
+    except Exception as e:
+        print(f"OpenAI API hatası (sanat eseri detayları): {e}")
+        return fallback_artwork_details()
+
+
+@structured_content
+async def generate_structured_content_async(art_name: str) -> Optional[Dict]:
+    """Hikaye, biyografi, akım ve detayları tek bir JSON completion ile üretir"""
+    try:
+        content = await _complete_async(
+            _structured_content_request(art_name),
+            model=STRUCTURED_CONTENT_MODEL,
+            response_format={"type": "json_object"}
+        )
+        data = json.loads(content)
+    except Exception as e:
+        print(f"OpenAI API hatası (yapılandırılmış içerik): {e}")
+        return None
+
+    details = data.get("artwork_details")
+    if not isinstance(details, dict):
+        details = {}
+    return {
+        "story": data.get("story") or FALLBACK_STORY,
+        "artist_bio": data.get("artist_bio") or FALLBACK_ARTIST_BIO,
+        "movement_desc": data.get("movement_desc") or FALLBACK_MOVEMENT_DESC,
+        "artwork_details": {**fallback_artwork_details(), **details}
+    }
+
+
+async def generate_artwork_content_async(art_name: str, mode: Optional[str] = None) -> Dict:
+    """
+    Bir eser için tüm AI içeriğini tek round-trip gecikmesiyle üretir.
+
+    "structured" modunda tek bir completion kullanılır; başarısız olursa
+    bağımsız dört üretim eşzamanlı olarak çalıştırılır.
+    """
+    mode = (mode or CONTENT_MODE).lower()
+    if mode == "structured":
+        content = await generate_structured_content_async(art_name)
+        if content is not None:
+            return content
+
+    story, artist_bio, movement_desc, artwork_details = await asyncio.gather(
+        generate_story_async(art_name),
+        generate_artist_bio_async(art_name),
+        generate_movement_desc_async(art_name),
+        generate_artwork_details_async(art_name),
+    )
+    return {
+        "story": story,
+        "artist_bio": artist_bio,
+        "movement_desc": movement_desc,
+        "artwork_details": artwork_details
+    }
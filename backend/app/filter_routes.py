@@ -17,12 +17,15 @@ class FilterRequest(BaseModel):
     colors: Optional[List[str]] = []
     sizes: Optional[List[str]] = []
     museums: Optional[List[str]] = []
+    cultures: Optional[List[str]] = []
     sources: Optional[List[str]] = ["manual", "met_museum"]
 
 class FilterResponse(BaseModel):
     total: int
     sources: Dict[str, int]
     artworks: List[Dict]
+    facets: Dict[str, Dict[str, int]] = {}
+    relaxed_filter: Optional[str] = None
 
 @router.get("/options", response_model=Dict)
 async def get_filter_options():
@@ -46,7 +49,8 @@ async def filter_artworks(filters: FilterRequest):
             "styles": filters.styles,
             "colors": filters.colors,
             "sizes": filters.sizes,
-            "museums": filters.museums
+            "museums": filters.museums,
+            "cultures": filters.cultures
         }
         
         # Boş filtreleri temizle
@@ -65,7 +69,9 @@ async def filter_artworks(filters: FilterRequest):
         return FilterResponse(
             total=results["total"],
             sources=results["sources"],
-            artworks=results["artworks"]
+            artworks=results["artworks"],
+            facets=results["facets"],
+            relaxed_filter=results["relaxed_filter"]
         )
         
     except Exception as e:
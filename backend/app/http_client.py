@@ -0,0 +1,148 @@
+"""
+HTTP Client for ArtStoryAI
+Application-lifetime pooled HTTP client shared by all museum providers
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    """Concurrency and timeout budget for a single upstream provider"""
+    concurrency: int = 10
+    timeout: float = 10.0
+    connect_timeout: float = 3.0
+
+
+# Sağlayıcı bazlı eşzamanlılık ve zaman aşımı sınırları
+PROVIDER_LIMITS: Dict[str, ProviderLimits] = {
+    "met_museum": ProviderLimits(concurrency=20, timeout=10.0),
+    "art_institute": ProviderLimits(concurrency=10, timeout=10.0),
+    "wikimedia": ProviderLimits(concurrency=10, timeout=10.0),
+    "rijksmuseum": ProviderLimits(concurrency=5, timeout=10.0),
+    "default": ProviderLimits(concurrency=10, timeout=10.0),
+}
+
+
+class HTTPClient:
+    """
+    Shared aiohttp session with per-host keep-alive pools.
+
+    Every provider call goes through one ClientSession, so TCP and TLS
+    connections are reused across requests. Each provider additionally gets
+    its own semaphore and timeout so a slow upstream cannot starve the others.
+    aiohttp speaks HTTP/1.1 only; keep-alive pooling is what removes the
+    per-call handshakes.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, ProviderLimits]] = None,
+        max_connections: int = 100,
+        max_connections_per_host: int = 20,
+        keepalive_timeout: float = 30.0,
+    ):
+        self.limits = dict(limits or PROVIDER_LIMITS)
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._sync_session: Optional[requests.Session] = None
+
+    # Yaşam döngüsü
+
+    async def startup(self) -> None:
+        """Open the shared session (FastAPI startup)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.limits["default"].timeout),
+                headers={"User-Agent": "ArtStoryAI/1.0"},
+            )
+            logger.info("Shared HTTP client started")
+
+    async def shutdown(self) -> None:
+        """Close the shared session (FastAPI shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("Shared HTTP client closed")
+        self._session = None
+        self._semaphores = {}
+        if self._sync_session is not None:
+            self._sync_session.close()
+            self._sync_session = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Shared session; opened lazily when used outside the app lifecycle"""
+        if self._session is None or self._session.closed:
+            await self.startup()
+        return self._session
+
+    @property
+    def sync_session(self) -> requests.Session:
+        """Pooled requests session for the remaining synchronous callers"""
+        if self._sync_session is None:
+            adapter = HTTPAdapter(
+                pool_connections=len(self.limits),
+                pool_maxsize=self.max_connections_per_host,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "ArtStoryAI/1.0"
+            self._sync_session = session
+        return self._sync_session
+
+    # İstekler
+
+    def provider_limits(self, provider: str) -> ProviderLimits:
+        return self.limits.get(provider, self.limits["default"])
+
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.provider_limits(provider).concurrency)
+            self._semaphores[provider] = semaphore
+        return semaphore
+
+    @asynccontextmanager
+    async def request(
+        self, provider: str, method: str, url: str, **kwargs
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Provider-limited request on the shared session"""
+        limits = self.provider_limits(provider)
+        kwargs.setdefault(
+            "timeout",
+            aiohttp.ClientTimeout(total=limits.timeout, sock_connect=limits.connect_timeout),
+        )
+        session = await self.get_session()
+        async with self._semaphore(provider):
+            async with session.request(method, url, **kwargs) as response:
+                yield response
+
+    async def get_json(self, provider: str, url: str, params: Optional[Dict] = None, **kwargs) -> Any:
+        """GET a JSON document; raises aiohttp.ClientResponseError on HTTP errors"""
+        async with self.request(provider, "GET", url, params=params, **kwargs) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+
+# Global instance
+http_client = HTTPClient()
@@ -1,18 +1,43 @@
-import io
 import base64
 import json
 import asyncio
-from PIL import Image
-from fastapi import HTTPException
-from typing import Optional
+from typing import Any, Dict, Optional
 
-async def analyze_with_openai_vision(image_data: bytes, client) -> dict:
+from app import image_processing
+from app.color_features import color_labels
+
+PreparedImage = Dict[str, Any]
+
+# Kabul edilen en büyük yükleme (bayt)
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+
+async def prepare_image(image_data: bytes) -> PreparedImage:
+    """
+    Görseli süreç havuzunda çözer, EXIF yönünü düzeltir, vision modelinin
+    en büyük giriş boyutuna küçültür; palet, pHash ve renk özelliklerini de hesaplar.
+    Geçersiz görselde hata yükselir.
+    """
+    return await image_processing.run(image_processing.prepare_upload, image_data)
+
+def image_summary(prepared: PreparedImage) -> Dict[str, Any]:
+    """Yanıtta döndürülen görsel özellikleri (JPEG baytları hariç)"""
+    return {
+        "width": prepared["width"],
+        "height": prepared["height"],
+        "palette": prepared["palette"],
+        "phash": f"{prepared['phash']:016x}",
+        "colors": color_labels(prepared["color_features"]),
+    }
+
+async def analyze_with_openai_vision(image_data: bytes, client, prepared: Optional[PreparedImage] = None) -> dict:
     """
     OpenAI Vision API ile görsel analizi
     """
     try:
-        # Görseli base64'e çevir
-        image_base64 = base64.b64encode(image_data).decode('utf-8')
+        if prepared is None:
+            prepared = await prepare_image(image_data)
+        # Küçültülmüş görseli base64'e çevir (tam boy yükleme bellekte kodlanmaz)
+        image_base64 = base64.b64encode(prepared["jpeg"]).decode('utf-8')
         
         # OpenAI Vision API isteği
         response = await asyncio.to_thread(
@@ -74,21 +99,22 @@ Sadece JSON formatında yanıt ver, başka açıklama ekleme:
         except json.JSONDecodeError as e:
             print(f"❌ JSON parse hatası: {e}")
             # Fallback analiz
-            return await fallback_image_analysis(image_data)
+            return await fallback_image_analysis(image_data, prepared)
             
     except Exception as e:
         print(f"❌ OpenAI Vision API hatası: {e}")
         # Fallback analiz
-        return await fallback_image_analysis(image_data)
+        return await fallback_image_analysis(image_data, prepared)
 
-async def fallback_image_analysis(image_data: bytes) -> dict:
+async def fallback_image_analysis(image_data: bytes, prepared: Optional[PreparedImage] = None) -> dict:
     """
     OpenAI API kullanılamadığında basit analiz
     """
     try:
-        # Görsel boyutlarını al
-        pil_image = Image.open(io.BytesIO(image_data))
-        width, height = pil_image.size
+        # Görsel boyutları ve palet süreç havuzunda hesaplanır
+        if prepared is None:
+            prepared = await prepare_image(image_data)
+        width, height = prepared["width"], prepared["height"]
         
         # Basit analiz
         aspect_ratio = width / height
@@ -101,20 +127,15 @@ async def fallback_image_analysis(image_data: bytes) -> dict:
         else:  # Kare
             style = "Portre veya kare kompozisyon"
         
-        # Renk analizi
-        try:
-            # Görseli küçült ve renk analizi yap
-            small_image = pil_image.resize((50, 50))
-            colors = small_image.getcolors(maxcolors=1000)
-            
-            if colors:
-                # En çok kullanılan rengi bul
-                dominant_color = max(colors, key=lambda x: x[0])[1]
-                color_name = get_color_name(dominant_color)
-            else:
-                color_name = "Karışık renkler"
-        except:
-            color_name = "Renk analizi yapılamadı"
+        # Renk analizi: paletin en baskın rengi
+        if prepared["palette"]:
+            color_name = get_color_name(prepared["palette"][0]["rgb"])
+        else:
+            color_name = "Karışık renkler"
+        # Renk etiketleri (Sıcak, Soğuk, Pastel, ...): tüm piksellerin dağılımından
+        tones = color_labels(prepared["color_features"])
+        if tones:
+            color_name = f"{color_name} ({', '.join(tones).lower()})"
         
         return {
             "artwork_name": "Yüklenen Görsel (AI Analizi Gerekli)",
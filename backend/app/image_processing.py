@@ -0,0 +1,229 @@
+"""
+Image Processing for ArtStoryAI
+CPU-bound Pillow work (decode, resize, encode) in a process pool
+
+Görsel çözme ve kodlama event loop'u ve GIL'i bloklamasın diye ayrı
+süreçlerde çalışır. Havuzda çalışan fonksiyonlar modül düzeyinde ve
+pickle edilebilir argümanlı olmalıdır. Proxy varyantları dosya yollarıyla
+çalışır; yüklemeler bayt olarak gider, küçültülmüş sonuç döner.
+"""
+
+import asyncio
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from app.color_features import PALETTE_COLORS, palette_rgb
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_IMAGE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Varyant biçimi -> (Pillow kodlayıcısı, kaydetme seçenekleri, media type)
+VARIANT_FORMATS: Dict[str, Tuple[str, Dict[str, Any], str]] = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}, "image/webp"),
+    "avif": ("AVIF", {"quality": 60}, "image/avif"),
+}
+
+# Vision modeline gönderilen görselin en uzun kenarı (piksel) ve JPEG kalitesi
+VISION_MAX_SIDE = 2048
+VISION_JPEG_QUALITY = 85
+# Açılması reddedilen görsel boyutu (decompression bomb koruması)
+MAX_IMAGE_PIXELS = 80_000_000
+# pHash: 32x32 gri tonlamadan DCT, sol üst 8x8 frekans bloğu -> 64 bit
+PHASH_SAMPLE_SIDE = 32
+PHASH_BLOCK = 8
+# Katalog görselleri hash'lenmeden önce bu boyuta çözülür (JPEG draft)
+PHASH_DECODE_SIDE = 256
+# Renk özellikleri bu boyuta küçültülmüş piksellerden hesaplanır
+COLOR_SAMPLE_SIDE = 96
+KMEANS_ITERATIONS = 12
+# Bu doygunluğun altındaki (veya çok koyu) pikseller nötr sayılır
+CHROMA_THRESHOLD = 0.15
+# Rec. 709 parlaklık katsayıları
+LUMA = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        workers = int(os.getenv("IMAGE_WORKERS", DEFAULT_IMAGE_WORKERS))
+        _executor = ProcessPoolExecutor(max_workers=max(workers, 1))
+        logger.info(f"Image process pool started with {workers} workers")
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Havuzu kapatır (FastAPI shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run(func: Callable[..., T], *args: Any) -> T:
+    """Fonksiyonu görsel süreç havuzunda çalıştırır"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), func, *args)
+
+
+def supported_formats() -> Set[str]:
+    """Kurulu Pillow'un kodlayabildiği varyant biçimleri (AVIF eklentiye bağlı)"""
+    Image.init()
+    return {fmt for fmt, (encoder, _, _) in VARIANT_FORMATS.items() if encoder in Image.SAVE}
+
+
+# Süreç havuzunda çalışan fonksiyonlar
+
+def render_variant(source_path: str, target_path: str, width: int, fmt: str) -> Tuple[int, int]:
+    """
+    Kaynağı EXIF yönüne çevirip en fazla width genişliğe küçültür ve
+    target_path'e atomik olarak yazar; çıktı boyutlarını döner.
+    """
+    encoder, options, _ = VARIANT_FORMATS[fmt]
+    with Image.open(source_path) as image:
+        # JPEG'lerde küçültülmüş çözme: tam çözünürlüklü bitmap oluşturulmaz
+        image.draft("RGB", (width, image.height * width // max(image.width, 1)))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.LANCZOS)
+
+        tmp_path = f"{target_path}.{os.getpid()}.tmp"
+        image.save(tmp_path, encoder, **options)
+        os.replace(tmp_path, target_path)
+        return image.size
+
+
+def _open_oriented(image: Image.Image, max_side: int) -> Image.Image:
+    """EXIF yönünü düzeltir, RGB'ye çevirir ve en uzun kenarı max_side'a küçültür"""
+    image.draft("RGB", (max_side, max_side))
+    image = ImageOps.exif_transpose(image)
+    image = image.convert("RGB")
+    image.thumbnail((max_side, max_side), Image.LANCZOS)
+    return image
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    n = np.arange(size)
+    matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+    matrix[0] *= 1 / np.sqrt(2)
+    return matrix * np.sqrt(2 / size)
+
+
+_DCT = _dct_matrix(PHASH_SAMPLE_SIDE)
+
+
+def perceptual_hash(image: Image.Image) -> int:
+    """64 bit pHash: yeniden boyutlandırma ve sıkıştırmaya dayanıklı görsel parmak izi"""
+    gray = image.convert("L").resize((PHASH_SAMPLE_SIDE, PHASH_SAMPLE_SIDE), Image.LANCZOS)
+    pixels = np.asarray(gray, dtype=np.float64)
+    block = (_DCT @ pixels @ _DCT.T)[:PHASH_BLOCK, :PHASH_BLOCK].flatten()
+    # DC bileşeni medyana katılmaz
+    bits = block > np.median(block[1:])
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def hash_file(path: str) -> int:
+    """Diskteki görselin pHash'i (katalog indeksi için)"""
+    with Image.open(path) as source:
+        image = _open_oriented(source, PHASH_DECODE_SIDE)
+    return perceptual_hash(image)
+
+
+def _kmeans_palette(pixels: np.ndarray, k: int = PALETTE_COLORS) -> List[float]:
+    """Piksellerin k-means paleti: [r, g, b, oran] * k (0..1), oranı büyükten küçüğe"""
+    # Deterministik başlangıç: parlaklığa göre sıralanmış piksellerden eşit aralıklı seçim
+    order = np.argsort(pixels @ LUMA)
+    centers = pixels[order[np.linspace(0, len(order) - 1, k).astype(int)]]
+    for _ in range(KMEANS_ITERATIONS):
+        distances = ((pixels[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=pixels[:, c], minlength=k) for c in range(3)], axis=1)
+        updated = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        converged = np.abs(updated - centers).max() < 1e-3
+        centers = updated
+        if converged:
+            break
+    ratios = counts / counts.sum()
+    return [float(value) for i in np.argsort(-ratios) for value in (*centers[i], ratios[i])]
+
+
+def color_stats(image: Image.Image) -> List[float]:
+    """Renk özellik vektörü (düzen: app.color_features): sıcak/soğuk oranları, doygunluk, parlaklık, palet"""
+    sample = image.copy()
+    sample.thumbnail((COLOR_SAMPLE_SIDE, COLOR_SAMPLE_SIDE))
+    pixels = np.asarray(sample.convert("RGB"), dtype=np.float32).reshape(-1, 3) / 255.0
+    r, g, b = pixels.T
+
+    maxc = pixels.max(axis=1)
+    delta = maxc - pixels.min(axis=1)
+    saturation = np.where(maxc > 0, delta / np.maximum(maxc, 1e-6), 0.0)
+    luminance = pixels @ LUMA
+    safe_delta = np.maximum(delta, 1e-6)
+    hue = 60 * np.select(
+        [maxc == r, maxc == g],
+        [((g - b) / safe_delta) % 6, (b - r) / safe_delta + 2],
+        (r - g) / safe_delta + 4,
+    )
+
+    chromatic = (saturation >= CHROMA_THRESHOLD) & (maxc >= 0.1)
+    # Sarı-yeşil ve mor arası tonlar iki gruba da girmez
+    warm = chromatic & ((hue < 70) | (hue >= 330))
+    cool = chromatic & (hue >= 160) & (hue < 280)
+
+    # Hasler-Süsstrunk renkliliği (0..255 ölçeğinde karşıt renk kanalları)
+    rg = (r - g) * 255
+    yb = (0.5 * (r + g) - b) * 255
+    colorfulness = (np.hypot(rg.std(), yb.std()) + 0.3 * np.hypot(rg.mean(), yb.mean())) / 100
+
+    stats = [
+        warm.mean(), cool.mean(), 1 - chromatic.mean(),
+        saturation.mean(), saturation.std(),
+        luminance.mean(), luminance.std(),
+        min(colorfulness, 1.0),
+    ]
+    return [float(value) for value in stats] + _kmeans_palette(pixels)
+
+
+def color_features(path: str) -> List[float]:
+    """Diskteki görselin renk özellik vektörü (katalog renk indeksi için)"""
+    with Image.open(path) as source:
+        image = _open_oriented(source, COLOR_SAMPLE_SIDE)
+    return color_stats(image)
+
+
+def prepare_upload(data: bytes, max_side: int = VISION_MAX_SIDE) -> Dict[str, Any]:
+    """
+    Yüklenen görseli çözer, yönünü düzeltir ve vision modeline uygun boyuta
+    küçültür; JPEG baytlarıyla birlikte palet, pHash ve renk özellikleri döner.
+    Geçersiz görselde PIL hatası yükselir.
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        original_size = source.size
+        image = _open_oriented(source, max_side)
+
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=VISION_JPEG_QUALITY, optimize=True)
+    features = color_stats(image)
+    return {
+        "width": original_size[0],
+        "height": original_size[1],
+        "jpeg": output.getvalue(),
+        "palette": palette_rgb(features),
+        "phash": perceptual_hash(image),
+        "color_features": features,
+    }
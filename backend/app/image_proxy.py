@@ -0,0 +1,284 @@
+"""
+Image Proxy for ArtStoryAI
+Uzak ve yerel eser görselleri için disk önbellekli küçük resim servisi
+
+- Kaynak bir kez indirilir/okunur ve içerik adresli olarak saklanır:
+  originals/<sha256[:2]>/<sha256>
+- Varyantlar standart genişliklerde WebP (destekleniyorsa AVIF) olarak
+  süreç havuzunda üretilir: variants/<sha256[:2]>/<sha256>-<genişlik>.<biçim>
+- Kaynak -> içerik özeti eşlemesi sources/ altında tutulur; yerel dosyalarda
+  anahtar dosya boyutu ve mtime içerdiği için değişen dosya yeniden işlenir
+- ETag içerik özetinden türetilir (güçlü); içerik adresli URL'ler immutable
+"""
+
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from app import image_processing
+from app.http_client import http_client
+from app.manual_asset_catalog import filter_image_catalog
+from app.manual_image_manager import manual_image_manager
+from app.single_flight import thumbnail_flights
+
+DEFAULT_IMAGE_CACHE_DIR = "image_cache"
+STANDARD_WIDTHS = (160, 320, 640, 1280)
+DEFAULT_FORMAT = "webp"
+# Kodlayıcı ayarları değişirse artırılır (ETag ve dosya adlarına girer)
+VARIANT_VERSION = 1
+MAX_SOURCE_BYTES = 25 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+
+# Proxy yalnızca bilinen müze/görsel sunucularından indirir (açık proxy olmasın)
+DEFAULT_ALLOWED_HOSTS = (
+    "upload.wikimedia.org",
+    "commons.wikimedia.org",
+    "www.artic.edu",
+    "images.metmuseum.org",
+    "collectionapi.metmuseum.org",
+    "lh3.googleusercontent.com",
+)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Yerel dosyalar değiştirilebilir: kısa süre sonra ETag ile yeniden doğrulanır
+REVALIDATE_CACHE_CONTROL = "public, max-age=300"
+
+# Yerel kaynak önekleri: filtre görselleri ve eser sayfası manuel görselleri
+FILTER_IMAGE_PREFIX = "/manual_images/"
+MANUAL_IMAGE_PREFIX = "/manual-images/"
+LOCAL_HOSTS = ("localhost", "127.0.0.1")
+
+
+class ImageProxyError(Exception):
+    """Kaynak görsel alınamadı veya işlenemedi"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    """Diskteki bir küçük resim varyantı"""
+    path: Path
+    digest: str
+    width: int
+    fmt: str
+    immutable: bool
+
+    @property
+    def media_type(self) -> str:
+        return image_processing.VARIANT_FORMATS[self.fmt][2]
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest[:32]}-{self.width}-v{VARIANT_VERSION}.{self.fmt}"'
+
+    @property
+    def cache_control(self) -> str:
+        return IMMUTABLE_CACHE_CONTROL if self.immutable else REVALIDATE_CACHE_CONTROL
+
+    @property
+    def content_url(self) -> str:
+        """İçerik adresli (immutable) URL"""
+        return f"/images/v/{self.digest}/{self.width}.{self.fmt}"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+class ImageProxy:
+    """Fetch-once, content-addressed thumbnail cache"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir or os.getenv("IMAGE_CACHE_DIR", DEFAULT_IMAGE_CACHE_DIR))
+        extra_hosts = [host.strip() for host in os.getenv("IMAGE_PROXY_ALLOWED_HOSTS", "").split(",") if host.strip()]
+        self.allowed_hosts = frozenset((*DEFAULT_ALLOWED_HOSTS, *extra_hosts))
+        self._formats = None
+
+    # Parametreler
+
+    @staticmethod
+    def snap_width(width: Optional[int]) -> int:
+        """İstenen genişliği onu karşılayan en küçük standart genişliğe yuvarlar"""
+        if not width:
+            return STANDARD_WIDTHS[-1]
+        for standard in STANDARD_WIDTHS:
+            if width <= standard:
+                return standard
+        return STANDARD_WIDTHS[-1]
+
+    @property
+    def formats(self):
+        if self._formats is None:
+            self._formats = image_processing.supported_formats()
+        return self._formats
+
+    def negotiate_format(self, fmt: Optional[str], accept: str = "") -> str:
+        """Açık biçim yoksa Accept başlığına göre AVIF, değilse WebP"""
+        if fmt:
+            fmt = fmt.lower()
+            if fmt not in self.formats:
+                raise ImageProxyError(400, f"Desteklenmeyen biçim: {fmt}")
+            return fmt
+        if "image/avif" in accept and "avif" in self.formats:
+            return "avif"
+        return DEFAULT_FORMAT
+
+    # Disk düzeni
+
+    def _original_path(self, digest: str) -> Path:
+        return self.cache_dir / "originals" / digest[:2] / digest
+
+    def _variant_path(self, digest: str, width: int, fmt: str) -> Path:
+        return self.cache_dir / "variants" / digest[:2] / f"{digest}-{width}-v{VARIANT_VERSION}.{fmt}"
+
+    def _source_path(self, source_key: str) -> Path:
+        return self.cache_dir / "sources" / _sha256(source_key.encode("utf-8"))
+
+    def _lookup_source(self, source_key: str) -> Optional[str]:
+        try:
+            digest = self._source_path(source_key).read_text().strip()
+        except OSError:
+            return None
+        return digest if self._original_path(digest).exists() else None
+
+    def _store_original(self, source_key: str, data: bytes) -> str:
+        digest = _sha256(data)
+        original = self._original_path(digest)
+        if not original.exists():
+            _write_atomic(original, data)
+        _write_atomic(self._source_path(source_key), digest.encode("ascii"))
+        return digest
+
+    # Kaynaklar
+
+    @staticmethod
+    def _local_path(src: str) -> str:
+        """Göreli yolları ve bu sunucunun mutlak URL'lerini (ör. filtre sonuçları) yerel yola çevirir"""
+        parsed = urlparse(src)
+        if not parsed.scheme or parsed.hostname in LOCAL_HOSTS:
+            return unquote(parsed.path)
+        return src
+
+    def _local_file(self, src: str) -> Optional[Path]:
+        src = self._local_path(src)
+        if src.startswith(FILTER_IMAGE_PREFIX):
+            asset = filter_image_catalog.get(src[len(FILTER_IMAGE_PREFIX):])
+            return asset.path if asset else None
+        if src.startswith(MANUAL_IMAGE_PREFIX):
+            image_path = manual_image_manager.get_manual_image(src[len(MANUAL_IMAGE_PREFIX):])
+            return Path(image_path) if image_path else None
+        return None
+
+    async def _fetch_remote(self, url: str) -> bytes:
+        chunks = []
+        size = 0
+        async with http_client.request("default", "GET", url) as response:
+            if response.status != 200:
+                raise ImageProxyError(502, f"Kaynak görsel alınamadı ({response.status})")
+            if not response.headers.get("Content-Type", "").startswith("image/"):
+                raise ImageProxyError(502, "Kaynak bir görsel değil")
+            async for chunk in response.content.iter_chunked(READ_CHUNK_BYTES):
+                size += len(chunk)
+                if size > MAX_SOURCE_BYTES:
+                    raise ImageProxyError(413, "Kaynak görsel çok büyük")
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def _load_source(self, src: str) -> Tuple[str, bool]:
+        """Kaynağın içerik özeti ve kaynağın değişmez sayılıp sayılmadığı"""
+        local_file = self._local_file(src)
+        if local_file is not None:
+            try:
+                stat = await asyncio.to_thread(local_file.stat)
+            except OSError:
+                raise ImageProxyError(404, "Resim bulunamadı")
+            source_key = f"file:{local_file.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+            immutable = False
+        elif self._local_path(src).startswith((FILTER_IMAGE_PREFIX, MANUAL_IMAGE_PREFIX)):
+            raise ImageProxyError(404, "Resim bulunamadı")
+        else:
+            parsed = urlparse(src)
+            if parsed.scheme not in ("http", "https") or parsed.hostname not in self.allowed_hosts:
+                raise ImageProxyError(400, "Bu kaynaktan görsel alınamaz")
+            source_key = f"url:{src}"
+            immutable = True
+
+        digest = await asyncio.to_thread(self._lookup_source, source_key)
+        if digest is not None:
+            return digest, immutable
+
+        async def _load() -> str:
+            if local_file is not None:
+                data = await asyncio.to_thread(local_file.read_bytes)
+            else:
+                try:
+                    data = await self._fetch_remote(src)
+                except ImageProxyError:
+                    raise
+                except Exception as e:
+                    raise ImageProxyError(502, f"Kaynak görsel alınamadı: {e}")
+            return await asyncio.to_thread(self._store_original, source_key, data)
+
+        return await thumbnail_flights.do(source_key, _load), immutable
+
+    async def original(self, src: str) -> Path:
+        """Kaynağın diskteki özgün kopyası (gerekirse indirilir)"""
+        digest, _ = await self._load_source(src)
+        return self._original_path(digest)
+
+    # Varyantlar
+
+    async def _render(self, digest: str, width: int, fmt: str) -> Path:
+        target = self._variant_path(digest, width, fmt)
+        if await asyncio.to_thread(target.exists):
+            return target
+
+        async def _create() -> Path:
+            await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+            try:
+                await image_processing.run(
+                    image_processing.render_variant, str(self._original_path(digest)), str(target), width, fmt
+                )
+            except Exception as e:
+                raise ImageProxyError(422, f"Görsel işlenemedi: {e}")
+            return target
+
+        return await thumbnail_flights.do(f"variant:{target.name}", _create)
+
+    async def thumbnail(self, src: str, width: Optional[int] = None, fmt: Optional[str] = None,
+                        accept: str = "") -> ImageVariant:
+        """Kaynak URL'si veya yerel yol için küçük resim varyantı"""
+        width = self.snap_width(width)
+        fmt = self.negotiate_format(fmt, accept)
+        digest, immutable = await self._load_source(src)
+        path = await self._render(digest, width, fmt)
+        return ImageVariant(path, digest, width, fmt, immutable)
+
+    async def variant(self, digest: str, width: int, fmt: str) -> ImageVariant:
+        """İçerik adresli varyant (yalnızca daha önce alınmış kaynaklar için)"""
+        if width not in STANDARD_WIDTHS or len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+            raise ImageProxyError(404, "Resim bulunamadı")
+        fmt = self.negotiate_format(fmt)
+        if not await asyncio.to_thread(self._original_path(digest).exists):
+            raise ImageProxyError(404, "Resim bulunamadı")
+        path = await self._render(digest, width, fmt)
+        return ImageVariant(path, digest, width, fmt, True)
+
+
+# Global instance
+image_proxy = ImageProxy()
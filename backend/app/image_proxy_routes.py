@@ -0,0 +1,59 @@
+"""
+Image Proxy API Routes
+Küçük resim varyantları (WebP/AVIF, standart genişlikler)
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response
+
+from .image_proxy import ImageProxyError, ImageVariant, image_proxy
+
+router = APIRouter(prefix="/images", tags=["images"])
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match", "")
+    return any(tag.strip() in (etag, "*") for tag in if_none_match.split(",")) if if_none_match else False
+
+
+def _variant_response(request: Request, variant: ImageVariant, negotiated: bool) -> Response:
+    headers = {
+        "ETag": variant.etag,
+        "Cache-Control": variant.cache_control,
+        "Content-Location": variant.content_url,
+    }
+    if negotiated:
+        headers["Vary"] = "Accept"
+    if _etag_matches(request, variant.etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(variant.path, media_type=variant.media_type, headers=headers)
+
+
+@router.get("/thumbnail")
+async def get_thumbnail(
+    request: Request,
+    src: str = Query(..., description="Uzak görsel URL'si veya /manual_images/, /manual-images/ yolu"),
+    w: Optional[int] = Query(default=None, ge=1, le=4096, description="İstenen genişlik (standart genişliğe yuvarlanır)"),
+    format: Optional[str] = Query(default=None, description="webp veya avif (boşsa Accept başlığına göre)")
+):
+    """Görselin küçültülmüş varyantını döndürür (ilk istekte üretilip diske yazılır)"""
+    try:
+        variant = await image_proxy.thumbnail(src, w, format, request.headers.get("accept", ""))
+    except ImageProxyError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    return _variant_response(request, variant, negotiated=format is None)
+
+
+@router.get("/v/{digest}/{variant_name}")
+async def get_content_variant(request: Request, digest: str, variant_name: str):
+    """İçerik adresli varyant; içerik hiç değişmediği için immutable önbelleklenir"""
+    width, _, fmt = variant_name.partition(".")
+    if not width.isdigit() or not fmt:
+        raise HTTPException(status_code=404, detail="Resim bulunamadı")
+    try:
+        variant = await image_proxy.variant(digest, int(width), fmt)
+    except ImageProxyError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    return _variant_response(request, variant, negotiated=False)
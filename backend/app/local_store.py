@@ -0,0 +1,93 @@
+"""
+Local Store for ArtStoryAI
+Embedded SQLite database for caches that must survive restarts
+
+Veriler yerel bir SQLite dosyasında tutulur; PostgreSQL veya Redis
+olmadan da çalışır. Her modül kendi tablolarını register_schema ile
+tanımlar, tablolar ilk bağlantıda oluşturulur.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Iterable, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_LOCAL_STORE_PATH = "local_store.sqlite3"
+
+
+class LocalStore:
+    """Thread-safe SQLite wrapper; blocking calls run off the event loop via run()"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("LOCAL_STORE_PATH", DEFAULT_LOCAL_STORE_PATH)
+        self._schema: List[str] = []
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def register_schema(self, *statements: str) -> None:
+        """Register CREATE TABLE/INDEX statements (IF NOT EXISTS)"""
+        with self._lock:
+            self._schema.extend(statements)
+            if self._connection is not None:
+                for statement in statements:
+                    self._connection.execute(statement)
+                self._connection.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in self._schema:
+                connection.execute(statement)
+            connection.commit()
+            self._connection = connection
+            logger.info(f"Local store opened: {self.path}")
+        return self._connection
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Run a write statement and commit; returns affected row count"""
+        with self._lock:
+            connection = self._connect()
+            cursor = connection.execute(sql, params)
+            connection.commit()
+            return cursor.rowcount
+
+    def executemany(self, sql: str, rows: Iterable[Sequence[Any]]) -> None:
+        """Run a write statement for many rows in one transaction"""
+        with self._lock:
+            connection = self._connect()
+            connection.executemany(sql, rows)
+            connection.commit()
+
+    def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchone()
+
+    def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking store call in a worker thread"""
+        return await asyncio.to_thread(func, *args)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# Global instance
+local_store = LocalStore()
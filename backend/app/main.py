@@ -2,13 +2,16 @@
 Main FastAPI application for ArtStoryAI
 """
 
+import json
 import os
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, File, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from app.schemas import StoryAudioRequest, TextAudioRequest
 from app.artwork_service import artwork_service
+from app.features.openai_story import client as openai_client
+from app.image_analyzer import MAX_UPLOAD_BYTES, analyze_with_openai_vision, image_summary, prepare_image
 from app.features.text_to_speech import generate_story_audio, generate_speech_from_text, get_available_voices
 from app.recommendation_routes import router as recommendation_router
 from app.cache_service import artwork_cache
@@ -16,6 +19,14 @@ from app.redis_cache_service import redis_cache
 from app.manual_image_routes import router as manual_image_router
 from app.met_museum_service import met_museum_service
 from app.filter_routes import router as filter_router
+from app.image_proxy_routes import router as image_proxy_router
+from app import image_processing
+from app.http_client import http_client
+from app.manual_asset_catalog import start_watchers, stop_watchers
+from app.services.image_url_store import image_url_store
+from app.services.phash_index import phash_index
+from app.services.color_index import color_index
+from app.single_flight import single_flight_stats
 from agents.agent_manager import AgentManager
 
 
@@ -58,10 +69,39 @@ app.include_router(manual_image_router)
 # Include filter routes
 app.include_router(filter_router)
 
+# Küçük resim proxy'si (WebP/AVIF varyantları)
+app.include_router(image_proxy_router)
+
 # Static files için manual_images klasörünü serve et
 app.mount("/manual_images", StaticFiles(directory="manual_images"), name="manual_images")
 
 
+@app.on_event("startup")
+async def startup_event():
+    """Uygulama ömrü boyunca paylaşılan kaynakları başlat"""
+    await http_client.startup()
+    # L2 önbellek; bağlantı yoksa yalnızca bellek içi önbellek kullanılır
+    await redis_cache.connect()
+    # Manuel görsel kataloglarını değişikliklere karşı izle
+    start_watchers()
+    # Çözümlenmiş görsel tablosu ve ölü bağlantı doğrulayıcısı
+    await image_url_store.start()
+    # Yüklenen görselleri katalogla eşleştiren pHash indeksi (arka planda)
+    await phash_index.start()
+    # Katalog görsellerinin renk özellikleri ("Renk" filtresi)
+    await color_index.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Paylaşılan kaynakları kapat"""
+    await http_client.shutdown()
+    await stop_watchers()
+    await image_url_store.stop()
+    await phash_index.stop()
+    await color_index.stop()
+    image_processing.shutdown_executor()
+    await redis_cache.disconnect()
+
 
 @app.get("/")
 def read_root():
@@ -78,10 +118,10 @@ def get_manual_upload_page():
         return HTMLResponse(content="<h1>Manuel yükleme sayfası bulunamadı</h1>")
 
 @app.get("/artwork/{art_name}")
-def get_artwork_info(art_name: str):
+async def get_artwork_info(art_name: str):
     """Get comprehensive artwork information"""
     try:
-        return artwork_service.get_artwork_info(art_name)
+        return await artwork_service.get_artwork_info(art_name)
     except Exception as e:
         print(f"Artwork info hatası: {e}")
         return {
@@ -89,28 +129,61 @@ def get_artwork_info(art_name: str):
             "details": str(e)
         }
 
+@app.post("/artwork/upload")
+async def upload_artwork_image(image: UploadFile = File(...)):
+    """Yüklenen görseldeki eseri tanır (çözme ve küçültme süreç havuzunda)"""
+    image_data = await image.read(MAX_UPLOAD_BYTES + 1)
+    if len(image_data) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Görsel çok büyük")
+    try:
+        prepared = await prepare_image(image_data)
+    except Exception as e:
+        print(f"Görsel çözme hatası: {e}")
+        raise HTTPException(status_code=400, detail="Geçersiz görsel dosyası")
+    
+    # Katalogdaki bir görselin kopyasıysa vision modeline gidilmez
+    analysis = phash_index.match_analysis(prepared["phash"])
+    if analysis is None:
+        analysis = await analyze_with_openai_vision(image_data, openai_client, prepared)
+    return {**analysis, "image": image_summary(prepared)}
+
+def _parse_filter_params(
+    periods: str = None,
+    styles: str = None,
+    colors: str = None,
+    sizes: str = None,
+    museums: str = None,
+    cultures: str = None
+) -> dict:
+    """URL parametrelerini filtre sözlüğüne çevirir"""
+    filters = {}
+    if periods:
+        filters['periods'] = periods.split(',')
+    if styles:
+        filters['styles'] = styles.split(',')
+    if colors:
+        filters['colors'] = colors.split(',')
+    if sizes:
+        filters['sizes'] = sizes.split(',')
+    if museums:
+        filters['museums'] = museums.split(',')
+    if cultures:
+        filters['cultures'] = cultures.split(',')
+    return filters
+
 @app.get("/api/filter-artworks")
 async def filter_artworks(
     periods: str = None,
     styles: str = None,
     colors: str = None,
     sizes: str = None,
-    museums: str = None
+    museums: str = None,
+    cultures: str = None
 ):
     """Filter artworks based on criteria"""
     try:
         # URL parametrelerini parse et
-        filters = {}
-        if periods:
-            filters['periods'] = periods.split(',')
-        if styles:
-            filters['styles'] = styles.split(',')
-        if colors:
-            filters['colors'] = colors.split(',')
-        if sizes:
-            filters['sizes'] = sizes.split(',')
-        if museums:
-            filters['museums'] = museums.split(',')
+        filters = _parse_filter_params(periods, styles, colors, sizes, museums, cultures)
         
         # MET Museum API'den filtreli sonuçları al
         artworks = await met_museum_service.get_filtered_artworks(filters)
@@ -129,6 +202,28 @@ async def filter_artworks(
             "details": str(e)
         }
 
+@app.get("/api/filter-artworks/stream")
+async def stream_filter_artworks(
+    periods: str = None,
+    styles: str = None,
+    colors: str = None,
+    sizes: str = None,
+    museums: str = None,
+    cultures: str = None
+):
+    """Filter artworks, streaming each artwork as NDJSON as soon as it arrives"""
+    filters = _parse_filter_params(periods, styles, colors, sizes, museums, cultures)
+
+    async def artwork_lines():
+        try:
+            async for artwork in met_museum_service.stream_filtered_artworks(filters):
+                yield json.dumps(artwork, ensure_ascii=False) + "\n"
+        except Exception as e:
+            print(f"Filter stream hatası: {e}")
+            yield json.dumps({"error": "Filtreleme sırasında hata oluştu", "details": str(e)}) + "\n"
+
+    return StreamingResponse(artwork_lines(), media_type="application/x-ndjson")
+
 # Sesli Anlatım Endpoint'leri
 @app.post("/audio/story")
 def create_story_audio(request: StoryAudioRequest):
@@ -237,6 +332,10 @@ async def get_cache_stats():
         return {
             "in_memory_cache": in_memory_stats,
             "redis_cache": redis_stats,
+            "single_flight": single_flight_stats(),
+            "resolved_images": image_url_store.stats(),
+            "image_hashes": phash_index.stats(),
+            "color_features": color_index.stats(),
             "message": "Cache istatistikleri başarıyla alındı"
         }
     except Exception as e:
@@ -270,10 +369,9 @@ def get_cache_keys():
     Cache'deki tüm anahtarları listeler
     """
     try:
-        keys = list(artwork_cache.cache.keys())
         return {
-            "total_keys": len(keys),
-            "keys": keys[:50],  # İlk 50 anahtarı göster
+            "total_keys": len(artwork_cache.cache),
+            "keys": artwork_cache.keys(limit=50),  # İlk 50 anahtarı göster
             "message": "Cache anahtarları başarıyla alındı"
         }
     except Exception as e:
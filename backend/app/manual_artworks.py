@@ -5,6 +5,8 @@ Handles manually curated artworks that AI cannot find
 
 from typing import Dict, List, Optional
 
+from app.name_index import NameIndex
+
 class ManualArtworkManager:
     """Manages manually curated artwork information"""
     
@@ -155,27 +157,26 @@ class ManualArtworkManager:
                 "movement_desc": "Yüksek Rönesans, 16. yüzyılda İtalya'da gelişen ve sanatın mükemmelliğe ulaştığı dönemdir. Michelangelo, Leonardo da Vinci ve Raphael bu dönemin en önemli temsilcileridir."
             }
         }
+        # Eser eklendiğinde/silindiğinde artar (katalog yeniden oluşturulur)
+        self.version = 0
+        # Normalize edilmiş isim ve başlıklar üzerinden arama indeksi
+        self.name_index: NameIndex[Dict] = NameIndex()
+        for art_name, artwork_data in self.manual_artworks.items():
+            self._index_artwork(art_name, artwork_data)
+    
+    def _index_artwork(self, art_name: str, artwork_data: Dict) -> None:
+        self.name_index.add(art_name, artwork_data, aliases=[artwork_data.get("title", "")])
     
     def get_manual_artwork(self, art_name: str) -> Optional[Dict]:
-        """Get manual artwork with fuzzy matching"""
-        # Exact match first
-        if art_name in self.manual_artworks:
-            return self.manual_artworks[art_name]
-        
-        # Case-insensitive fuzzy match
-        art_name_lower = art_name.lower().strip()
-        for name, artwork_data in self.manual_artworks.items():
-            if (art_name_lower == name.lower() or 
-                art_name_lower in name.lower() or 
-                name.lower() in art_name_lower):
-                return artwork_data
-        
-        return None
+        """Get manual artwork with exact, prefix or fuzzy matching"""
+        return self.name_index.lookup(art_name)
     
     def add_manual_artwork(self, art_name: str, artwork_data: Dict) -> bool:
         """Add new manual artwork"""
         try:
             self.manual_artworks[art_name] = artwork_data
+            self._index_artwork(art_name, artwork_data)
+            self.version += 1
             return True
         except Exception as e:
             print(f"Manuel eser ekleme hatası: {e}")
@@ -186,6 +187,8 @@ class ManualArtworkManager:
         try:
             if art_name in self.manual_artworks:
                 del self.manual_artworks[art_name]
+                self.name_index.remove(art_name)
+                self.version += 1
                 return True
             return False
         except Exception as e:
@@ -0,0 +1,253 @@
+"""
+Manual Asset Catalog for ArtStoryAI
+Manuel görsel klasörlerinin bellek içi kataloğu
+
+Her klasör bir manifest.json dosyası ile tanımlanır (dosya adı -> eser
+bilgileri). Katalog açılışta bir kez yüklenir; sonrasında arka planda
+dosya sistemini periyodik olarak tarayan bir izleyici yalnızca değişen
+dosyaları günceller. İstek işleyicileri dosya sistemine dokunmaz.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+MANIFEST_FILENAME = "manifest.json"
+DEFAULT_POLL_INTERVAL_SECONDS = 5.0
+
+# dosya adı -> (mtime_ns, boyut)
+DirectorySnapshot = Dict[str, Tuple[int, int]]
+
+
+@dataclass(frozen=True)
+class ManualAsset:
+    """Katalogdaki tek bir görsel dosyası"""
+
+    filename: str
+    path: Path
+    size: int
+    mtime_ns: int
+    metadata: Dict = field(default_factory=dict)
+
+    @property
+    def stem(self) -> str:
+        return Path(self.filename).stem
+
+    @property
+    def name(self) -> str:
+        """Eser adı: manifestte yoksa dosya adından türetilir"""
+        return (
+            self.metadata.get("artwork_name")
+            or self.metadata.get("title")
+            or self.stem.replace("_", " ").replace("-", " ")
+        )
+
+
+# Değişiklik dinleyicisi: (eklenenler, kaldırılanlar); güncellenen dosya ikisinde de yer alır
+ChangeListener = Callable[[List[ManualAsset], List[ManualAsset]], None]
+
+
+class ManualAssetCatalog:
+    """Manifest + directory snapshot, refreshed incrementally by a polling watcher"""
+
+    def __init__(self, directory: Path, poll_interval: Optional[float] = None):
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / MANIFEST_FILENAME
+        self.poll_interval = poll_interval or float(
+            os.getenv("MANUAL_ASSET_POLL_SECONDS", DEFAULT_POLL_INTERVAL_SECONDS)
+        )
+        # Okuyucular her zaman tutarlı bir sözlük görür (değişiklikte yenisi atanır)
+        self.assets: Dict[str, ManualAsset] = {}
+        self.manifest: Dict[str, Dict] = {}
+        # Katalog her değiştiğinde artar
+        self.version = 0
+        self._snapshot: DirectorySnapshot = {}
+        self._manifest_mtime_ns: Optional[int] = None
+        self._listeners: List[ChangeListener] = []
+        self._watch_task: Optional[asyncio.Task] = None
+        self.load()
+
+    # --- Okuma ---
+
+    def get(self, filename: str) -> Optional[ManualAsset]:
+        return self.assets.get(filename)
+
+    def all_assets(self) -> List[ManualAsset]:
+        return sorted(self.assets.values(), key=lambda asset: asset.filename)
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        """Dinleyiciyi kaydeder ve mevcut dosyaları eklenmiş olarak bildirir"""
+        self._listeners.append(listener)
+        if self.assets:
+            listener(self.all_assets(), [])
+
+    # --- Tarama ---
+
+    def _read_manifest(self) -> Tuple[Optional[int], Dict[str, Dict]]:
+        try:
+            mtime_ns = self.manifest_path.stat().st_mtime_ns
+        except OSError:
+            return None, {}
+        if mtime_ns == self._manifest_mtime_ns:
+            return mtime_ns, self.manifest
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Manifest okunamadı ({self.manifest_path}): {e}")
+            return self._manifest_mtime_ns, self.manifest
+        artworks = data.get("artworks", data) if isinstance(data, dict) else {}
+        return mtime_ns, {name: meta for name, meta in artworks.items() if isinstance(meta, dict)}
+
+    def _scan_directory(self) -> DirectorySnapshot:
+        snapshot: DirectorySnapshot = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if Path(entry.name).suffix.lower() not in IMAGE_EXTENSIONS:
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    if entry.is_file():
+                        snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return snapshot
+
+    def _scan(self) -> Tuple[Optional[int], Dict[str, Dict], DirectorySnapshot]:
+        """Engelleyici kısım: manifest ve klasör taraması"""
+        manifest_mtime, manifest = self._read_manifest()
+        return manifest_mtime, manifest, self._scan_directory()
+
+    def _apply(self, manifest_mtime: Optional[int], manifest: Dict[str, Dict],
+               snapshot: DirectorySnapshot) -> bool:
+        """Taramayı mevcut durumla karşılaştırır; yalnızca farkları uygular"""
+        manifest_changed = manifest_mtime != self._manifest_mtime_ns
+        if not manifest_changed and snapshot == self._snapshot:
+            return False
+
+        added: List[ManualAsset] = []
+        removed: List[ManualAsset] = []
+        assets = dict(self.assets)
+
+        for filename in self._snapshot.keys() - snapshot.keys():
+            removed.append(assets.pop(filename))
+
+        for filename, (mtime_ns, size) in snapshot.items():
+            current = assets.get(filename)
+            metadata = manifest.get(filename, {})
+            if (current is not None and current.mtime_ns == mtime_ns
+                    and current.size == size and current.metadata == metadata):
+                continue
+            asset = ManualAsset(filename, self.directory / filename, size, mtime_ns, metadata)
+            if current is not None:
+                removed.append(current)
+            assets[filename] = asset
+            added.append(asset)
+
+        self.manifest = manifest
+        self._manifest_mtime_ns = manifest_mtime
+        self._snapshot = snapshot
+        if not added and not removed:
+            return False
+
+        self.assets = assets
+        self.version += 1
+        for listener in self._listeners:
+            try:
+                listener(added, removed)
+            except Exception as e:
+                logger.error(f"Manuel katalog dinleyicisi hatası: {e}")
+        return True
+
+    def load(self) -> None:
+        """Açılışta tam yükleme"""
+        self._apply(*self._scan())
+        logger.info(f"Manuel katalog yüklendi: {self.directory} ({len(self.assets)} görsel)")
+
+    def refresh(self) -> bool:
+        """Senkron artımlı güncelleme (betikler ve testler için)"""
+        return self._apply(*self._scan())
+
+    async def refresh_async(self) -> bool:
+        """Tarama iş parçacığında, uygulama olay döngüsünde yapılır"""
+        scan = await asyncio.to_thread(self._scan)
+        return self._apply(*scan)
+
+    # --- Manifest güncelleme ---
+
+    def _write_manifest(self, manifest: Dict[str, Dict]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"artworks": manifest}, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(temp_path, self.manifest_path)
+
+    def register(self, filename: str, metadata: Dict) -> Optional[ManualAsset]:
+        """Yeni yazılan bir dosyanın bilgisini manifeste ekler ve kataloğu günceller"""
+        manifest = dict(self.manifest)
+        manifest[filename] = metadata
+        self._write_manifest(manifest)
+        self.refresh()
+        return self.assets.get(filename)
+
+    def unregister(self, filename: str) -> None:
+        """Silinen dosyayı manifestten çıkarır ve kataloğu günceller"""
+        if filename in self.manifest:
+            manifest = dict(self.manifest)
+            manifest.pop(filename)
+            self._write_manifest(manifest)
+        self.refresh()
+
+    # --- İzleyici ---
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if await self.refresh_async():
+                    logger.info(f"Manuel katalog güncellendi: {self.directory} ({len(self.assets)} görsel)")
+            except Exception as e:
+                logger.error(f"Manuel katalog taraması başarısız: {e}")
+
+    def start_watching(self) -> None:
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop_watching(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+
+# Global instances
+# Filtre sayfasının görselleri (/manual_images altında sunulur)
+filter_image_catalog = ManualAssetCatalog(Path("manual_images"))
+# Eser sayfalarının görselleri (frontend/public/artworks)
+artwork_image_catalog = ManualAssetCatalog(Path("../frontend/public/artworks"))
+
+MANUAL_ASSET_CATALOGS = (filter_image_catalog, artwork_image_catalog)
+
+
+def start_watchers() -> None:
+    for catalog in MANUAL_ASSET_CATALOGS:
+        catalog.start_watching()
+
+
+async def stop_watchers() -> None:
+    for catalog in MANUAL_ASSET_CATALOGS:
+        await catalog.stop_watching()
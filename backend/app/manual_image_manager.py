@@ -5,77 +5,109 @@ Handles local image uploads and storage for artworks
 
 import os
 import shutil
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from pathlib import Path
 from fastapi import UploadFile, File
 from fastapi.responses import FileResponse
 import uuid
 
+from app.manual_asset_catalog import IMAGE_EXTENSIONS, ManualAsset, artwork_image_catalog
+from app.name_index import NameIndex
+
 class ManualImageManager:
     """Manages manually uploaded artwork images"""
 
     def __init__(self):
-        # Resimlerin saklandığı klasör (public/artworks)
-        self.images_dir = Path("../frontend/public/artworks")
+        # Resimlerin saklandığı klasörün kataloğu (public/artworks + manifest.json)
+        self.catalog = artwork_image_catalog
+        self.images_dir = self.catalog.directory
         
         # Manuel resim veritabanı (eser adı -> dosya yolu)
         self.manual_images = {}
-        self._load_existing_images()
-
-    def _load_existing_images(self):
-        """Mevcut manuel resimleri yükle"""
-        if self.images_dir.exists():
-            for image_file in self.images_dir.glob("*.*"):
-                # Dosya adından eser adını çıkar
-                filename = image_file.stem
-                file_extension = image_file.suffix.lower()
-                
-                # Sadece resim dosyalarını kabul et
-                if file_extension not in ['.jpg', '.jpeg', '.png', '.webp']:
-                    continue
-                
-                # Dosya adı -> eser adı eşleştirmesi (Public/Artworks klasöründeki dosyalar)
-                filename_to_artwork = {
-                    "VenüsDogusu": "Venüs'ün Doğuşu",
-                    "Adem": "Adem'in Yaratılışı",
-                    "Nilüferler": "Nilüferler",
-                    "Cans": "Campbell'ın Çorba Kutuları",
-                    "amerikanGotiği": "Amerikan Gotiği",
-                    "David": "Davut",
-                    "kaplumbagaTerbiyecisi": "Kaplumbağa Terbiyecisi",
-                    "koyluKadın": "Köylü Kadın",
-                    "Weeping-woman": "Ağlayan Kadın",
-                    "Picasso_Guernica": "Guernica",
-                    "avignonluKızlar": "Avignonlu Kızlar",
-                    "themilkmaid": "Sütçü Kız",
-                    "ladywithandermine": "Sansar ile Leydi",
-                    "sarıev": "Sarı Ev",
-                    "kafeTerastaGece": "Kafe Terasta Gece",
-                    "sunflowers": "Ayçiçekleri"
-                }
-
-                # Eser adını bul
-                artwork_name = filename_to_artwork.get(filename, filename.replace("_", " ").replace("-", " "))
-
-                # Veritabanına ekle
-                self.manual_images[artwork_name] = str(image_file)
-                print(f"📁 Manuel resim yüklendi: {artwork_name} -> {filename}{file_extension}")
+        # Eser adı -> dosya boyutu (listelemelerde diske gidilmez)
+        self.file_sizes: Dict[str, int] = {}
+        # Normalize edilmiş eser ve dosya adları üzerinden arama indeksi
+        self.name_index: NameIndex[str] = NameIndex()
+        # Resim eklendiğinde/silindiğinde artar (katalog yeniden oluşturulur)
+        self.version = 0
+        # Mevcut dosyalar hemen, sonraki değişiklikler izleyiciden gelir
+        self.catalog.add_listener(self._on_catalog_change)
+
+    def _on_catalog_change(self, added: List[ManualAsset], removed: List[ManualAsset]) -> None:
+        """Katalogdaki değişiklikleri kayıt ve arama indeksine uygular"""
+        for asset in removed:
+            if self.manual_images.get(asset.name) == str(asset.path):
+                self.remove_manual_image(asset.name)
+        for asset in added:
+            # Dosya adı da arama için takma ad olur
+            self.add_manual_image(asset.name, str(asset.path), aliases=[asset.stem])
+            self.file_sizes[asset.name] = asset.size
 
     def get_manual_image(self, artwork_name: str) -> Optional[str]:
-        """Get manual image path for artwork with fuzzy matching"""
-        # Exact match first
-        if artwork_name in self.manual_images:
-            return self.manual_images[artwork_name]
-        
-        # Case-insensitive fuzzy match
-        artwork_name_lower = artwork_name.lower().strip()
-        for name, image_path in self.manual_images.items():
-            if (artwork_name_lower == name.lower() or 
-                artwork_name_lower in name.lower() or 
-                name.lower() in artwork_name_lower):
-                return image_path
-        
-        return None
+        """Get manual image path for artwork with exact, prefix or fuzzy matching"""
+        return self.name_index.lookup(artwork_name)
+
+    def add_manual_image(self, artwork_name: str, image_path: str, aliases: Iterable[str] = ()) -> None:
+        """Register an image file for an artwork"""
+        self.manual_images[artwork_name] = image_path
+        self.name_index.add(artwork_name, image_path, aliases=aliases)
+        self.version += 1
+
+    def remove_manual_image(self, artwork_name: str) -> Optional[str]:
+        """Unregister an artwork image, returning its file path"""
+        image_path = self.manual_images.pop(artwork_name, None)
+        self.file_sizes.pop(artwork_name, None)
+        self.name_index.remove(artwork_name)
+        if image_path is not None:
+            self.version += 1
+        return image_path
+
+    def upload_artwork_image(self, artwork_name: str, image_file: UploadFile) -> Dict:
+        """Save an uploaded image into the artworks folder"""
+        file_extension = Path(image_file.filename or "").suffix.lower()
+        if file_extension not in IMAGE_EXTENSIONS:
+            return {"success": False, "error": "Desteklenmeyen dosya formatı"}
+
+        try:
+            self.images_dir.mkdir(parents=True, exist_ok=True)
+            # Dosya adı eser adından türetilir, böylece yeniden başlatmada eşleşir
+            filename = "_".join(artwork_name.split()) or uuid.uuid4().hex
+            filename = "".join(c for c in filename if c.isalnum() or c in "_-") or uuid.uuid4().hex
+            image_path = self.images_dir / f"{filename}{file_extension}"
+            with open(image_path, "wb") as buffer:
+                shutil.copyfileobj(image_file.file, buffer)
+        except Exception as e:
+            print(f"Manuel resim yükleme hatası: {e}")
+            return {"success": False, "error": str(e)}
+
+        previous_path = self.manual_images.get(artwork_name)
+        if previous_path and previous_path != str(image_path):
+            self._delete_file(previous_path)
+        self.catalog.register(image_path.name, {"artwork_name": artwork_name})
+        return {
+            "success": True,
+            "artwork_name": artwork_name,
+            "image_path": str(image_path),
+            "file_size": self.file_sizes.get(artwork_name, 0)
+        }
+
+    def delete_manual_image(self, artwork_name: str) -> Dict:
+        """Delete an artwork image from disk and the registry"""
+        image_path = self.manual_images.get(artwork_name)
+        if image_path is None:
+            return {"success": False, "error": "Resim bulunamadı"}
+        try:
+            self._delete_file(image_path)
+        except Exception as e:
+            print(f"Manuel resim silme hatası: {e}")
+            return {"success": False, "error": str(e)}
+        return {"success": True, "artwork_name": artwork_name}
+
+    def _delete_file(self, image_path: str) -> None:
+        """Dosyayı siler ve manifest kaydını katalogdan çıkarır"""
+        if os.path.exists(image_path):
+            os.remove(image_path)
+        self.catalog.unregister(Path(image_path).name)
 
     def serve_image(self, image_path: str) -> FileResponse:
         """Serve image file"""
@@ -86,33 +118,22 @@ class ManualImageManager:
 
     def get_all_manual_images(self) -> List[Dict]:
         """Get all manual images info"""
-        images = []
-        for artwork_name, image_path in self.manual_images.items():
-            if os.path.exists(image_path):
-                file_size = os.path.getsize(image_path)
-                images.append({
-                    "artwork_name": artwork_name,
-                    "image_path": image_path,
-                    "file_size": file_size
-                })
-        return images
+        return [
+            {
+                "artwork_name": artwork_name,
+                "image_path": image_path,
+                "file_size": self.file_sizes.get(artwork_name, 0)
+            }
+            for artwork_name, image_path in self.manual_images.items()
+        ]
 
     def search_manual_artworks(self, query: str) -> List[Dict]:
         """Search manual artworks by name"""
-        results = []
         query_lower = query.lower()
-        
-        for artwork_name, image_path in self.manual_images.items():
-            if query_lower in artwork_name.lower():
-                if os.path.exists(image_path):
-                    file_size = os.path.getsize(image_path)
-                    results.append({
-                        "artwork_name": artwork_name,
-                        "image_path": image_path,
-                        "file_size": file_size
-                    })
-        
-        return results
+        return [
+            image for image in self.get_all_manual_images()
+            if query_lower in image["artwork_name"].lower()
+        ]
 
 # Global instance
 manual_image_manager = ManualImageManager()
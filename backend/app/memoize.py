@@ -0,0 +1,125 @@
+"""
+Memoization for ArtStoryAI
+Sync ve async fonksiyonlar için tek önbellek dekoratörü
+
+- Anahtar: "memo:<ad alanı>:<fonksiyon>:<argümanların sha256'sı>" (süreçler arasında
+  kararlıdır, Redis üzerinden worker'lar arasında paylaşılır)
+- TTL: sabit saniye ya da sonuca göre TTL döndüren fonksiyon; çağrı başına
+  cache_ttl= anahtar kelimesiyle de değiştirilebilir
+- Negatif önbellek: "bulunamadı" sonuçları (varsayılan: None) negative_ttl
+  kadar kısa süre saklanır; negative_ttl verilmezse saklanmaz
+- Async fonksiyonlarda aynı anahtarın eşzamanlı çağrıları tek uçuşta birleşir;
+  tüm çağıranlar iptal edilirse çağrı da iptal edilir (sonuç saklanmaz)
+- Hatalar önbelleğe alınmaz
+
+Async fonksiyonlar verilen önbelleği (varsayılan artwork_cache: L1 + Redis)
+kullanır. Sync fonksiyonlar event loop'a erişemediği için artwork_cache'in
+sync iki katmanlı yolunu (get_shared_sync/set_shared_sync: L1 + bloklayan
+Redis istemcisi) kullanır; anahtarlar async yol ile aynıdır.
+"""
+
+import functools
+import inspect
+import logging
+from typing import Any, Callable, Optional, Union
+
+from app.cache_policy import NS_MEMO, cache_key
+from app.single_flight import memo_flights, prompt_key
+
+logger = logging.getLogger(__name__)
+
+# Negatif sonuç işareti (None önbellekte "kayıt yok" demektir)
+NEGATIVE_MARKER = "__memo_negative__"
+
+TTL = Union[int, Callable[[Any], int]]
+
+
+def memo_key(namespace: str, args: tuple, kwargs: dict) -> str:
+    """Argümanlardan kararlı önbellek anahtarı"""
+    return cache_key(NS_MEMO, namespace, prompt_key(args, kwargs))
+
+
+def _is_negative_marker(value: Any) -> bool:
+    return isinstance(value, dict) and value.get(NEGATIVE_MARKER) is True
+
+
+def memoize(ttl: TTL = 3600, namespace: Optional[str] = None,
+            negative_ttl: Optional[int] = None,
+            is_negative: Callable[[Any], bool] = lambda result: result is None,
+            cacheable: Optional[Callable[[Any], bool]] = None,
+            cache=None):
+    """
+    Fonksiyon sonuçlarını önbelleğe alan dekoratör.
+
+    ttl: saniye ya da sonuçtan TTL hesaplayan fonksiyon
+    namespace: anahtar öneki, fonksiyon adı eklenir (varsayılan modül adı)
+    negative_ttl: is_negative sonuçlarının saklanma süresi
+    cacheable: False dönerse pozitif sonuç saklanmaz (ör. yedek içerik)
+    cache: async get/set sağlayan önbellek (varsayılan artwork_cache)
+    """
+    def decorator(func):
+        name = f"{namespace}:{func.__qualname__}" if namespace else f"{func.__module__}.{func.__qualname__}"
+
+        def _ttl_for(result: Any, call_ttl: Optional[int]) -> Optional[int]:
+            if is_negative(result):
+                return negative_ttl
+            if cacheable is not None and not cacheable(result):
+                return None
+            if call_ttl is not None:
+                return call_ttl
+            return ttl(result) if callable(ttl) else ttl
+
+        def _to_cache(result: Any) -> Any:
+            return {NEGATIVE_MARKER: True, "value": result} if is_negative(result) else result
+
+        def _from_cache(value: Any) -> Any:
+            return value["value"] if _is_negative_marker(value) else value
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, cache_ttl: Optional[int] = None, **kwargs):
+                store = cache or _default_cache()
+                key = memo_key(name, args, kwargs)
+
+                cached = await store.get(key)
+                if cached is not None:
+                    logger.debug(f"Memo hit for {name}")
+                    return _from_cache(cached)
+
+                async def _call():
+                    result = await func(*args, **kwargs)
+                    result_ttl = _ttl_for(result, cache_ttl)
+                    if result_ttl:
+                        await store.set(key, _to_cache(result), result_ttl)
+                    return result
+
+                return await memo_flights.do(key, _call)
+
+            async_wrapper.cache_namespace = name
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, cache_ttl: Optional[int] = None, **kwargs):
+            store = _default_cache()
+            key = memo_key(name, args, kwargs)
+
+            cached = store.get_shared_sync(key)
+            if cached is not None:
+                logger.debug(f"Memo hit for {name}")
+                return _from_cache(cached)
+
+            result = func(*args, **kwargs)
+            result_ttl = _ttl_for(result, cache_ttl)
+            if result_ttl:
+                store.set_shared_sync(key, _to_cache(result), result_ttl)
+            return result
+
+        sync_wrapper.cache_namespace = name
+        return sync_wrapper
+    return decorator
+
+
+def _default_cache():
+    # cache_service bu modülü içe aktardığı için geç yüklenir
+    from app.cache_service import artwork_cache
+    return artwork_cache
@@ -0,0 +1,343 @@
+"""
+Memory Cache for ArtStoryAI
+Bounded in-process cache (L1) with byte budget and W-TinyLFU admission
+
+Yapı:
+- Pencere (window) LRU: yeni gelen girdiler önce buraya yazılır (~%1)
+- Ana bölge SLRU: probation + protected; penceredeki kurban ancak
+  frekans tahmini ana bölgenin kurbanından yüksekse kabul edilir
+- Count-min sketch: erişim frekansı tahmini, periyodik olarak yarılanır
+- Zamanlayıcı çarkı (timer wheel): süresi dolan girdiler O(1) temizlenir
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional
+
+WINDOW_RATIO = 0.01
+PROTECTED_RATIO = 0.8
+MASK64 = (1 << 64) - 1
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """Değerin (iç içe yapılarla birlikte) yaklaşık bellek boyutu, bayt"""
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+class FrequencySketch:
+    """4 satırlı count-min sketch; sayaçlar 15'te doyar ve örnek sayısına ulaşınca yarılanır"""
+
+    DEPTH = 4
+    MAX_COUNT = 15
+
+    def __init__(self, width: int = 1 << 14):
+        self.width = 1 << max(width - 1, 1).bit_length()
+        self.mask = self.width - 1
+        self.rows = [bytearray(self.width) for _ in range(self.DEPTH)]
+        self.sample_size = 10 * self.width
+        self.additions = 0
+
+    def _indexes(self, key: Hashable) -> List[int]:
+        # Her satır için bağımsız karıştırılmış hash (murmur3 fmix64)
+        indexes = []
+        h = hash(key) & MASK64
+        for _ in range(self.DEPTH):
+            h = (h + 0x9E3779B97F4A7C15) & MASK64
+            x = ((h ^ (h >> 33)) * 0xFF51AFD7ED558CCD) & MASK64
+            x = ((x ^ (x >> 33)) * 0xC4CEB9FE1A85EC53) & MASK64
+            indexes.append((x ^ (x >> 33)) & self.mask)
+        return indexes
+
+    def frequency(self, key: Hashable) -> int:
+        return min(row[i] for row, i in zip(self.rows, self._indexes(key)))
+
+    def increment(self, key: Hashable) -> None:
+        added = False
+        for row, i in zip(self.rows, self._indexes(key)):
+            if row[i] < self.MAX_COUNT:
+                row[i] += 1
+                added = True
+        if added:
+            self.additions += 1
+            if self.additions >= self.sample_size:
+                self._reset()
+
+    def _reset(self) -> None:
+        """Yaşlandırma: eski popülerlik zamanla unutulur"""
+        self.rows = [bytearray(count >> 1 for count in row) for row in self.rows]
+        self.additions //= 2
+
+
+class TimerWheel:
+    """Tek seviyeli zamanlayıcı çarkı; çarkın süresinden uzun TTL'ler turlarca bekler"""
+
+    def __init__(self, resolution: float = 1.0, slots: int = 4096, now: Optional[float] = None):
+        self.resolution = resolution
+        self.slots: List[Dict[Hashable, float]] = [{} for _ in range(slots)]
+        self.location: Dict[Hashable, int] = {}
+        self.current_tick = int((now if now is not None else time.time()) / resolution)
+
+    def schedule(self, key: Hashable, expires_at: float) -> None:
+        self.cancel(key)
+        tick = max(-int(-expires_at // self.resolution), self.current_tick + 1)
+        index = tick % len(self.slots)
+        self.slots[index][key] = expires_at
+        self.location[key] = index
+
+    def cancel(self, key: Hashable) -> None:
+        index = self.location.pop(key, None)
+        if index is not None:
+            self.slots[index].pop(key, None)
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Geçen dilimleri işler, süresi dolan anahtarları döndürür"""
+        target = int(now / self.resolution)
+        expired: List[Hashable] = []
+        steps = min(target - self.current_tick, len(self.slots))
+        for _ in range(max(steps, 0)):
+            self.current_tick += 1
+            slot = self.slots[self.current_tick % len(self.slots)]
+            if not slot:
+                continue
+            for key, expires_at in list(slot.items()):
+                if expires_at <= now:
+                    del slot[key]
+                    del self.location[key]
+                    expired.append(key)
+        self.current_tick = max(self.current_tick, target)
+        return expired
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    size: int
+    expires_at: float
+
+
+class TinyLFUCache:
+    """Byte-budgeted W-TinyLFU cache; every operation and get_stats are O(1) amortized"""
+
+    def __init__(self, max_bytes: int, sketch_width: int = 1 << 14):
+        self.max_bytes = max_bytes
+        self.window_max = max(int(max_bytes * WINDOW_RATIO), 1)
+        self.protected_max = int((max_bytes - self.window_max) * PROTECTED_RATIO)
+
+        # Her bölge LRU sırasında: baştaki en eski
+        self.window: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self.probation: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self.protected: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self.window_bytes = 0
+        self.probation_bytes = 0
+        self.protected_bytes = 0
+
+        self.sketch = FrequencySketch(sketch_width)
+        self.wheel = TimerWheel()
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+        self.expirations = 0
+
+    # --- Okuma / yazma ---
+
+    def __len__(self) -> int:
+        return len(self.window) + len(self.probation) + len(self.protected)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.window or key in self.probation or key in self.protected
+
+    @property
+    def total_bytes(self) -> int:
+        return self.window_bytes + self.probation_bytes + self.protected_bytes
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            self.sketch.increment(key)
+
+            if key in self.window:
+                entry = self.window[key]
+                self.window.move_to_end(key)
+            elif key in self.protected:
+                entry = self.protected[key]
+                self.protected.move_to_end(key)
+            elif key in self.probation:
+                # İkinci erişim: korunan bölgeye terfi
+                entry = self.probation.pop(key)
+                self.probation_bytes -= entry.size
+                self.protected[key] = entry
+                self.protected_bytes += entry.size
+                self._demote_protected()
+            else:
+                self.misses += 1
+                return default
+
+            if entry.expires_at <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> bool:
+        """Değeri yazar; bütçeye hiç sığmayan değerler kabul edilmez"""
+        size = estimate_size(key) + estimate_size(value)
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            self._remove(key)
+            if size > self.max_bytes - self.window_max:
+                self.rejections += 1
+                return False
+
+            self.sketch.increment(key)
+            entry = CacheEntry(value, size, now + ttl)
+            self.window[key] = entry
+            self.window_bytes += size
+            self.wheel.schedule(key, entry.expires_at)
+            self._evict()
+            return True
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Tek kilit altında birden çok anahtar; bulunamayanlar sonuçta yer almaz"""
+        results: Dict[Hashable, Any] = {}
+        with self._lock:
+            for key in keys:
+                value = self.get(key, _MISSING)
+                if value is not _MISSING:
+                    results[key] = value
+        return results
+
+    def set_many(self, items: Mapping[Hashable, Any], ttl: float) -> None:
+        with self._lock:
+            for key, value in items.items():
+                self.set(key, value, ttl)
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self.wheel.location):
+                self.wheel.cancel(key)
+            self.window.clear()
+            self.probation.clear()
+            self.protected.clear()
+            self.window_bytes = self.probation_bytes = self.protected_bytes = 0
+
+    def keys(self, limit: Optional[int] = None) -> List[Hashable]:
+        keys: List[Hashable] = []
+        for segment in (self.window, self.probation, self.protected):
+            for key in segment:
+                if limit is not None and len(keys) >= limit:
+                    return keys
+                keys.append(key)
+        return keys
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            "total_keys": len(self),
+            "memory_usage": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "window_bytes": self.window_bytes,
+            "probation_bytes": self.probation_bytes,
+            "protected_bytes": self.protected_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / requests, 4) if requests else 0.0,
+            "evictions": self.evictions,
+            "rejections": self.rejections,
+            "expired_keys": self.expirations,
+        }
+
+    # --- İç işlemler ---
+
+    def _pop(self, key: Hashable) -> Optional[CacheEntry]:
+        for segment, attr in ((self.window, "window_bytes"), (self.probation, "probation_bytes"),
+                              (self.protected, "protected_bytes")):
+            entry = segment.pop(key, None)
+            if entry is not None:
+                setattr(self, attr, getattr(self, attr) - entry.size)
+                return entry
+        return None
+
+    def _remove(self, key: Hashable) -> bool:
+        if self._pop(key) is None:
+            return False
+        self.wheel.cancel(key)
+        return True
+
+    def _expire(self, now: float) -> None:
+        # Çark anahtarları zaten bıraktı; yalnızca kayıtlar silinir
+        for key in self.wheel.advance(now):
+            if self._pop(key) is not None:
+                self.expirations += 1
+
+    def _demote_protected(self) -> None:
+        """Korunan bölge taşarsa en eskileri probation'a düşür"""
+        while self.protected_bytes > self.protected_max and len(self.protected) > 1:
+            key, entry = self.protected.popitem(last=False)
+            self.protected_bytes -= entry.size
+            self.probation[key] = entry
+            self.probation_bytes += entry.size
+
+    def _evict_main(self) -> None:
+        """Ana bölgeden LRU kurbanını çıkarır (önce probation)"""
+        segment = self.probation if self.probation else self.protected
+        key, entry = segment.popitem(last=False)
+        if segment is self.probation:
+            self.probation_bytes -= entry.size
+        else:
+            self.protected_bytes -= entry.size
+        self.wheel.cancel(key)
+        self.evictions += 1
+
+    def _evict(self) -> None:
+        main_max = self.max_bytes - self.window_max
+        while self.window_bytes > self.window_max and self.window:
+            key, candidate = self.window.popitem(last=False)
+            self.window_bytes -= candidate.size
+
+            admit = True
+            if self.probation_bytes + self.protected_bytes + candidate.size > main_max:
+                # TinyLFU: aday, ana bölgenin kurbanından daha sık erişiliyorsa kabul edilir
+                victim_segment = self.probation if self.probation else self.protected
+                victim_key = next(iter(victim_segment), None)
+                if victim_key is not None:
+                    admit = self.sketch.frequency(key) > self.sketch.frequency(victim_key)
+
+            if not admit:
+                self.wheel.cancel(key)
+                self.rejections += 1
+                continue
+
+            while self.probation_bytes + self.protected_bytes + candidate.size > main_max:
+                self._evict_main()
+            self.probation[key] = candidate
+            self.probation_bytes += candidate.size
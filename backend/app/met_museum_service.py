@@ -3,138 +3,475 @@ MET Museum API Service for ArtStoryAI
 Ücretsiz API ile sanat eserlerini çeker
 """
 
-import aiohttp
 import asyncio
-from typing import List, Dict, Optional
+import os
+import time
+from typing import Any, AsyncIterator, List, Dict, Optional, Set, Tuple
 import json
 
+from app.http_client import http_client
+from app.local_store import LocalStore, local_store
+from app.services.met_catalog import met_catalog
+
+# Türkçe dönem adı -> MET period parametresi
+PERIOD_MAPPING = {
+    "rönesans": "Renaissance",
+    "barok": "Baroque",
+    "klasik": "Classical",
+    "modern": "Modern",
+    "çağdaş": "Contemporary"
+}
+
+# SQLite IN (...) sorgusu başına en fazla parametre
+SQLITE_BATCH_SIZE = 500
+
+class METLocalCache:
+    """
+    MET nesne detayları ve arama sonuçları için kalıcı yerel önbellek.
+
+    Nesne detayları uzun süre (varsayılan 30 gün), arama sonuçları daha kısa
+    süre (varsayılan 6 saat) taze kabul edilir. Süresi dolan kayıtlar yine
+    döndürülür ve arka planda ETag/Last-Modified ile yeniden doğrulanır.
+    """
+
+    def __init__(self, store: LocalStore):
+        self.store = store
+        self.object_ttl = int(os.getenv("MET_OBJECT_TTL_DAYS", "30")) * 24 * 3600
+        self.search_ttl = int(os.getenv("MET_SEARCH_TTL_HOURS", "6")) * 3600
+        self.store.register_schema(
+            """CREATE TABLE IF NOT EXISTS met_objects (
+                object_id INTEGER PRIMARY KEY,
+                data TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )""",
+            """CREATE TABLE IF NOT EXISTS met_searches (
+                search_key TEXT PRIMARY KEY,
+                object_ids TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )""",
+        )
+
+    # Nesne detayları
+
+    def _get_object(self, object_id: int) -> Optional[Dict[str, Any]]:
+        row = self.store.fetchone(
+            "SELECT data, etag, last_modified, fetched_at FROM met_objects WHERE object_id = ?",
+            (object_id,),
+        )
+        if row is None:
+            return None
+        return {
+            "data": json.loads(row["data"]),
+            "etag": row["etag"],
+            "last_modified": row["last_modified"],
+            "fresh": time.time() - row["fetched_at"] < self.object_ttl,
+        }
+
+    def _get_objects(self, object_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Birden çok nesne, parti başına tek sorgu"""
+        results: Dict[int, Dict[str, Any]] = {}
+        now = time.time()
+        for start in range(0, len(object_ids), SQLITE_BATCH_SIZE):
+            batch = object_ids[start:start + SQLITE_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.store.fetchall(
+                f"""SELECT object_id, data, etag, last_modified, fetched_at
+                    FROM met_objects WHERE object_id IN ({placeholders})""",
+                batch,
+            )
+            for row in rows:
+                results[row["object_id"]] = {
+                    "data": json.loads(row["data"]),
+                    "etag": row["etag"],
+                    "last_modified": row["last_modified"],
+                    "fresh": now - row["fetched_at"] < self.object_ttl,
+                }
+        return results
+
+    def _put_object(self, object_id: int, data: Dict, etag: Optional[str], last_modified: Optional[str]) -> None:
+        self.store.execute(
+            """INSERT INTO met_objects (object_id, data, etag, last_modified, fetched_at)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(object_id) DO UPDATE SET
+                   data = excluded.data, etag = excluded.etag,
+                   last_modified = excluded.last_modified, fetched_at = excluded.fetched_at""",
+            (object_id, json.dumps(data, ensure_ascii=False), etag, last_modified, time.time()),
+        )
+
+    def _touch_object(self, object_id: int) -> None:
+        self.store.execute(
+            "UPDATE met_objects SET fetched_at = ? WHERE object_id = ?", (time.time(), object_id)
+        )
+
+    def _delete_object(self, object_id: int) -> None:
+        self.store.execute("DELETE FROM met_objects WHERE object_id = ?", (object_id,))
+
+    async def get_object(self, object_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            return await self.store.run(self._get_object, object_id)
+        except Exception as e:
+            print(f"MET önbellek okuma hatası: {e}")
+            return None
+
+    async def get_objects(self, object_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        if not object_ids:
+            return {}
+        try:
+            return await self.store.run(self._get_objects, list(object_ids))
+        except Exception as e:
+            print(f"MET önbellek okuma hatası: {e}")
+            return {}
+
+    async def put_object(self, object_id: int, data: Dict, etag: Optional[str], last_modified: Optional[str]) -> None:
+        try:
+            await self.store.run(self._put_object, object_id, data, etag, last_modified)
+        except Exception as e:
+            print(f"MET önbellek yazma hatası: {e}")
+
+    async def touch_object(self, object_id: int) -> None:
+        try:
+            await self.store.run(self._touch_object, object_id)
+        except Exception as e:
+            print(f"MET önbellek yazma hatası: {e}")
+
+    async def delete_object(self, object_id: int) -> None:
+        try:
+            await self.store.run(self._delete_object, object_id)
+        except Exception as e:
+            print(f"MET önbellek yazma hatası: {e}")
+
+    # Arama sonuçları
+
+    @staticmethod
+    def search_key(params: Dict) -> str:
+        return json.dumps(params, sort_keys=True, ensure_ascii=False)
+
+    def _get_search(self, search_key: str) -> Optional[Tuple[List[int], bool]]:
+        row = self.store.fetchone(
+            "SELECT object_ids, fetched_at FROM met_searches WHERE search_key = ?", (search_key,)
+        )
+        if row is None:
+            return None
+        return json.loads(row["object_ids"]), time.time() - row["fetched_at"] < self.search_ttl
+
+    def _put_search(self, search_key: str, object_ids: List[int]) -> None:
+        self.store.execute(
+            """INSERT INTO met_searches (search_key, object_ids, fetched_at) VALUES (?, ?, ?)
+               ON CONFLICT(search_key) DO UPDATE SET
+                   object_ids = excluded.object_ids, fetched_at = excluded.fetched_at""",
+            (search_key, json.dumps(object_ids), time.time()),
+        )
+
+    async def get_search(self, search_key: str) -> Optional[Tuple[List[int], bool]]:
+        """(object_ids, taze mi) veya None"""
+        try:
+            return await self.store.run(self._get_search, search_key)
+        except Exception as e:
+            print(f"MET önbellek okuma hatası: {e}")
+            return None
+
+    async def put_search(self, search_key: str, object_ids: List[int]) -> None:
+        try:
+            await self.store.run(self._put_search, search_key, object_ids)
+        except Exception as e:
+            print(f"MET önbellek yazma hatası: {e}")
+
+
 class METMuseumService:
     def __init__(self):
         self.base_url = "https://collectionapi.metmuseum.org/public/collection/v1"
         self.search_url = f"{self.base_url}/search"
         self.object_url = f"{self.base_url}/objects"
+        # Her aramadan detayı alınacak eser sayısı ve toplam üst sınır
+        self.details_per_search = 10
+        self.max_results = 50
+        self.cache = METLocalCache(local_store)
+        self._revalidating: Set[int] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+        
+    def _search_params(self, query: str = None, period: str = None) -> Dict:
+        """Search parameters"""
+        params = {
+            "q": query or "",
+            "hasImages": "true",  # Sadece görseli olan eserler
+            "medium": "Paintings",  # Resim türü
+            "limit": 50  # Maksimum sonuç
+        }
+        
+        # Period filter
+        if period and period.lower() in PERIOD_MAPPING:
+            params["period"] = PERIOD_MAPPING[period.lower()]
+        return params
+    
+    async def search_object_ids(self, query: str = None, period: str = None,
+                                style: str = None, artist: str = None) -> List[int]:
+        """
+        MET Museum'da arama yapar, yalnızca eser ID'lerini döndürür
+        """
+        return await self.search_ids(self._search_params(query, period))
+    
+    async def search_ids(self, params: Dict) -> List[int]:
+        """
+        Verilen parametrelerle /search isteği; sonuç kısa süreli önbelleğe alınır
+        """
+        search_key = self.cache.search_key(params)
+        cached = await self.cache.get_search(search_key)
+        if cached is not None and cached[1]:
+            return cached[0]
         
+        try:
+            async with http_client.request("met_museum", "GET", self.search_url, params=params) as response:
+                if response.status != 200:
+                    print(f"MET API search hatası: {response.status}")
+                    return cached[0] if cached else []
+                data = await response.json(content_type=None)
+            object_ids = data.get("objectIDs") or []
+            await self.cache.put_search(search_key, object_ids)
+            return object_ids
+        except Exception as e:
+            print(f"MET Museum search hatası: {e}")
+            # Ağ yoksa süresi dolmuş sonuçlar da kullanılır
+            return cached[0] if cached else []
+    
+    async def get_artworks_details(self, object_ids: List[int]) -> List[Dict]:
+        """
+        Eser detaylarını eşzamanlı olarak alır (sıra korunur, tekrarlar atlanır).
+        Eşzamanlılık http_client'taki MET sınırıyla kısıtlanır.
+        """
+        unique_ids = list(dict.fromkeys(object_ids))
+        objects = await self.get_objects_data(unique_ids)
+        return [self.parse_artwork(obj_id, objects[obj_id]) for obj_id in unique_ids if obj_id in objects]
+    
     async def search_artworks(self, query: str = None, period: str = None, 
                              style: str = None, artist: str = None) -> List[Dict]:
         """
         MET Museum'dan sanat eserlerini arar
         """
+        object_ids = await self.search_object_ids(query, period, style, artist)
+        # İlk 10 eserin detaylarını al
+        return await self.get_artworks_details(object_ids[:self.details_per_search])
+    
+    @staticmethod
+    def parse_artwork(object_id: int, data: Dict) -> Dict:
+        """Sanat eseri bilgilerini parse et"""
+        return {
+            "id": str(object_id),
+            "title": data.get("title", "Bilinmeyen Eser"),
+            "artist": data.get("artistDisplayName", "Bilinmeyen Sanatçı"),
+            "year": data.get("objectDate", "Bilinmeyen Tarih"),
+            "period": data.get("period", "Bilinmeyen Dönem"),
+            "style": data.get("classification", "Bilinmeyen Stil"),
+            "museum": "MET Museum",
+            "imageUrl": data.get("primaryImage", ""),
+            "description": data.get("objectDescription", "Açıklama bulunamadı"),
+            "culture": data.get("culture", ""),
+            "medium": data.get("medium", ""),
+            "dimensions": data.get("dimensions", "")
+        }
+    
+    async def _fetch_object(self, object_id: int, etag: Optional[str] = None,
+                            last_modified: Optional[str] = None) -> Tuple[int, Optional[Dict]]:
+        """
+        Nesneyi ağdan alır ve önbelleğe yazar; verilirse koşullu istek yapılır.
+        (HTTP durum kodu, ham veri) döndürür - 304'te veri None'dır.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
+        async with http_client.request("met_museum", "GET", f"{self.object_url}/{object_id}", headers=headers) as response:
+            if response.status == 304:
+                await self.cache.touch_object(object_id)
+                return response.status, None
+            if response.status != 200:
+                if response.status == 404:
+                    await self.cache.delete_object(object_id)
+                return response.status, None
+            data = await response.json(content_type=None)
+            await self.cache.put_object(
+                object_id, data,
+                response.headers.get("ETag"), response.headers.get("Last-Modified")
+            )
+            return response.status, data
+    
+    def _schedule_revalidation(self, object_id: int, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """Süresi dolan kaydı arka planda yeniden doğrular; aynı nesne için tek istek çalışır"""
+        if object_id in self._revalidating:
+            return
+        self._revalidating.add(object_id)
+        
+        async def _revalidate():
+            try:
+                await self._fetch_object(object_id, etag, last_modified)
+            except Exception as e:
+                print(f"MET yeniden doğrulama hatası ({object_id}): {e}")
+            finally:
+                self._revalidating.discard(object_id)
+        
+        task = asyncio.create_task(_revalidate())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def get_object_data(self, object_id: int) -> Optional[Dict]:
+        """
+        Ham MET nesne verisi: önce yerel önbellek, yoksa ağ
+        """
+        cached = await self.cache.get_object(object_id)
+        if cached is not None:
+            if not cached["fresh"]:
+                self._schedule_revalidation(object_id, cached["etag"], cached["last_modified"])
+            return cached["data"]
+        
         try:
-            # Search parameters
-            params = {
-                "q": query or "",
-                "hasImages": "true",  # Sadece görseli olan eserler
-                "medium": "Paintings",  # Resim türü
-                "limit": 50  # Maksimum sonuç
-            }
-            
-            # Period filter
-            if period:
-                if period.lower() == "rönesans":
-                    params["period"] = "Renaissance"
-                elif period.lower() == "barok":
-                    params["period"] = "Baroque"
-                elif period.lower() == "klasik":
-                    params["period"] = "Classical"
-                elif period.lower() == "modern":
-                    params["period"] = "Modern"
-                elif period.lower() == "çağdaş":
-                    params["period"] = "Contemporary"
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.search_url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        object_ids = data.get("objectIDs", [])
-                        
-                        # İlk 10 eserin detaylarını al
-                        artworks = []
-                        for obj_id in object_ids[:10]:
-                            artwork = await self.get_artwork_details(obj_id)
-                            if artwork:
-                                artworks.append(artwork)
-                        
-                        return artworks
-                    else:
-                        print(f"MET API search hatası: {response.status}")
-                        return []
-                        
+            _, data = await self._fetch_object(object_id)
+            return data
         except Exception as e:
-            print(f"MET Museum search hatası: {e}")
-            return []
+            print(f"Artwork details hatası: {e}")
+            return None
+    
+    async def get_objects_data(self, object_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Birden çok nesnenin ham verisi: önbellek tek sorguyla okunur,
+        yalnızca bulunamayanlar ağdan eşzamanlı alınır
+        """
+        unique_ids = list(dict.fromkeys(object_ids))
+        cached = await self.cache.get_objects(unique_ids)
+        results: Dict[int, Dict] = {}
+        for object_id, entry in cached.items():
+            if not entry["fresh"]:
+                self._schedule_revalidation(object_id, entry["etag"], entry["last_modified"])
+            results[object_id] = entry["data"]
+        
+        missing = [object_id for object_id in unique_ids if object_id not in results]
+        fetched = await asyncio.gather(
+            *(self._fetch_object(object_id) for object_id in missing), return_exceptions=True
+        )
+        for object_id, result in zip(missing, fetched):
+            if isinstance(result, Exception):
+                print(f"Artwork details hatası: {result}")
+            elif result[1] is not None:
+                results[object_id] = result[1]
+        return results
     
     async def get_artwork_details(self, object_id: int) -> Optional[Dict]:
         """
         Belirli bir sanat eserinin detaylarını alır
         """
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.object_url}/{object_id}") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # Sanat eseri bilgilerini parse et
-                        artwork = {
-                            "id": str(object_id),
-                            "title": data.get("title", "Bilinmeyen Eser"),
-                            "artist": data.get("artistDisplayName", "Bilinmeyen Sanatçı"),
-                            "year": data.get("objectDate", "Bilinmeyen Tarih"),
-                            "period": data.get("period", "Bilinmeyen Dönem"),
-                            "style": data.get("classification", "Bilinmeyen Stil"),
-                            "museum": "MET Museum",
-                            "imageUrl": data.get("primaryImage", ""),
-                            "description": data.get("objectDescription", "Açıklama bulunamadı"),
-                            "culture": data.get("culture", ""),
-                            "medium": data.get("medium", ""),
-                            "dimensions": data.get("dimensions", "")
-                        }
-                        
-                        return artwork
-                    else:
-                        return None
-                        
-        except Exception as e:
-            print(f"Artwork details hatası: {e}")
+        data = await self.get_object_data(object_id)
+        if data is None:
             return None
+        return self.parse_artwork(object_id, data)
+    
+    def _filter_searches(self, filters: Dict) -> List[Dict]:
+        """Filtrelerden yapılacak aramaları çıkarır (aynı parametreli aramalar bir kez)"""
+        searches = []
+        for period in filters.get("periods") or []:
+            searches.append({"period": period})
+        for style in filters.get("styles") or []:
+            searches.append({"style": style})
+        for artist in filters.get("artists") or []:
+            searches.append({"artist": artist})
+        
+        unique_searches = []
+        seen_params = set()
+        for search in searches:
+            key = tuple(sorted(self._search_params(search.get("query"), search.get("period")).items()))
+            if key not in seen_params:
+                seen_params.add(key)
+                unique_searches.append(search)
+        return unique_searches
+    
+    async def catalog_artworks(self, filters: Dict, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Filtreleri içe aktarılmış yerel katalogdan yanıtlar (tüm koleksiyon üzerinde).
+        Görseli dökümde olmayan eserlerin görselleri önbellekli detaylardan tamamlanır.
+        """
+        artworks, _ = await met_catalog.search_async(filters, limit or self.max_results)
+        missing = [artwork for artwork in artworks if not artwork.get("imageUrl")]
+        if missing:
+            objects = await self.get_objects_data([int(a["id"]) for a in missing])
+            for artwork in missing:
+                image_url = (objects.get(int(artwork["id"])) or {}).get("primaryImage")
+                if image_url:
+                    artwork["imageUrl"] = image_url
+                    await met_catalog.store.run(met_catalog.set_image, int(artwork["id"]), image_url)
+        return artworks
     
     async def get_filtered_artworks(self, filters: Dict) -> List[Dict]:
         """
-        Filtrelere göre sanat eserlerini getirir
+        Filtrelere göre sanat eserlerini getirir.
+        Katalog içe aktarıldıysa yerel indeks kullanılır; yoksa tüm aramalar ve
+        eser detayları eşzamanlı çalışır, ID'ler detaydan önce tekilleştirilir.
         """
         try:
-            all_artworks = []
+            if await met_catalog.is_available_async():
+                return await self.catalog_artworks(filters)
             
-            # Period filter
-            if filters.get("periods"):
-                for period in filters["periods"]:
-                    artworks = await self.search_artworks(period=period)
-                    all_artworks.extend(artworks)
+            searches = self._filter_searches(filters)
+            id_lists = await asyncio.gather(
+                *(self.search_object_ids(**search) for search in searches)
+            )
             
-            # Style filter
-            if filters.get("styles"):
-                for style in filters["styles"]:
-                    artworks = await self.search_artworks(style=style)
-                    all_artworks.extend(artworks)
-            
-            # Artist search
-            if filters.get("artists"):
-                for artist in filters["artists"]:
-                    artworks = await self.search_artworks(artist=artist)
-                    all_artworks.extend(artworks)
-            
-            # Duplicate'ları kaldır
-            unique_artworks = []
+            # Duplicate'ları detay isteğinden önce kaldır
+            object_ids = []
             seen_ids = set()
-            for artwork in all_artworks:
-                if artwork["id"] not in seen_ids:
-                    unique_artworks.append(artwork)
-                    seen_ids.add(artwork["id"])
+            for ids in id_lists:
+                for obj_id in ids[:self.details_per_search]:
+                    if obj_id not in seen_ids:
+                        seen_ids.add(obj_id)
+                        object_ids.append(obj_id)
             
-            return unique_artworks[:50]  # Maksimum 50 eser
+            return await self.get_artworks_details(object_ids[:self.max_results])  # Maksimum 50 eser
             
         except Exception as e:
             print(f"Filtered artworks hatası: {e}")
             return []
+    
+    async def stream_filtered_artworks(self, filters: Dict) -> AsyncIterator[Dict]:
+        """
+        get_filtered_artworks ile aynı sonuçları geldikleri sırayla üretir.
+        Her arama tamamlanır tamamlanmaz yeni ID'lerin detayları istenir.
+        """
+        if await met_catalog.is_available_async():
+            for artwork in await self.catalog_artworks(filters):
+                yield artwork
+            return
+        
+        seen_ids = set()
+        search_tasks = {
+            asyncio.create_task(self.search_object_ids(**search))
+            for search in self._filter_searches(filters)
+        }
+        detail_tasks = set()
+        
+        try:
+            while search_tasks or detail_tasks:
+                done, _ = await asyncio.wait(
+                    search_tasks | detail_tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task in search_tasks:
+                        search_tasks.discard(task)
+                        for obj_id in task.result()[:self.details_per_search]:
+                            if obj_id not in seen_ids and len(seen_ids) < self.max_results:
+                                seen_ids.add(obj_id)
+                                detail_tasks.add(asyncio.create_task(self.get_artwork_details(obj_id)))
+                    else:
+                        detail_tasks.discard(task)
+                        artwork = task.result()
+                        if artwork:
+                            yield artwork
+        finally:
+            # İstemci bağlantıyı kapatırsa kalan istekler iptal edilir
+            pending = search_tasks | detail_tasks
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
 # Global instance
 met_museum_service = METMuseumService()
@@ -28,9 +28,12 @@ class Artwork(Base):
     __tablename__ = "artworks"
     
     id = Column(Integer, primary_key=True, index=True)
+    # Normalize edilmiş eser adı - üretilen içerik bu anahtarla saklanır
+    name_key = Column(String(200), unique=True, index=True)
     title = Column(String(200), nullable=False, index=True)
     artist = Column(String(100), nullable=False, index=True)
     year = Column(Integer)
+    year_text = Column(String(50))  # "1503-1519" gibi orijinal yıl metni
     movement = Column(String(100), index=True)
     museum = Column(String(200))
     image_url = Column(String(500))
@@ -38,6 +41,12 @@ class Artwork(Base):
     artist_bio = Column(Text)
     movement_desc = Column(Text)
     source = Column(String(50), default="ai")  # ai, manual, external
+    # Toplu içe aktarılan müze eserleri için (ör. "met_436535")
+    external_id = Column(String(50), unique=True, index=True)
+    period = Column(String(100), index=True)
+    style = Column(String(100), index=True)
+    culture = Column(String(100), index=True)
+    medium = Column(String(255))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -0,0 +1,165 @@
+"""
+Name Index for ArtStoryAI
+Normalized, alias-aware fuzzy lookup for artwork names
+"""
+
+import bisect
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# NFKD ile ayrışmayan harfler
+_EXTRA_FOLDS = str.maketrans({
+    "ı": "i",
+    "ø": "o",
+    "æ": "ae",
+    "œ": "oe",
+    "ł": "l",
+    "đ": "d",
+    "ð": "d",
+    "þ": "th",
+})
+_APOSTROPHES = re.compile(r"[\'‘’ʼ`´]")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Eser adını karşılaştırma anahtarına çevirir.
+
+    Türkçe büyük/küçük harf dönüşümü (İ/I), aksan temizleme, kesme işaretlerinin
+    kaldırılması ve noktalama yerine tek boşluk: "Venüs'ün Doğuşu" -> "venusun dogusu".
+    """
+    if not name:
+        return ""
+    text = name.replace("İ", "i").replace("I", "ı").casefold()
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = text.translate(_EXTRA_FOLDS)
+    text = _APOSTROPHES.sub("", text)
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def trigrams(key: str) -> Set[str]:
+    """Boşlukla çevrelenmiş anahtarın karakter trigramları"""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex(Generic[T]):
+    """
+    Exact, prefix and trigram-fuzzy lookup over normalized names.
+
+    Every name (and its aliases) is normalized once at insert time. Lookups
+    only touch entries sharing a trigram with the query, and candidates are
+    ranked deterministically: exact > prefix > containment > fuzzy, then by
+    trigram similarity, length difference and name.
+    """
+
+    EXACT = 3.0
+    PREFIX = 2.0
+    CONTAINS = 1.0
+
+    def __init__(self, min_similarity: float = 0.5):
+        self.min_similarity = min_similarity
+        self._values: Dict[str, T] = {}
+        self._keys: Dict[str, str] = {}
+        self._owners: Dict[str, str] = {}
+        self._names: Dict[str, Set[str]] = defaultdict(set)
+        self._sorted_keys: List[str] = []
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._values
+
+    def add(self, name: str, value: T, aliases: Iterable[str] = ()) -> None:
+        """Register a name with its value; aliases resolve to the same name"""
+        self.remove(name)
+        self._values[name] = value
+        for alias in (name, *aliases):
+            key = normalize_name(alias)
+            if not key or key in self._owners:
+                # İlk kaydedilen sahip kalır, sonuçlar deterministik olur
+                continue
+            self._owners[key] = name
+            self._names[name].add(key)
+            bisect.insort(self._sorted_keys, key)
+            grams = trigrams(key)
+            self._trigrams[key] = grams
+            for gram in grams:
+                self._postings[gram].add(key)
+
+    def remove(self, name: str) -> Optional[T]:
+        """Unregister a name and all of its aliases"""
+        if name not in self._values:
+            return None
+        for key in self._names.pop(name, ()):
+            del self._owners[key]
+            del self._sorted_keys[bisect.bisect_left(self._sorted_keys, key)]
+            for gram in self._trigrams.pop(key):
+                postings = self._postings[gram]
+                postings.discard(key)
+                if not postings:
+                    del self._postings[gram]
+        return self._values.pop(name)
+
+    def clear(self) -> None:
+        self.__init__(self.min_similarity)
+
+    def _prefix_keys(self, key: str) -> Iterable[str]:
+        start = bisect.bisect_left(self._sorted_keys, key)
+        for candidate in self._sorted_keys[start:]:
+            if not candidate.startswith(key):
+                break
+            yield candidate
+
+    def match(self, query: str) -> Optional[Tuple[str, float]]:
+        """Best matching registered name and its score, or None"""
+        if query in self._values:
+            return query, self.EXACT + 1.0
+
+        key = normalize_name(query)
+        if not key:
+            return None
+        if key in self._owners:
+            return self._owners[key], self.EXACT
+
+        query_grams = trigrams(key)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in query_grams:
+            for candidate in self._postings.get(gram, ()):
+                shared[candidate] += 1
+        for candidate in self._prefix_keys(key):
+            shared.setdefault(candidate, 0)
+
+        best: Optional[Tuple[float, int, str, str]] = None
+        for candidate, count in shared.items():
+            similarity = 2.0 * count / (len(query_grams) + len(self._trigrams[candidate]))
+            if candidate.startswith(key) or key.startswith(candidate):
+                score = self.PREFIX + similarity
+            elif key in candidate or candidate in key:
+                score = self.CONTAINS + similarity
+            elif similarity >= self.min_similarity:
+                score = similarity
+            else:
+                continue
+            owner = self._owners[candidate]
+            rank = (-score, abs(len(candidate) - len(key)), owner, candidate)
+            if best is None or rank < best:
+                best = rank
+
+        if best is None:
+            return None
+        return best[2], -best[0]
+
+    def lookup(self, query: str) -> Optional[T]:
+        """Value of the best matching name, or None"""
+        found = self.match(query)
+        return self._values[found[0]] if found else None
@@ -14,12 +14,86 @@ import logging
 import traceback
 
 from .services.recommendation_service import recommendation_engine
+from .artwork_catalog import artwork_catalog
 from .artwork_service import ArtworkService
+from .cache_policy import NS_SIMILAR, cache_key
+from .cache_service import artwork_cache
+from .single_flight import name_key
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/recommendations", tags=["recommendations"])
 
+# Benzer eser listeleri için stale-while-revalidate süreleri (saniye)
+SIMILAR_SOFT_TTL = 1800
+SIMILAR_HARD_TTL = 6 * 3600
+
+
+async def _with_cached_images(recommendations: List[Dict]) -> List[Dict]:
+    """Görseli eksik öneriler için çözümlenmiş URL'leri tek toplu okumayla doldurur"""
+    missing = [rec['title'] for rec in recommendations if not rec.get('image_url')]
+    if not missing:
+        return recommendations
+    image_urls = await ArtworkService.get_cached_image_urls(missing)
+    # Önbellekteki liste nesnesi değiştirilmez, kopyası döner
+    return [
+        {**rec, 'image_url': image_urls[rec['title']]} if not rec.get('image_url') and rec['title'] in image_urls else rec
+        for rec in recommendations
+    ]
+
+
+async def _compute_similar_artworks(artwork_name: str, limit: int) -> List[Dict]:
+    """Benzer eser listesini hesaplar (önbellek dolumu ve arka plan yenilemesi)"""
+    print(f"🔍 Backend: Getting similar artworks for: {artwork_name}")
+
+    # Get target artwork info
+    target_artwork = await ArtworkService.get_artwork_info(artwork_name)
+    print(f"🔍 Backend: Target artwork result: {target_artwork}")
+
+    if not target_artwork or 'error' in target_artwork:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Artwork '{artwork_name}' not found"
+        )
+
+    logger.info(f"Target artwork found: {target_artwork.get('art_name', 'Unknown')}")
+    print(f"🔍 Backend: Target artwork found: {target_artwork.get('art_name', 'Unknown')}")
+
+    # Get all available artworks for comparison (with timeout protection)
+    all_artworks = ArtworkService.get_all_artworks()
+    if not all_artworks:
+        logger.warning("No artworks available for comparison")
+        raise HTTPException(
+            status_code=500, 
+            detail="No artworks available for comparison"
+        )
+
+    logger.info(f"Found {len(all_artworks)} artworks for comparison")
+
+    # Get recommendations (theme similarity served from the corpus index)
+    recommendations = recommendation_engine.get_similar_artworks(
+        target_artwork, 
+        all_artworks, 
+        limit
+    )
+
+    logger.info(f"Generated {len(recommendations)} similar artwork recommendations")
+
+    # Format response
+    formatted_recommendations = []
+    for rec in recommendations:
+        artwork = rec['artwork']
+        formatted_recommendations.append({
+            'title': artwork.get('art_name', ''),
+            'artist': artwork.get('artist', ''),
+            'year': artwork.get('year', ''),
+            'image_url': artwork.get('image_url', ''),
+            'similarity_score': rec['similarity_score'],
+            'similarity_reasons': rec['similarity_reasons']
+        })
+
+    return formatted_recommendations
+
 
 @router.get("/similar/{artwork_name}")
 async def get_similar_artworks(
@@ -38,58 +112,16 @@ async def get_similar_artworks(
     """
     try:
         logger.info(f"Getting similar artworks for: {artwork_name}")
-        print(f"🔍 Backend: Getting similar artworks for: {artwork_name}")
-        
-        # Get target artwork info
-        target_artwork = ArtworkService.get_artwork_info(artwork_name)
-        print(f"🔍 Backend: Target artwork result: {target_artwork}")
-        
-        if not target_artwork or 'error' in target_artwork:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"Artwork '{artwork_name}' not found"
-            )
-        
-        logger.info(f"Target artwork found: {target_artwork.get('art_name', 'Unknown')}")
-        print(f"🔍 Backend: Target artwork found: {target_artwork.get('art_name', 'Unknown')}")
-        
-        # Get all available artworks for comparison (with timeout protection)
-        all_artworks = ArtworkService.get_all_artworks()
-        if not all_artworks:
-            logger.warning("No artworks available for comparison")
-            raise HTTPException(
-                status_code=500, 
-                detail="No artworks available for comparison"
-            )
-        
-        logger.info(f"Found {len(all_artworks)} artworks for comparison")
-        
-        # Limit comparison set to prevent timeout (max 50 artworks)
-        if len(all_artworks) > 50:
-            logger.info(f"Limiting comparison set from {len(all_artworks)} to 50 artworks")
-            all_artworks = all_artworks[:50]
         
-        # Get recommendations with timeout protection
-        recommendations = recommendation_engine.get_similar_artworks(
-            target_artwork, 
-            all_artworks, 
-            limit
+        # Katalog sürümü anahtarda: eser eklenince/silinince listeler yeniden hesaplanır
+        formatted_recommendations = await artwork_cache.get_or_refresh(
+            cache_key(NS_SIMILAR, artwork_catalog.version, name_key(artwork_name), limit),
+            lambda: _compute_similar_artworks(artwork_name, limit),
+            soft_ttl=SIMILAR_SOFT_TTL,
+            hard_ttl=SIMILAR_HARD_TTL
         )
         
-        logger.info(f"Generated {len(recommendations)} similar artwork recommendations")
-        
-        # Format response
-        formatted_recommendations = []
-        for rec in recommendations:
-            artwork = rec['artwork']
-            formatted_recommendations.append({
-                'title': artwork.get('art_name', ''),
-                'artist': artwork.get('artist', ''),
-                'year': artwork.get('year', ''),
-                'image_url': artwork.get('image_url', ''),
-                'similarity_score': rec['similarity_score'],
-                'similarity_reasons': rec['similarity_reasons']
-            })
+        formatted_recommendations = await _with_cached_images(formatted_recommendations)
         
         return {
             "success": True,
@@ -161,6 +193,8 @@ async def get_artist_recommendations(
                 'movement': artwork.get('movement', '')
             })
         
+        formatted_recommendations = await _with_cached_images(formatted_recommendations)
+        
         return {
             "success": True,
             "artist": artist_name,
@@ -231,6 +265,8 @@ async def get_period_recommendations(
                 'movement': artwork.get('movement', '')
             })
         
+        formatted_recommendations = await _with_cached_images(formatted_recommendations)
+        
         return {
             "success": True,
             "target_year": year,
@@ -275,11 +311,12 @@ async def get_movement_recommendations(
                 detail="No artworks available"
             )
         
-        # Filter artworks by movement
-        movement_artworks = [
-            artwork for artwork in all_artworks
-            if artwork.get('movement', '').lower() == movement_name.lower()
-        ]
+        # Filter artworks by movement (most recent first)
+        movement_artworks = recommendation_engine.get_movement_recommendations(
+            movement_name,
+            all_artworks,
+            limit
+        )
         
         if not movement_artworks:
             raise HTTPException(
@@ -287,15 +324,9 @@ async def get_movement_recommendations(
                 detail=f"No artworks found for movement '{movement_name}'"
             )
         
-        # Sort by year (most recent first)
-        movement_artworks.sort(
-            key=lambda x: x.get('year', 0), 
-            reverse=True
-        )
-        
         # Format response
         formatted_recommendations = []
-        for artwork in movement_artworks[:limit]:
+        for artwork in movement_artworks:
             formatted_recommendations.append({
                 'title': artwork.get('art_name', ''),
                 'artist': artwork.get('artist', ''),
@@ -305,6 +336,8 @@ async def get_movement_recommendations(
                 'museum': artwork.get('museum', '')
             })
         
+        formatted_recommendations = await _with_cached_images(formatted_recommendations)
+        
         return {
             "success": True,
             "movement": movement_name,
@@ -429,6 +462,8 @@ async def get_exploration_recommendations(
                 'exploration_reason': _get_exploration_reason(artwork)
             })
         
+        formatted_recommendations = await _with_cached_images(formatted_recommendations)
+        
         return {
             "success": True,
             "recommendations": formatted_recommendations,
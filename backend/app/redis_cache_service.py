@@ -1,35 +1,64 @@
 """
 Redis Cache Service for ArtStoryAI
 Provides Redis-based caching for artwork information and AI responses
+
+Tek async Redis arka ucu (redis.asyncio): paylaşılan bağlantı havuzu,
+MGET/pipeline toplu işlemler ve ikili serileştirme (app.cache_codec).
+Tüm anahtarlar REDIS_KEY_PREFIX ile ad alanına alınır.
 """
 
-import json
 import hashlib
-from typing import Dict, Any, Optional, Union
+import os
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 import redis.asyncio as redis
+from redis import Redis as SyncRedis
 from redis.asyncio import Redis
 import logging
 
+from app import cache_codec
+from app.cache_policy import get_or_refresh, jittered
+from app.memoize import memoize
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_REDIS_URL = "redis://localhost:6379"
+# Şema sürümü anahtar önekinde: serileştirme değişirse eski anahtarlar okunmaz
+DEFAULT_KEY_PREFIX = "artstory:v2"
+DEFAULT_MAX_CONNECTIONS = 20
+# SCAN / toplu silme parti boyutu
+SCAN_BATCH_SIZE = 500
+# Sync istemci çağıranı bloklar: kısa zaman aşımı
+SYNC_SOCKET_TIMEOUT = 2
+
+# (değer, Redis'te kalan süre saniye; süresiz anahtarda None)
+ValueWithTTL = Tuple[Any, Optional[float]]
+
 class RedisCacheService:
     """Redis-based cache service for ArtStoryAI"""
-    
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+
+    def __init__(self, redis_url: str = DEFAULT_REDIS_URL, key_prefix: str = DEFAULT_KEY_PREFIX,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS):
         self.redis_url = redis_url
+        self.key_prefix = key_prefix
+        self.max_connections = max_connections
+        self.pool: Optional[redis.ConnectionPool] = None
         self.redis_client: Optional[Redis] = None
+        # Sync kod yolları (ör. memoize edilmiş sync fonksiyonlar) için ayrı istemci
+        self._sync_client: Optional[SyncRedis] = None
         self.default_ttl = 3600  # 1 saat
         self.is_connected = False
-    
+
     async def connect(self) -> bool:
         """Connect to Redis server"""
         try:
-            self.redis_client = redis.from_url(
+            # İkili değerler: decode_responses kapalı
+            self.pool = redis.ConnectionPool.from_url(
                 self.redis_url,
-                decode_responses=True,
+                max_connections=self.max_connections,
                 socket_connect_timeout=5,
                 socket_timeout=5
             )
+            self.redis_client = Redis(connection_pool=self.pool)
             # Test connection
             await self.redis_client.ping()
             self.is_connected = True
@@ -40,94 +69,305 @@ class RedisCacheService:
             self.is_connected = False
             # Don't raise exception, just return False
             return False
-    
+
     async def disconnect(self):
         """Disconnect from Redis"""
         if self.redis_client:
-            await self.redis_client.close()
+            await self.redis_client.aclose()
+            self.redis_client = None
+        if self.pool:
+            await self.pool.disconnect()
+            self.pool = None
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+        if self.is_connected:
             self.is_connected = False
             logger.info("Redis connection closed")
-    
+
+    @property
+    def _available(self) -> bool:
+        return self.is_connected and self.redis_client is not None
+
+    def _key(self, key: str) -> str:
+        """Uygulama anahtarını Redis anahtarına çevirir"""
+        return f"{self.key_prefix}:{key}"
+
     def _generate_key(self, prefix: str, data: str) -> str:
         """Generate cache key with prefix"""
         hash_data = hashlib.md5(data.encode()).hexdigest()
         return f"{prefix}:{hash_data}"
-    
+
+    @staticmethod
+    def _decode(raw: Optional[bytes]) -> Optional[Any]:
+        if raw is None:
+            return None
+        try:
+            return cache_codec.decode(raw)
+        except Exception as e:
+            logger.warning(f"Redis value could not be decoded: {e}")
+            return None
+
     async def get(self, key: str) -> Optional[Any]:
         """Get value from Redis cache"""
-        if not self.is_connected or not self.redis_client:
+        if not self._available:
             return None
-        
+
+        try:
+            return self._decode(await self.redis_client.get(self._key(key)))
+        except Exception as e:
+            logger.error(f"Redis get error: {e}")
+            return None
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Tek MGET ile birden çok anahtar; bulunamayanlar sonuçta yer almaz"""
+        keys = list(keys)
+        if not keys or not self._available:
+            return {}
+
         try:
-            value = await self.redis_client.get(key)
-            if value:
-                return json.loads(value)
+            values = await self.redis_client.mget([self._key(key) for key in keys])
+        except Exception as e:
+            logger.error(f"Redis mget error: {e}")
+            return {}
+        results = {}
+        for key, raw in zip(keys, values):
+            value = self._decode(raw)
+            if value is not None:
+                results[key] = value
+        return results
+
+    def _with_ttl(self, raw: Optional[bytes], pttl: Optional[int]) -> Optional[ValueWithTTL]:
+        value = self._decode(raw)
+        if value is None:
+            return None
+        # PTTL: -1 süresiz, -2 anahtar yok
+        return value, (pttl / 1000 if pttl is not None and pttl >= 0 else None)
+
+    async def get_with_ttl(self, key: str) -> Optional[ValueWithTTL]:
+        """Değer ve kalan süresi tek round-trip'te (GET + PTTL)"""
+        if not self._available:
             return None
+
+        redis_key = self._key(key)
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(redis_key)
+                pipe.pttl(redis_key)
+                raw, pttl = await pipe.execute()
         except Exception as e:
             logger.error(f"Redis get error: {e}")
             return None
-    
+        return self._with_ttl(raw, pttl)
+
+    async def get_many_with_ttl(self, keys: Iterable[str]) -> Dict[str, ValueWithTTL]:
+        """Tek pipeline'da MGET ve anahtar başına PTTL; bulunamayanlar sonuçta yer almaz"""
+        keys = list(keys)
+        if not keys or not self._available:
+            return {}
+
+        redis_keys = [self._key(key) for key in keys]
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.mget(redis_keys)
+                for redis_key in redis_keys:
+                    pipe.pttl(redis_key)
+                values, *pttls = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis mget error: {e}")
+            return {}
+        results = {}
+        for key, raw, pttl in zip(keys, values, pttls):
+            found = self._with_ttl(raw, pttl)
+            if found is not None:
+                results[key] = found
+        return results
+
     async def set(self, key: str, value: Any, ttl: int = None) -> bool:
         """Set value in Redis cache"""
-        if not self.is_connected or not self.redis_client:
+        if not self._available:
             return False
-        
+
         try:
-            ttl = ttl or self.default_ttl
-            serialized_value = json.dumps(value, ensure_ascii=False)
-            await self.redis_client.setex(key, ttl, serialized_value)
+            ttl = int(jittered(ttl or self.default_ttl))
+            await self.redis_client.set(self._key(key), cache_codec.encode(value), ex=ttl)
             return True
         except Exception as e:
             logger.error(f"Redis set error: {e}")
             return False
-    
-    async def delete(self, key: str) -> bool:
-        """Delete key from Redis cache"""
-        if not self.is_connected or not self.redis_client:
+
+    async def set_many(self, items: Mapping[str, Any], ttl: int = None) -> bool:
+        """Birden çok anahtarı tek pipeline round-trip'inde yazar"""
+        if not items or not self._available:
             return False
-        
+
         try:
-            await self.redis_client.delete(key)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(
+                        self._key(key),
+                        cache_codec.encode(value),
+                        ex=int(jittered(ttl or self.default_ttl))
+                    )
+                await pipe.execute()
             return True
         except Exception as e:
-            logger.error(f"Redis delete error: {e}")
+            logger.error(f"Redis pipeline set error: {e}")
             return False
-    
-    async def clear(self) -> bool:
-        """Clear all cache (use with caution!)"""
-        if not self.is_connected or not self.redis_client:
+
+    # Sync erişim (bloklayan istemci, yalnızca async bağlantı kurulmuşsa)
+
+    def _sync(self) -> Optional[SyncRedis]:
+        if not self._available:
+            return None
+        if self._sync_client is None:
+            self._sync_client = SyncRedis.from_url(
+                self.redis_url,
+                max_connections=self.max_connections,
+                socket_connect_timeout=SYNC_SOCKET_TIMEOUT,
+                socket_timeout=SYNC_SOCKET_TIMEOUT
+            )
+        return self._sync_client
+
+    def get_with_ttl_sync(self, key: str) -> Optional[ValueWithTTL]:
+        """get_with_ttl'in sync karşılığı"""
+        client = self._sync()
+        if client is None:
+            return None
+
+        redis_key = self._key(key)
+        try:
+            with client.pipeline(transaction=False) as pipe:
+                pipe.get(redis_key)
+                pipe.pttl(redis_key)
+                raw, pttl = pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis sync get error: {e}")
+            return None
+        return self._with_ttl(raw, pttl)
+
+    def set_sync(self, key: str, value: Any, ttl: int = None) -> bool:
+        """set'in sync karşılığı"""
+        client = self._sync()
+        if client is None:
             return False
-        
+
         try:
-            await self.redis_client.flushdb()
+            ttl = int(jittered(ttl or self.default_ttl))
+            client.set(self._key(key), cache_codec.encode(value), ex=ttl)
             return True
         except Exception as e:
-            logger.error(f"Redis clear error: {e}")
+            logger.error(f"Redis sync set error: {e}")
+            return False
+
+    async def get_or_refresh(self, key: str, loader, soft_ttl: int, hard_ttl: int = None,
+                             cacheable=None) -> Any:
+        """Stale-while-revalidate: soft TTL sonrası eski değer döner, arka planda yenilenir"""
+        return await get_or_refresh(self, key, loader, soft_ttl, hard_ttl, cacheable)
+
+    async def delete(self, key: str) -> bool:
+        """Delete key from Redis cache"""
+        return await self.delete_many([key]) > 0
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Birden çok anahtarı tek UNLINK ile siler"""
+        keys = [self._key(key) for key in keys]
+        if not keys or not self._available:
+            return 0
+
+        try:
+            return await self.redis_client.unlink(*keys)
+        except Exception as e:
+            logger.error(f"Redis delete error: {e}")
+            return 0
+
+    async def exists(self, key: str) -> bool:
+        """Check if key exists in Redis cache"""
+        if not self._available:
+            return False
+
+        try:
+            return bool(await self.redis_client.exists(self._key(key)))
+        except Exception as e:
+            logger.error(f"Redis exists error: {e}")
             return False
-    
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        """Set expiration time for a key"""
+        if not self._available:
+            return False
+
+        try:
+            return bool(await self.redis_client.expire(self._key(key), ttl))
+        except Exception as e:
+            logger.error(f"Redis expire error: {e}")
+            return False
+
+    async def get_ttl(self, key: str) -> int:
+        """Get remaining TTL for a key"""
+        if not self._available:
+            return -1
+
+        try:
+            return await self.redis_client.ttl(self._key(key))
+        except Exception as e:
+            logger.error(f"Redis ttl error: {e}")
+            return -1
+
+    async def clear_pattern(self, pattern: str) -> int:
+        """Clear keys matching a pattern (SCAN ile, sunucuyu bloklamadan)"""
+        if not self._available:
+            return 0
+
+        cleared = 0
+        batch: List[bytes] = []
+        try:
+            async for redis_key in self.redis_client.scan_iter(match=self._key(pattern), count=SCAN_BATCH_SIZE):
+                batch.append(redis_key)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    cleared += await self.redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                cleared += await self.redis_client.unlink(*batch)
+            return cleared
+        except Exception as e:
+            logger.error(f"Redis clear pattern error: {e}")
+            return cleared
+
+    async def clear(self) -> bool:
+        """Clear all cache keys of this application (diğer uygulamaların verisine dokunmaz)"""
+        if not self._available:
+            return False
+        await self.clear_pattern("*")
+        return True
+
     async def get_stats(self) -> Dict[str, Any]:
         """Get Redis cache statistics"""
-        if not self.is_connected or not self.redis_client:
+        if not self._available:
             return {"error": "Redis not connected"}
-        
+
         try:
             info = await self.redis_client.info()
             return {
                 "connected": True,
                 "total_keys": info.get("db0", {}).get("keys", 0),
                 "memory_usage": info.get("used_memory_human", "N/A"),
+                "keyspace_hits": info.get("keyspace_hits", 0),
+                "keyspace_misses": info.get("keyspace_misses", 0),
                 "uptime": info.get("uptime_in_seconds", 0),
-                "redis_version": info.get("redis_version", "N/A")
+                "redis_version": info.get("redis_version", "N/A"),
+                "key_prefix": self.key_prefix,
+                "pool_max_connections": self.max_connections
             }
         except Exception as e:
             logger.error(f"Redis stats error: {e}")
             return {"error": str(e)}
-    
+
     async def health_check(self) -> bool:
         """Check Redis health"""
-        if not self.is_connected or not self.redis_client:
+        if not self._available:
             return False
-        
+
         try:
             await self.redis_client.ping()
             return True
@@ -135,27 +375,16 @@ class RedisCacheService:
             return False
 
 # Global Redis cache instance
-redis_cache = RedisCacheService()
+redis_cache = RedisCacheService(
+    os.getenv("REDIS_URL", DEFAULT_REDIS_URL),
+    key_prefix=os.getenv("REDIS_KEY_PREFIX", DEFAULT_KEY_PREFIX),
+    max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))
+)
 
 # Cache decorator for Redis
 def redis_cache_result(ttl: int = 3600, prefix: str = "artwork"):
-    """Decorator to cache function results in Redis"""
-    def decorator(func):
-        async def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = f"{prefix}:{hash(str(args) + str(kwargs))}"
-            
-            # Try to get from Redis cache
-            cached_result = await redis_cache.get(cache_key)
-            if cached_result is not None:
-                logger.info(f"Redis cache hit for {func.__name__}")
-                return cached_result
-            
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            await redis_cache.set(cache_key, result, ttl)
-            logger.info(f"Redis cache miss for {func.__name__}, cached for {ttl}s")
-            
-            return result
-        return wrapper
-    return decorator
+    """Decorator to cache function results in Redis (sync or async, stable keys); see app.memoize"""
+    return memoize(ttl=ttl, namespace=prefix, cache=redis_cache)
+
+# Eski app.redis_cache modülündeki adla uyumluluk
+redis_cache_decorator = redis_cache_result
@@ -5,11 +5,11 @@ Artwork Search Service - Görsel arama işlevselliği
 import urllib.parse
 from typing import Optional
 from app.features.image_sources import (
-    get_art_institute_image,
-    get_met_museum_image,
-    get_wikimedia_image,
-    search_artwork_image
+    fetch_art_institute_image,
+    fetch_met_museum_image,
+    fetch_wikimedia_image
 )
+from app.features.image_resolver import image_resolver
 from app.features.fallback import get_fallback_images
 
 class ArtworkSearchService:
@@ -30,7 +30,7 @@ class ArtworkSearchService:
         # 1. Web'de ara (en güncel ve doğru)
         try:
             print(f"🌐 Web'de aranıyor: {decoded_name}")
-            web_image = search_artwork_image(decoded_name)
+            web_image = await image_resolver.resolve(decoded_name)
             if web_image and web_image.startswith('http'):
                 print(f"✅ Web'de görsel bulundu: {decoded_name}")
                 print(f"🔗 URL: {web_image}")
@@ -43,7 +43,7 @@ class ArtworkSearchService:
         # 2. Müze API'lerini dene
         try:
             print(f"🏛️ Art Institute'da aranıyor: {decoded_name}")
-            museum_image = get_art_institute_image(decoded_name)
+            museum_image = await fetch_art_institute_image(decoded_name)
             if museum_image:
                 print(f"✅ Art Institute'da bulundu: {decoded_name}")
                 print(f"🔗 URL: {museum_image}")
@@ -53,7 +53,7 @@ class ArtworkSearchService:
             
         try:
             print(f"🏛️ MET Museum'da aranıyor: {decoded_name}")
-            met_image = get_met_museum_image(decoded_name)
+            met_image = await fetch_met_museum_image(decoded_name)
             if met_image:
                 print(f"✅ MET Museum'da bulundu: {decoded_name}")
                 print(f"🔗 URL: {met_image}")
@@ -63,7 +63,7 @@ class ArtworkSearchService:
             
         try:
             print(f"🌐 Wikimedia'da aranıyor: {decoded_name}")
-            wikimedia_image = get_wikimedia_image(decoded_name)
+            wikimedia_image = await fetch_wikimedia_image(decoded_name)
             if wikimedia_image:
                 print(f"✅ Wikimedia'da bulundu: {decoded_name}")
                 print(f"🔗 URL: {wikimedia_image}")
@@ -0,0 +1,223 @@
+"""
+Color Index for ArtStoryAI
+Katalog görsellerinin renk özellikleri ve "Renk" filtresi etiketleri
+
+- Kaynaklar: filtre görselleri (manual_images) ve içe aktarılmış MET
+  kataloğundaki görselli eserler (görsel proxy'sinin disk önbelleği
+  üzerinden bir kez indirilir)
+- Özellikler (k-means paleti, sıcak/soğuk oranları, doygunluk ve parlaklık
+  istatistikleri) süreç havuzunda NumPy ile hesaplanır ve paketlenmiş
+  vektör olarak yerel SQLite deposunda saklanır
+- Etiketler filtrelerin kullandığı indekslere yazılır: MET eserleri için
+  met_catalog_terms, filtre görselleri için eser sözlüğündeki "colors"
+  alanı (FacetIndex)
+- Yalnızca yeni veya görseli değişen kaynaklar hesaplanır; her tur en
+  fazla batch_size görsel işler
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from app import color_features, image_processing
+from app.image_proxy import image_proxy
+from app.local_store import LocalStore, local_store
+from app.manual_asset_catalog import filter_image_catalog
+from app.services.met_catalog import met_catalog
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_SYNC_INTERVAL_SECONDS = 3600
+COMPUTE_CONCURRENCY = 4
+
+SOURCE_FILTER_IMAGE = "filter_image"
+SOURCE_MET = "met"
+
+
+@dataclass(frozen=True)
+class _Source:
+    """Renk özellikleri hesaplanacak bir katalog görseli"""
+    key: str
+    fingerprint: str
+    location: str
+    remote: bool = False
+
+
+def manual_source(filename: str) -> str:
+    return f"{SOURCE_FILTER_IMAGE}:{filename}"
+
+
+def met_source(object_id: int) -> str:
+    return f"{SOURCE_MET}:{object_id}"
+
+
+class ColorIndex:
+    """Batch color feature extraction feeding the color facet of the filter indexes"""
+
+    def __init__(self, store: LocalStore):
+        self.store = store
+        self.batch_size = int(os.getenv("COLOR_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+        self.sync_interval = int(os.getenv("COLOR_SYNC_INTERVAL_SECONDS", DEFAULT_SYNC_INTERVAL_SECONDS))
+        self._labels: Dict[str, List[str]] = {}
+        self._loaded = False
+        # Hesaplanamayan kaynaklar sonraki turlarda en sona bırakılır
+        self._failed: Set[str] = set()
+        # Etiketler değiştikçe artar (filtre servisi eser listesini yeniler)
+        self.version = 0
+        self._sync_task: Optional[asyncio.Task] = None
+        self.store.register_schema(
+            """CREATE TABLE IF NOT EXISTS color_features (
+                source TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                features BLOB NOT NULL,
+                labels TEXT NOT NULL,
+                computed_at REAL NOT NULL
+            )""",
+        )
+
+    # Okuma
+
+    def load(self) -> None:
+        rows = self.store.fetchall("SELECT source, labels FROM color_features")
+        self._labels = {row["source"]: [label for label in row["labels"].split(",") if label] for row in rows}
+        self._loaded = True
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            try:
+                self.load()
+            except Exception as e:
+                print(f"Renk indeksi yüklenemedi: {e}")
+                self._loaded = True
+
+    def labels_for(self, source: str) -> List[str]:
+        """Kaynağın renk etiketleri (henüz hesaplanmadıysa boş)"""
+        self._ensure_loaded()
+        return self._labels.get(source, [])
+
+    # Kaynaklar
+
+    @staticmethod
+    def _filter_sources() -> List[_Source]:
+        return [
+            _Source(manual_source(asset.filename), f"{asset.size}:{asset.mtime_ns}", str(asset.path))
+            for asset in filter_image_catalog.all_assets()
+        ]
+
+    @staticmethod
+    def _met_sources() -> List[_Source]:
+        try:
+            met_images = met_catalog.image_urls()
+        except Exception as e:
+            print(f"MET kataloğu okunamadı: {e}")
+            return []
+        return [
+            _Source(met_source(object_id), image_url, image_url, remote=True)
+            for object_id, image_url in met_images
+            if image_url
+        ]
+
+    def _fingerprints(self) -> Dict[str, str]:
+        rows = self.store.fetchall("SELECT source, fingerprint FROM color_features")
+        return {row["source"]: row["fingerprint"] for row in rows}
+
+    async def _compute(self, source: _Source, semaphore: asyncio.Semaphore) -> Optional[Tuple]:
+        async with semaphore:
+            try:
+                path = str(await image_proxy.original(source.location)) if source.remote else source.location
+                features = await image_processing.run(image_processing.color_features, path)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Renk özellikleri hesaplanamadı ({source.location}): {e}")
+                self._failed.add(source.key)
+                return None
+        self._failed.discard(source.key)
+        labels = color_features.color_labels(features)
+        return (source.key, source.fingerprint, color_features.pack(features), ",".join(labels), time.time())
+
+    # Yazma
+
+    def _save_rows(self, rows: List[Tuple], removed: List[str]) -> None:
+        self.store.executemany(
+            """INSERT INTO color_features (source, fingerprint, features, labels, computed_at)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(source) DO UPDATE SET
+                   fingerprint = excluded.fingerprint, features = excluded.features,
+                   labels = excluded.labels, computed_at = excluded.computed_at""",
+            rows,
+        )
+        self.store.executemany("DELETE FROM color_features WHERE source = ?", [(key,) for key in removed])
+        met_catalog.set_colors(
+            (int(key.split(":", 1)[1]), [label for label in labels.split(",") if label])
+            for key, _, _, labels, _ in rows
+            if key.startswith(f"{SOURCE_MET}:")
+        )
+
+    async def sync(self, limit: Optional[int] = None) -> int:
+        """Eksik veya değişmiş kaynakların renk özelliklerini hesaplar; hesaplanan sayıyı döner"""
+        self._ensure_loaded()
+        fingerprints = await self.store.run(self._fingerprints)
+        sources = self._filter_sources() + await self.store.run(self._met_sources)
+        keys = {source.key for source in sources}
+        stale = [source for source in sources if fingerprints.get(source.key) != source.fingerprint]
+        stale.sort(key=lambda source: source.key in self._failed)
+        stale = stale[:limit or self.batch_size]
+        removed = [key for key in fingerprints if key not in keys]
+        if not stale and not removed:
+            return 0
+
+        semaphore = asyncio.Semaphore(COMPUTE_CONCURRENCY)
+        rows = [row for row in await asyncio.gather(*(self._compute(source, semaphore) for source in stale))
+                if row is not None]
+        await self.store.run(self._save_rows, rows, removed)
+
+        for key in removed:
+            self._labels.pop(key, None)
+        for key, _, _, labels, _ in rows:
+            self._labels[key] = [label for label in labels.split(",") if label]
+        self.version += 1
+        return len(rows)
+
+    async def _sync_loop(self) -> None:
+        while True:
+            try:
+                computed = await self.sync()
+                if computed:
+                    print(f"🎨 {computed} görselin renk özellikleri hesaplandı")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Renk indeksi güncelleme hatası: {e}")
+            if self.sync_interval <= 0:
+                return
+            await asyncio.sleep(self.sync_interval)
+
+    async def start(self) -> None:
+        """Etiketleri yükler ve arka plan hesaplamasını başlatır (FastAPI startup)"""
+        if not self._loaded:
+            try:
+                await self.store.run(self.load)
+            except Exception as e:
+                print(f"Renk indeksi yüklenemedi: {e}")
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+
+    def stats(self) -> Dict[str, int]:
+        self._ensure_loaded()
+        labelled = sum(1 for labels in self._labels.values() if labels)
+        return {"entries": len(self._labels), "labelled": labelled}
+
+
+# Global instance
+color_index = ColorIndex(local_store)
@@ -0,0 +1,219 @@
+"""
+Content Store - Üretilen eser içeriğinin kalıcı olarak saklanması
+
+AI ile üretilen hikaye, biyografi, akım açıklaması ve detaylar ilk üretimden
+sonra `artworks` tablosuna yazılır (write-through). Sonraki istekler
+normalize edilmiş eser adı anahtarıyla önce bellekten, sonra veritabanından
+karşılanır; eski kayıtlar isteğe bağlı olarak arka planda yenilenir.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from app.cache_policy import NS_ARTWORK_RECORD, cache_key
+from app.cache_service import artwork_cache
+from app.name_index import normalize_name
+from app.single_flight import artwork_flights
+from app.features.openai_story import (
+    FALLBACK_ARTIST_BIO,
+    FALLBACK_MOVEMENT_DESC,
+    FALLBACK_STORY,
+    PENDING_TEXT,
+)
+
+logger = logging.getLogger(__name__)
+
+ArtworkRecord = Dict[str, Any]
+# AI'nin ürettiği detay alanları; biri yer tutucu kalırsa kayıt eksiktir
+DETAIL_FIELDS = ("artist", "year", "movement", "museum")
+RecordFactory = Callable[[], Awaitable[ArtworkRecord]]
+
+
+class ArtworkContentStore:
+    """Üretilen eser içeriği için write-through kalıcı depo"""
+
+    def __init__(self):
+        self.cache_ttl = 24 * 3600
+        # Kayıtlar bu süreden eskiyse arka planda yeniden üretilir (0 = kapalı)
+        self.refresh_after = int(os.getenv("ARTWORK_CONTENT_REFRESH_DAYS", "30")) * 24 * 3600
+        # Veritabanına ulaşılamazsa bu süre boyunca tekrar denenmez
+        self.db_retry_interval = 60
+        self._db_unavailable_until = 0.0
+        self._refreshing: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def make_key(art_name: str) -> str:
+        """Eser adından içerik anahtarı üretir"""
+        return normalize_name(art_name)
+
+    def _cache_key(self, name_key: str) -> str:
+        return cache_key(NS_ARTWORK_RECORD, name_key)
+
+    def _db_available(self) -> bool:
+        return time.time() >= self._db_unavailable_until
+
+    def _mark_db_unavailable(self, error: Exception) -> None:
+        logger.warning(f"Artwork content DB unavailable, using cache only: {error}")
+        self._db_unavailable_until = time.time() + self.db_retry_interval
+
+    @staticmethod
+    def is_complete(record: ArtworkRecord) -> bool:
+        """Yalnızca gerçekten üretilmiş içerik kalıcı hale getirilir"""
+        return (
+            record.get("story") not in (None, "", FALLBACK_STORY)
+            and record.get("artist_bio") not in (None, "", FALLBACK_ARTIST_BIO)
+            and record.get("movement_desc") not in (None, "", FALLBACK_MOVEMENT_DESC)
+            and all(record.get(field) not in (None, "", PENDING_TEXT) for field in DETAIL_FIELDS)
+        )
+
+    def is_stale(self, record: ArtworkRecord) -> bool:
+        if not self.refresh_after:
+            return False
+        return time.time() - record.get("updated_at", 0) > self.refresh_after
+
+    # Veritabanı işlemleri (senkron, thread içinde çalıştırılır)
+
+    def _load_from_db(self, name_key: str) -> Optional[ArtworkRecord]:
+        from app.database import SessionLocal
+        from app.models import Artwork
+
+        db = SessionLocal()
+        try:
+            artwork = db.query(Artwork).filter(Artwork.name_key == name_key).first()
+            if not artwork or not artwork.story:
+                return None
+            updated = artwork.updated_at or artwork.created_at
+            return {
+                "art_name": artwork.title,
+                "artist": artwork.artist,
+                "year": artwork.year_text or (str(artwork.year) if artwork.year else PENDING_TEXT),
+                "movement": artwork.movement or PENDING_TEXT,
+                "museum": artwork.museum or PENDING_TEXT,
+                "image_url": artwork.image_url,
+                "story": artwork.story,
+                "artist_bio": artwork.artist_bio,
+                "movement_desc": artwork.movement_desc,
+                "source": artwork.source or "ai",
+                "updated_at": updated.timestamp() if updated else 0,
+            }
+        finally:
+            db.close()
+
+    def _save_to_db(self, name_key: str, record: ArtworkRecord) -> None:
+        from app.database import SessionLocal
+        from app.models import Artwork
+
+        year_text = str(record.get("year") or "")
+        year_match = re.search(r"\d{3,4}", year_text)
+
+        db = SessionLocal()
+        try:
+            artwork = db.query(Artwork).filter(Artwork.name_key == name_key).first()
+            if artwork is None:
+                artwork = Artwork(name_key=name_key)
+                db.add(artwork)
+            artwork.title = record["art_name"][:200]
+            artwork.artist = (record.get("artist") or "Bilinmeyen Sanatçı")[:100]
+            artwork.year = int(year_match.group()) if year_match else None
+            artwork.year_text = year_text[:50] or None
+            artwork.movement = (record.get("movement") or "")[:100] or None
+            artwork.museum = (record.get("museum") or "")[:200] or None
+            artwork.image_url = (record.get("image_url") or "")[:500] or None
+            artwork.story = record.get("story")
+            artwork.artist_bio = record.get("artist_bio")
+            artwork.movement_desc = record.get("movement_desc")
+            artwork.source = record.get("source", "ai")
+            artwork.updated_at = datetime.now(timezone.utc)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # Async API
+
+    async def get(self, art_name: str) -> Optional[ArtworkRecord]:
+        """Kayıtlı içeriği önce bellekten, sonra veritabanından getirir"""
+        name_key = self.make_key(art_name)
+        cached = artwork_cache.get_sync(self._cache_key(name_key))
+        if cached is not None:
+            return cached
+
+        if not self._db_available():
+            return None
+        try:
+            record = await asyncio.to_thread(self._load_from_db, name_key)
+        except Exception as e:
+            self._mark_db_unavailable(e)
+            return None
+
+        if record is not None:
+            artwork_cache.set_sync(self._cache_key(name_key), record, self.cache_ttl)
+        return record
+
+    async def save(self, art_name: str, record: ArtworkRecord) -> ArtworkRecord:
+        """İçeriği belleğe ve (tamamsa) veritabanına yazar"""
+        name_key = self.make_key(art_name)
+        record = {**record, "updated_at": time.time()}
+
+        if not self.is_complete(record):
+            # Eksik (fallback) içerik saklanmaz, bir sonraki istekte yeniden üretilir
+            return record
+
+        artwork_cache.set_sync(self._cache_key(name_key), record, self.cache_ttl)
+        if self._db_available():
+            try:
+                await asyncio.to_thread(self._save_to_db, name_key, record)
+            except Exception as e:
+                self._mark_db_unavailable(e)
+        return record
+
+    async def get_or_generate(self, art_name: str, factory: RecordFactory) -> ArtworkRecord:
+        """Kayıt varsa döner (gerekirse arka planda yeniler), yoksa üretip saklar"""
+        record = await self.get(art_name)
+        if record is not None:
+            if self.is_stale(record):
+                self.schedule_refresh(art_name, factory)
+            return record
+        # Aynı eser için eşzamanlı istekler tek bir üretimi bekler
+        return await artwork_flights.do(
+            self.make_key(art_name), lambda: self._generate(art_name, factory)
+        )
+
+    async def _generate(self, art_name: str, factory: RecordFactory) -> ArtworkRecord:
+        # Önceki uçuş bu arada kaydı yazmış olabilir
+        record = await self.get(art_name)
+        if record is not None:
+            return record
+        return await self.save(art_name, await factory())
+
+    def schedule_refresh(self, art_name: str, factory: RecordFactory) -> None:
+        """Kaydı arka planda yeniden üretir; aynı anahtar için tek yenileme çalışır"""
+        name_key = self.make_key(art_name)
+        if name_key in self._refreshing:
+            return
+        self._refreshing.add(name_key)
+
+        async def _refresh():
+            try:
+                await self.save(art_name, await factory())
+                logger.info(f"Artwork content refreshed: {name_key}")
+            except Exception as e:
+                logger.error(f"Artwork content refresh failed for {name_key}: {e}")
+            finally:
+                self._refreshing.discard(name_key)
+
+        task = asyncio.create_task(_refresh())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+
+# Global instance
+artwork_content_store = ArtworkContentStore()
@@ -0,0 +1,165 @@
+"""
+Facet Index - Filtreleme için bitmap tabanlı faset indeksi
+
+Her faset (dönem, stil, müze, kültür, renk, boyut) için normalize edilmiş
+her değerin bir bitmap'i tutulur; bitmap'ler Python int bit kümeleridir
+(i. bit = i. eser). Çoklu seçim filtreleri birleşim (OR), farklı fasetler
+kesişim (AND) ile yanıtlanır.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.name_index import normalize_name
+
+# Filtre alanı -> eser alanı
+FILTER_FACETS: Dict[str, str] = {
+    "periods": "period",
+    "styles": "style",
+    "museums": "museum",
+    "cultures": "culture",
+    "colors": "color",
+    "sizes": "size",
+}
+
+# Sonuç yoksa sırayla denenen gevşetmeler: yalnızca bu filtre korunur
+RELAXATION_ORDER = ("periods", "styles")
+
+
+def iter_bits(bits: int) -> Iterable[int]:
+    """Bit kümesindeki indeksler, artan sırada"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class FacetIndex:
+    """
+    Posting bitmaps per normalized facet value.
+
+    Filter values keep the old substring semantics ("rönesans" matches
+    "Yüksek Rönesans"), but the substring test runs over each facet's
+    distinct values rather than over every artwork.
+    """
+
+    def __init__(self, artworks: List[Dict]):
+        self.artworks = artworks
+        self.all_bits = (1 << len(artworks)) - 1
+        # faset -> normalize değer -> [görünen değer, bitmap]
+        self.postings: Dict[str, Dict[str, List]] = {field: {} for field in FILTER_FACETS.values()}
+        self._match_cache: Dict[Tuple[str, str], int] = {}
+        self._index(artworks, 0)
+
+    def extended(self, artworks: List[Dict]) -> "FacetIndex":
+        """
+        Bu indeks ile eklenen eserlerin indeksi; eklenenler sona yazılır.
+        Mevcut eserler yeniden indekslenmez, yalnızca bitmap'ler kopyalanır.
+        """
+        if not artworks:
+            return self
+        index = FacetIndex([])
+        index.artworks = self.artworks + artworks
+        index.all_bits = (1 << len(index.artworks)) - 1
+        index.postings = {
+            field: {key: list(entry) for key, entry in values.items()}
+            for field, values in self.postings.items()
+        }
+        index._index(artworks, len(self.artworks))
+        return index
+
+    def _index(self, artworks: List[Dict], offset: int) -> None:
+        for i, artwork in enumerate(artworks, offset):
+            bit = 1 << i
+            for field, values in self.postings.items():
+                raw = artwork.get(field)
+                if raw is None:
+                    # Çoğul alan adları da kabul edilir (ör. "colors")
+                    raw = artwork.get(f"{field}s")
+                for value in self._values(raw):
+                    key = normalize_name(value)
+                    if not key:
+                        continue
+                    entry = values.get(key)
+                    if entry is None:
+                        values[key] = [value, bit]
+                    else:
+                        entry[1] |= bit
+
+    @staticmethod
+    def _values(raw) -> List[str]:
+        if not raw:
+            return []
+        if isinstance(raw, str):
+            return [raw]
+        return [str(value) for value in raw if value]
+
+    def has_facet(self, filter_name: str) -> bool:
+        """Fasette indekslenmiş değer var mı (verisi olmayan fasetler filtrelenmez)"""
+        field = FILTER_FACETS.get(filter_name)
+        return bool(field and self.postings[field])
+
+    def value_bits(self, field: str, value: str) -> int:
+        """Bir filtre değerine uyan eserlerin bitmap'i"""
+        query = normalize_name(value)
+        cache_key = (field, query)
+        bits = self._match_cache.get(cache_key)
+        if bits is None:
+            bits = 0
+            if query:
+                for key, (_, posting) in self.postings[field].items():
+                    if query in key:
+                        bits |= posting
+            self._match_cache[cache_key] = bits
+        return bits
+
+    def match(self, filter_name: str, values: Iterable[str]) -> int:
+        """Çoklu seçim: değerlerin birleşimi"""
+        field = FILTER_FACETS[filter_name]
+        bits = 0
+        for value in values:
+            bits |= self.value_bits(field, value)
+        return bits
+
+    def query(self, filters: Dict, only: Optional[Iterable[str]] = None) -> int:
+        """Fasetlerin kesişimi; only verilirse yalnızca o filtreler uygulanır"""
+        names = set(only) if only is not None else set(FILTER_FACETS)
+        bits = self.all_bits
+        for filter_name, values in filters.items():
+            if filter_name not in names or not values or not self.has_facet(filter_name):
+                continue
+            bits &= self.match(filter_name, values)
+            if not bits:
+                break
+        return bits
+
+    def search(self, filters: Dict, always_include: int = 0) -> Tuple[int, Optional[str]]:
+        """
+        Filtreleri uygular; sonuç yoksa tek fasetli gevşetmeleri sırayla dener.
+        (bitmap, gevşetilen filtrenin adı veya None) döndürür.
+        """
+        bits = self.query(filters) | always_include
+        if bits:
+            return bits, None
+        for filter_name in RELAXATION_ORDER:
+            if filters.get(filter_name):
+                relaxed = self.query(filters, only=[filter_name]) | always_include
+                if relaxed:
+                    return relaxed, filter_name
+        return bits, None
+
+    def select(self, bits: int) -> List[Dict]:
+        return [self.artworks[i] for i in iter_bits(bits)]
+
+    def facet_counts(self, bits: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """Her faset değeri için sonuçtaki eser sayısı"""
+        if bits is None:
+            bits = self.all_bits
+        counts: Dict[str, Dict[str, int]] = {}
+        for filter_name, field in FILTER_FACETS.items():
+            field_counts = {}
+            for display, posting in self.postings[field].values():
+                count = bin(posting & bits).count("1")
+                if count:
+                    field_counts[display] = count
+            counts[filter_name] = dict(sorted(field_counts.items(), key=lambda item: (-item[1], item[0])))
+        return counts
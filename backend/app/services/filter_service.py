@@ -6,13 +6,35 @@ Manuel ve API görsellerini birleştirip filtreleme yapar
 import os
 import json
 from typing import List, Dict, Optional
-from pathlib import Path
-import aiohttp
 import asyncio
 
+from app.manual_asset_catalog import ManualAsset, filter_image_catalog
+from app.met_museum_service import met_museum_service
+from app.services.color_index import color_index, manual_source
+from app.services.facet_index import FacetIndex
+from app.services.met_catalog import met_catalog
+
+# Manifestte belirtilmeyen alanlar için varsayılanlar
+MANUAL_ARTWORK_DEFAULTS = {
+    "artist": "Bilinmeyen Sanatçı",
+    "year": "Bilinmeyen",
+    "period": "Modern",
+    "style": "Klasik",
+    "museum": "Local Collection",
+    "culture": "Avrupa",
+    "medium": "Digital Image",
+    "dimensions": "N/A",
+}
+
 class FilterService:
     def __init__(self):
-        self.manual_images_dir = Path("manual_images")
+        self.manual_images_dir = filter_image_catalog.directory
+        # Katalog ve renk indeksi sürümü değişene kadar yeniden kullanılan eser listesi
+        self._manual_artworks: List[Dict] = []
+        self._manual_artworks_version = None
+        # Manuel eserlerin faset indeksi; aynı sürüm anahtarıyla yeniden kurulur
+        self._manual_index = FacetIndex([])
+        self._manual_index_version = None
         self.api_sources = {
             "met_museum": "https://collectionapi.metmuseum.org/public/collection/v1",
             "art_institute": "https://api.artic.edu/api/v1",
@@ -20,44 +42,44 @@ class FilterService:
         }
         
     def get_manual_artworks(self) -> List[Dict]:
-        """Manuel eklenen görselleri listeler"""
-        artworks = []
-        
-        print(f"Manuel görseller aranıyor: {self.manual_images_dir.absolute()}")
-        
-        if self.manual_images_dir.exists():
-            print(f"Manuel görseller dizini bulundu")
-            for image_file in self.manual_images_dir.glob("*.jpg"):
-                print(f"Görsel bulundu: {image_file.name}")
-                # Dosya adından sanat eseri bilgilerini çıkar
-                filename = image_file.stem
-                # Dosya adından sanat eseri bilgilerini çıkar
-                filename = image_file.stem
-                
-                # Manuel görsellere gerçek değerler ata
-                artwork_info = self._get_artwork_info_from_filename(filename)
-                
-                artwork = {
-                    "id": f"manual_{filename}",
-                    "title": self._format_title(filename),
-                    "artist": artwork_info["artist"],
-                    "year": artwork_info["year"],
-                    "period": artwork_info["period"],
-                    "style": artwork_info["style"],
-                    "museum": artwork_info["museum"],
-                    "imageUrl": f"http://localhost:8000/manual_images/{image_file.name}",
-                    "source": "manual",
-                    "description": f"Manuel eklenen sanat eseri: {self._format_title(filename)}",
-                    "culture": artwork_info["culture"],
-                    "medium": "Digital Image",
-                    "dimensions": "N/A"
-                }
-                artworks.append(artwork)
-        else:
-            print(f"Manuel görseller dizini bulunamadı: {self.manual_images_dir.absolute()}")
-        
-        print(f"Toplam {len(artworks)} manuel görsel bulundu")
-        return artworks
+        """Manuel eklenen görselleri listeler (açılışta yüklenen katalogdan)"""
+        version = (filter_image_catalog.version, color_index.version)
+        if self._manual_artworks_version != version:
+            self._manual_artworks = [
+                self._manual_artwork(asset) for asset in filter_image_catalog.all_assets()
+            ]
+            self._manual_artworks_version = version
+        return self._manual_artworks
+
+    def get_manual_index(self) -> FacetIndex:
+        """Manuel eserlerin faset indeksi (katalog ve renk indeksi sürümü değişince yeniden kurulur)"""
+        artworks = self.get_manual_artworks()
+        if self._manual_index_version != self._manual_artworks_version:
+            self._manual_index = FacetIndex(artworks)
+            self._manual_index_version = self._manual_artworks_version
+        return self._manual_index
+
+    def _manual_artwork(self, asset: ManualAsset) -> Dict:
+        """Katalog kaydını eser sözlüğüne çevirir; manifestte olmayan alanlar varsayılan kalır"""
+        info = {**MANUAL_ARTWORK_DEFAULTS, **asset.metadata}
+        title = asset.metadata.get("title") or self._format_title(asset.stem)
+        return {
+            "id": f"manual_{asset.stem}",
+            "title": title,
+            "artist": info["artist"],
+            "year": info["year"],
+            "period": info["period"],
+            "style": info["style"],
+            "museum": info["museum"],
+            "imageUrl": f"http://localhost:8000/manual_images/{asset.filename}",
+            "source": "manual",
+            "description": info.get("description") or f"Manuel eklenen sanat eseri: {title}",
+            "culture": info["culture"],
+            "medium": info["medium"],
+            "dimensions": info["dimensions"],
+            # Manifestte yoksa görselden hesaplanan renk etiketleri
+            "colors": info.get("colors") or color_index.labels_for(manual_source(asset.filename))
+        }
     
     def _format_title(self, filename: str) -> str:
         """Dosya adını okunabilir başlığa çevirir"""
@@ -66,111 +88,14 @@ class FilterService:
         # İlk harfleri büyük yap
         title = title.title()
         return title
-    
-    def _get_artwork_info_from_filename(self, filename: str) -> Dict:
-        """Dosya adından sanat eseri bilgilerini çıkarır"""
-        filename_lower = filename.lower()
-        
-        # Dönem bilgisi
-        if "adem" in filename_lower or "venus" in filename_lower:
-            period = "Rönesans"
-        elif "amerikan" in filename_lower or "campbell" in filename_lower:
-            period = "Çağdaş"
-        elif "kaplumbaga" in filename_lower or "koylu" in filename_lower:
-            period = "Modern"
-        elif "niluferler" in filename_lower:
-            period = "Modern"
-        elif "davut" in filename_lower:
-            period = "Rönesans"
-        else:
-            period = "Modern"
-        
-        # Stil bilgisi
-        if "campbell" in filename_lower:
-            style = "Pop Art"
-        elif "niluferler" in filename_lower:
-            style = "Empresyonizm"
-        elif "amerikan" in filename_lower:
-            style = "Regionalism"
-        elif "kaplumbaga" in filename_lower:
-            style = "Osmanlı"
-        elif "koylu" in filename_lower:
-            style = "Realizm"
-        else:
-            style = "Klasik"
-        
-        # Sanatçı bilgisi
-        if "adem" in filename_lower:
-            artist = "Michelangelo"
-        elif "venus" in filename_lower:
-            artist = "Sandro Botticelli"
-        elif "campbell" in filename_lower:
-            artist = "Andy Warhol"
-        elif "niluferler" in filename_lower:
-            artist = "Claude Monet"
-        elif "amerikan" in filename_lower:
-            artist = "Grant Wood"
-        elif "kaplumbaga" in filename_lower:
-            artist = "Osman Hamdi Bey"
-        elif "koylu" in filename_lower:
-            artist = "Vincent van Gogh"
-        elif "davut" in filename_lower:
-            artist = "Michelangelo"
-        else:
-            artist = "Bilinmeyen Sanatçı"
-        
-        # Yıl bilgisi
-        if "adem" in filename_lower or "davut" in filename_lower:
-            year = "1501-1504"
-        elif "venus" in filename_lower:
-            year = "1485"
-        elif "campbell" in filename_lower:
-            year = "1962"
-        elif "niluferler" in filename_lower:
-            year = "1899"
-        elif "amerikan" in filename_lower:
-            year = "1930"
-        elif "kaplumbaga" in filename_lower:
-            year = "1906"
-        elif "koylu" in filename_lower:
-            year = "1885"
-        else:
-            year = "Bilinmeyen"
-        
-        # Müze bilgisi
-        if "adem" in filename_lower or "davut" in filename_lower:
-            museum = "Vatican Museums"
-        elif "venus" in filename_lower:
-            museum = "Uffizi"
-        elif "campbell" in filename_lower:
-            museum = "MOMA"
-        elif "niluferler" in filename_lower:
-            museum = "Louvre"
-        elif "amerikan" in filename_lower:
-            museum = "Art Institute of Chicago"
-        elif "kaplumbaga" in filename_lower:
-            museum = "Pera Museum"
-        elif "koylu" in filename_lower:
-            museum = "Van Gogh Museum"
-        else:
-            museum = "Local Collection"
-        
-        # Kültür bilgisi
-        if "kaplumbaga" in filename_lower:
-            culture = "Osmanlı"
-        elif "koylu" in filename_lower:
-            culture = "Hollanda"
-        else:
-            culture = "Avrupa"
-        
-        return {
-            "period": period,
-            "style": style,
-            "artist": artist,
-            "year": year,
-            "museum": museum,
-            "culture": culture
-        }
+
+    async def get_met_catalog_artworks(self, filters: Dict = None) -> List[Dict]:
+        """İçe aktarılmış MET kataloğundan filtreye uyan eserler"""
+        artworks = await met_museum_service.catalog_artworks(filters or {})
+        for artwork in artworks:
+            artwork["id"] = f"met_{artwork['id']}"
+            artwork["source"] = "met_museum"
+        return artworks
     
     async def get_met_museum_artworks(self, filters: Dict = None) -> List[Dict]:
         """MET Museum'dan görselleri çeker"""
@@ -200,23 +125,19 @@ class FilterService:
                     # Style filtreleri için classification kullan
                     pass
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.api_sources['met_museum']}/search", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        object_ids = data.get("objectIDs", [])
-                        
-                        artworks = []
-                        for obj_id in object_ids[:10]:  # İlk 10 eser
-                            artwork = await self._get_met_artwork_details(obj_id)
-                            if artwork:
-                                artwork["source"] = "met_museum"
-                                artworks.append(artwork)
-                        
-                        return artworks
-                    else:
-                        print(f"MET Museum API hatası: {response.status}")
-                        return []
+            object_ids = await met_museum_service.search_ids(params)
+            
+            # İlk 10 eserin detayları: önbellekten tek sorgu, eksikler eşzamanlı ağdan
+            unique_ids = list(dict.fromkeys(object_ids[:10]))
+            objects = await met_museum_service.get_objects_data(unique_ids)
+            artworks = []
+            for obj_id in unique_ids:
+                if obj_id in objects:
+                    artwork = self._met_artwork(obj_id, objects[obj_id])
+                    artwork["source"] = "met_museum"
+                    artworks.append(artwork)
+            
+            return artworks
                         
         except Exception as e:
             print(f"MET Museum görselleri alınırken hata: {e}")
@@ -224,34 +145,16 @@ class FilterService:
     
     async def _get_met_artwork_details(self, object_id: int) -> Optional[Dict]:
         """MET Museum'dan eser detaylarını alır"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.api_sources['met_museum']}/objects/{object_id}") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        artwork = {
-                            "id": f"met_{object_id}",
-                            "title": data.get("title", "Bilinmeyen Eser"),
-                            "artist": data.get("artistDisplayName", "Bilinmeyen Sanatçı"),
-                            "year": data.get("objectDate", "Bilinmeyen Tarih"),
-                            "period": data.get("period", "Bilinmeyen Dönem"),
-                            "style": data.get("classification", "Bilinmeyen Stil"),
-                            "museum": "MET Museum",
-                            "imageUrl": data.get("primaryImage", ""),
-                            "description": data.get("objectDescription", "Açıklama bulunamadı"),
-                            "culture": data.get("culture", ""),
-                            "medium": data.get("medium", ""),
-                            "dimensions": data.get("dimensions", "")
-                        }
-                        
-                        return artwork
-                    else:
-                        return None
-                        
-        except Exception as e:
-            print(f"Artwork details hatası: {e}")
+        data = await met_museum_service.get_object_data(object_id)
+        if data is None:
             return None
+        return self._met_artwork(object_id, data)
+    
+    @staticmethod
+    def _met_artwork(object_id: int, data: Dict) -> Dict:
+        artwork = met_museum_service.parse_artwork(object_id, data)
+        artwork["id"] = f"met_{object_id}"
+        return artwork
     
     async def get_filtered_artworks(self, filters: Dict, sources: List[str] = None) -> Dict:
         """Filtrelenmiş sanat eserlerini döndürür - Akıllı filtreleme"""
@@ -264,26 +167,38 @@ class FilterService:
         validation = self.validate_filter_combination(filters)
         print(f"Filtre validasyonu: {validation}")
         
-        all_artworks = []
+        # Manuel eserlerin indeksi önbellekten gelir; canlı API eserleri sonradan eklenir
+        manual_index = FacetIndex([])
+        live_artworks = []
+        # Yerel katalogdan gelen eserler indekste zaten filtrelenmiştir
+        indexed_artworks = []
         
         # Manuel görselleri ekle
         if "manual" in sources:
             print("Manuel görseller ekleniyor...")
-            manual_artworks = self.get_manual_artworks()
-            all_artworks.extend(manual_artworks)
-            print(f"Manuel görseller eklendi: {len(manual_artworks)}")
+            manual_index = self.get_manual_index()
+            print(f"Manuel görseller eklendi: {len(manual_index.artworks)}")
         
         # API görsellerini ekle
         if "met_museum" in sources:
-            print("MET Museum görselleri ekleniyor...")
-            met_artworks = await self.get_met_museum_artworks(filters)
-            all_artworks.extend(met_artworks)
-            print(f"MET Museum görselleri eklendi: {len(met_artworks)}")
+            if await met_catalog.is_available_async():
+                print("MET Museum görselleri yerel katalogdan ekleniyor...")
+                indexed_artworks = await self.get_met_catalog_artworks(filters)
+                print(f"MET Museum görselleri eklendi: {len(indexed_artworks)}")
+            else:
+                print("MET Museum görselleri ekleniyor...")
+                met_artworks = await self.get_met_museum_artworks(filters)
+                live_artworks.extend(met_artworks)
+                print(f"MET Museum görselleri eklendi: {len(met_artworks)}")
         
-        print(f"Toplam görsel sayısı: {len(all_artworks)}")
-        
-        # Filtreleri uygula
-        filtered_artworks = self._apply_filters(all_artworks, filters)
+        # Filtreleri faset indeksi üzerinde uygula; katalog eserleri zaten filtrelenmiştir
+        index = manual_index.extended(live_artworks + indexed_artworks)
+        print(f"Toplam görsel sayısı: {len(index.artworks)}")
+        catalog_bits = ((1 << len(indexed_artworks)) - 1) << (len(index.artworks) - len(indexed_artworks))
+        bits, relaxed_filter = index.search(filters, always_include=catalog_bits)
+        filtered_artworks = index.select(bits)
+        if relaxed_filter:
+            print(f"Hiç sonuç bulunamadı, yalnızca '{relaxed_filter}' filtresiyle sonuç bulundu")
         print(f"Filtreleme sonrası görsel sayısı: {len(filtered_artworks)}")
         
         # Sonuçları grupla
@@ -294,78 +209,15 @@ class FilterService:
                 "met_museum": len([a for a in filtered_artworks if a.get("source") == "met_museum"])
             },
             "artworks": filtered_artworks,
+            "facets": index.facet_counts(bits),
+            "relaxed_filter": relaxed_filter,
             "validation": validation,
             "original_filters": filters
         }
         
-        print(f"Sonuçlar: {results}")
+        print(f"Sonuçlar: {results['total']} eser, kaynaklar: {results['sources']}")
         return results
     
-    def _apply_filters(self, artworks: List[Dict], filters: Dict) -> List[Dict]:
-        """Görselleri filtreler - Akıllı filtreleme mantığı"""
-        if not filters:
-            return artworks
-        
-        print(f"Filtreleme başlıyor - {len(artworks)} eser mevcut")
-        print(f"Uygulanacak filtreler: {filters}")
-        
-        filtered = artworks
-        
-        # Dönem filtresi
-        if filters.get("periods"):
-            filtered = [a for a in filtered if any(
-                period.lower() in a.get("period", "").lower() 
-                for period in filters["periods"]
-            )]
-            print(f"Dönem filtresi sonrası: {len(filtered)} eser")
-        
-        # Stil filtresi
-        if filters.get("styles"):
-            filtered = [a for a in filtered if any(
-                style.lower() in a.get("style", "").lower() 
-                for style in filters["styles"]
-            )]
-            print(f"Stil filtresi sonrası: {len(filtered)} eser")
-        
-        # Müze filtresi
-        if filters.get("museums"):
-            filtered = [a for a in filtered if any(
-                museum.lower() in a.get("museum", "").lower() 
-                for museum in filters["museums"]
-            )]
-            print(f"Müze filtresi sonrası: {len(filtered)} eser")
-        
-        # Eğer hiç sonuç yoksa, daha geniş arama yap
-        if not filtered and (filters.get("periods") or filters.get("styles")):
-            print("Hiç sonuç bulunamadı, alternatif arama yapılıyor...")
-            
-            # Sadece dönem ile dene
-            if filters.get("periods"):
-                period_only = [a for a in artworks if any(
-                    period.lower() in a.get("period", "").lower() 
-                    for period in filters["periods"]
-                )]
-                print(f"Sadece dönem filtresi ile: {len(period_only)} eser")
-                
-                if period_only:
-                    filtered = period_only
-                    print("Dönem filtresi ile sonuç bulundu")
-            
-            # Sadece stil ile dene
-            elif filters.get("styles") and not filtered:
-                style_only = [a for a in artworks if any(
-                    style.lower() in a.get("style", "").lower() 
-                    for style in filters["styles"]
-                )]
-                print(f"Sadece stil filtresi ile: {len(style_only)} eser")
-                
-                if style_only:
-                    filtered = style_only
-                    print("Stil filtresi ile sonuç bulundu")
-        
-        print(f"Final filtreleme sonucu: {len(filtered)} eser")
-        return filtered
-    
     def get_available_filters(self) -> Dict:
         """Mevcut filtre seçeneklerini döndürür"""
         return {
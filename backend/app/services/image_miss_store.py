@@ -0,0 +1,101 @@
+"""
+Image Miss Store for ArtStoryAI
+Görseli bulunamayan eserler için kalıcı negatif önbellek
+
+Her (normalize eser adı, sağlayıcı) çifti için ardışık "bulunamadı" sayısı
+tutulur. Sağlayıcı, üstel artan bir bekleme süresi boyunca o eser için
+yeniden sorgulanmaz (varsayılan 1 saat, 2 saat, 4 saat, ... en fazla 30 gün).
+Ağ hataları, 5xx ve 429 yanıtları sayılmaz; yalnızca sağlayıcının
+gerçekten sonuç döndürmediği (boş sonuç veya 4xx) aramalar kaydedilir. Görsel bulununca eserin kayıtları silinir.
+"""
+
+import os
+import time
+from typing import Iterable, Set
+
+from app.local_store import LocalStore, local_store
+from app.single_flight import name_key
+
+DEFAULT_MISS_BASE_SECONDS = 3600
+DEFAULT_MISS_MAX_SECONDS = 30 * 24 * 3600
+
+
+class ImageMissStore:
+    """Per-provider miss records with exponential-backoff retry windows"""
+
+    def __init__(self, store: LocalStore):
+        self.store = store
+        self.base_delay = int(os.getenv("IMAGE_MISS_BASE_SECONDS", DEFAULT_MISS_BASE_SECONDS))
+        self.max_delay = int(os.getenv("IMAGE_MISS_MAX_SECONDS", DEFAULT_MISS_MAX_SECONDS))
+        self.store.register_schema(
+            """CREATE TABLE IF NOT EXISTS image_misses (
+                name_key TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                misses INTEGER NOT NULL,
+                last_miss_at REAL NOT NULL,
+                retry_at REAL NOT NULL,
+                PRIMARY KEY (name_key, provider)
+            )""",
+        )
+
+    def retry_delay(self, misses: int) -> float:
+        """n. ardışık ıskadan sonraki bekleme süresi"""
+        return min(self.base_delay * 2 ** max(misses - 1, 0), self.max_delay)
+
+    def _blocked_providers(self, key: str) -> Set[str]:
+        rows = self.store.fetchall(
+            "SELECT provider FROM image_misses WHERE name_key = ? AND retry_at > ?",
+            (key, time.time()),
+        )
+        return {row["provider"] for row in rows}
+
+    def _record_misses(self, key: str, providers: Set[str]) -> None:
+        previous = {
+            row["provider"]: row["misses"]
+            for row in self.store.fetchall(
+                "SELECT provider, misses FROM image_misses WHERE name_key = ?", (key,)
+            )
+        }
+        now = time.time()
+        rows = []
+        for provider in providers:
+            misses = previous.get(provider, 0) + 1
+            rows.append((key, provider, misses, now, now + self.retry_delay(misses)))
+        self.store.executemany(
+            """INSERT INTO image_misses (name_key, provider, misses, last_miss_at, retry_at)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(name_key, provider) DO UPDATE SET
+                   misses = excluded.misses, last_miss_at = excluded.last_miss_at,
+                   retry_at = excluded.retry_at""",
+            rows,
+        )
+
+    def _clear(self, key: str) -> None:
+        self.store.execute("DELETE FROM image_misses WHERE name_key = ?", (key,))
+
+    async def blocked_providers(self, art_name: str) -> Set[str]:
+        """Bu eser için bekleme süresi dolmamış sağlayıcılar"""
+        try:
+            return await self.store.run(self._blocked_providers, name_key(art_name))
+        except Exception as e:
+            print(f"Görsel ıska kaydı okuma hatası: {e}")
+            return set()
+
+    async def record_misses(self, art_name: str, providers: Iterable[str]) -> None:
+        providers = set(providers)
+        if not providers:
+            return
+        try:
+            await self.store.run(self._record_misses, name_key(art_name), providers)
+        except Exception as e:
+            print(f"Görsel ıska kaydı yazma hatası: {e}")
+
+    async def clear(self, art_name: str) -> None:
+        try:
+            await self.store.run(self._clear, name_key(art_name))
+        except Exception as e:
+            print(f"Görsel ıska kaydı silme hatası: {e}")
+
+
+# Global instance
+image_miss_store = ImageMissStore(local_store)
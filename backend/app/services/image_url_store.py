@@ -0,0 +1,248 @@
+"""
+Image URL Store for ArtStoryAI
+Çözümlenmiş eser görsellerinin kalıcı tablosu
+
+Normalize eser adı -> görsel URL'si, sağlayıcı, boyutlar ve son doğrulama
+zamanı. Tablo yerel SQLite deposunda tutulur ve bellekteki bir sözlüğe
+yüklenir; get_artwork_image önce burada O(1) arar.
+
+- Tohum: features/fallback.py ve manual_artworks.py (ilk yüklemede)
+- Her başarılı çözümleme tabloya yazılır
+- Arka plan doğrulayıcısı eski kayıtları partiler halinde yeniden kontrol
+  eder; art arda DEAD_AFTER_FAILURES kez kesin hata (4xx) veren URL'ler
+  ölü sayılır ve aramalarda kullanılmaz
+"""
+
+import asyncio
+import io
+import os
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.features.fallback import FALLBACK_IMAGE_URLS
+from app.http_client import http_client
+from app.local_store import LocalStore, local_store
+from app.manual_artworks import manual_artwork_manager
+from app.single_flight import name_key
+
+PROVIDER_FALLBACK = "fallback"
+PROVIDER_MANUAL = "manual"
+
+DEFAULT_VERIFY_INTERVAL_SECONDS = 3600
+# Bu süreden eski doğrulamalar yeniden kontrol edilir
+VERIFY_MAX_AGE_SECONDS = 7 * 24 * 3600
+VERIFY_BATCH_SIZE = 50
+DEAD_AFTER_FAILURES = 3
+# Boyutları okumak için indirilen en fazla bayt (görsel başlığı)
+PROBE_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ResolvedImage:
+    """Bir eserin doğrulanmış görsel kaydı"""
+    name_key: str
+    image_url: str
+    provider: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    verified_at: float = 0.0
+    failures: int = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.failures < DEAD_AFTER_FAILURES
+
+
+def _image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Görsel başlığından (width, height); okunamazsa None"""
+    try:
+        from PIL import Image
+        with Image.open(io.BytesIO(data)) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+class ImageURLStore:
+    """Persisted name -> image URL table with an in-memory index and a link verifier"""
+
+    def __init__(self, store: LocalStore):
+        self.store = store
+        self.verify_interval = int(os.getenv("IMAGE_VERIFY_INTERVAL_SECONDS", DEFAULT_VERIFY_INTERVAL_SECONDS))
+        self._entries: Dict[str, ResolvedImage] = {}
+        self._loaded = False
+        self._verify_task: Optional[asyncio.Task] = None
+        self.store.register_schema(
+            """CREATE TABLE IF NOT EXISTS resolved_images (
+                name_key TEXT PRIMARY KEY,
+                image_url TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                width INTEGER,
+                height INTEGER,
+                verified_at REAL NOT NULL DEFAULT 0,
+                failures INTEGER NOT NULL DEFAULT 0
+            )""",
+        )
+
+    # Yükleme
+
+    @staticmethod
+    def _seed_rows() -> List[Tuple[str, str, str]]:
+        rows = []
+        for art_name, artwork in manual_artwork_manager.manual_artworks.items():
+            if artwork.get("image_url"):
+                for name in (art_name, artwork.get("title", "")):
+                    if name:
+                        rows.append((name_key(name), artwork["image_url"], PROVIDER_MANUAL))
+        for art_name, image_url in FALLBACK_IMAGE_URLS.items():
+            rows.append((name_key(art_name), image_url, PROVIDER_FALLBACK))
+        return rows
+
+    def load(self) -> None:
+        """Tohum kayıtları ekler (varsa dokunmaz) ve tabloyu belleğe alır"""
+        self.store.executemany(
+            """INSERT INTO resolved_images (name_key, image_url, provider)
+               VALUES (?, ?, ?) ON CONFLICT(name_key) DO NOTHING""",
+            self._seed_rows(),
+        )
+        rows = self.store.fetchall(
+            "SELECT name_key, image_url, provider, width, height, verified_at, failures FROM resolved_images"
+        )
+        self._entries = {row["name_key"]: ResolvedImage(**dict(row)) for row in rows}
+        self._loaded = True
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            try:
+                self.load()
+            except Exception as e:
+                print(f"Görsel URL tablosu yüklenemedi: {e}")
+                self._loaded = True
+
+    # Okuma / yazma
+
+    def get_entry(self, art_name: str) -> Optional[ResolvedImage]:
+        self._ensure_loaded()
+        return self._entries.get(name_key(art_name))
+
+    def get(self, art_name: str) -> Optional[str]:
+        """Eserin kayıtlı (ölü olmayan) görsel URL'si"""
+        entry = self.get_entry(art_name)
+        return entry.image_url if entry is not None and entry.alive else None
+
+    def alive_entries(self) -> List[ResolvedImage]:
+        self._ensure_loaded()
+        return [entry for entry in self._entries.values() if entry.alive]
+
+    def _save_many(self, entries: List[ResolvedImage]) -> None:
+        self.store.executemany(
+            """INSERT INTO resolved_images (name_key, image_url, provider, width, height, verified_at, failures)
+               VALUES (?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(name_key) DO UPDATE SET
+                   image_url = excluded.image_url, provider = excluded.provider,
+                   width = excluded.width, height = excluded.height,
+                   verified_at = excluded.verified_at, failures = excluded.failures""",
+            [(entry.name_key, entry.image_url, entry.provider, entry.width,
+              entry.height, entry.verified_at, entry.failures) for entry in entries],
+        )
+
+    async def record(self, art_name: str, image_url: str, provider: str,
+                     width: Optional[int] = None, height: Optional[int] = None) -> None:
+        """Başarılı bir çözümlemeyi kaydeder (yalnızca uzak http(s) URL'leri)"""
+        if not image_url or not image_url.startswith("http"):
+            return
+        self._ensure_loaded()
+        entry = ResolvedImage(name_key(art_name), image_url, provider, width, height, time.time(), 0)
+        self._entries[entry.name_key] = entry
+        try:
+            await self.store.run(self._save_many, [entry])
+        except Exception as e:
+            print(f"Görsel URL kaydı yazma hatası: {e}")
+
+    # Doğrulama
+
+    def due_for_verification(self, limit: int = VERIFY_BATCH_SIZE) -> List[ResolvedImage]:
+        """En eski doğrulanmış, hâlâ canlı sayılan kayıtlar"""
+        self._ensure_loaded()
+        cutoff = time.time() - VERIFY_MAX_AGE_SECONDS
+        due = [entry for entry in self._entries.values() if entry.alive and entry.verified_at < cutoff]
+        due.sort(key=lambda entry: entry.verified_at)
+        return due[:limit]
+
+    async def _check(self, entry: ResolvedImage) -> Optional[ResolvedImage]:
+        """Güncellenmiş kayıt; sonuç belirsizse (ağ hatası, 5xx) None"""
+        try:
+            async with http_client.request(
+                "default", "GET", entry.image_url, headers={"Range": f"bytes=0-{PROBE_BYTES - 1}"}
+            ) as response:
+                if 400 <= response.status < 500:
+                    # verified_at korunur: kayıt bir sonraki turda yeniden denenir
+                    return replace(entry, failures=entry.failures + 1)
+                if response.status >= 500:
+                    return None
+                size = _image_size(await response.content.read(PROBE_BYTES))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return None
+
+        width, height = size if size else (entry.width, entry.height)
+        return replace(entry, width=width, height=height, verified_at=time.time(), failures=0)
+
+    async def verify(self, entries: Iterable[ResolvedImage]) -> int:
+        """Kayıtları eşzamanlı kontrol eder; ölü bulunan kayıt sayısını döner"""
+        checked = await asyncio.gather(*(self._check(entry) for entry in entries))
+        updated = [entry for entry in checked if entry is not None]
+        for entry in updated:
+            current = self._entries.get(entry.name_key)
+            # Doğrulama sürerken yeni bir çözümleme yazıldıysa ona dokunma
+            if current is not None and current.image_url == entry.image_url:
+                self._entries[entry.name_key] = entry
+        if updated:
+            try:
+                await self.store.run(self._save_many, updated)
+            except Exception as e:
+                print(f"Görsel doğrulama kaydı yazma hatası: {e}")
+        return sum(1 for entry in updated if not entry.alive)
+
+    async def _verify_loop(self) -> None:
+        while True:
+            try:
+                batch = self.due_for_verification()
+                if batch:
+                    dead = await self.verify(batch)
+                    print(f"🔗 {len(batch)} görsel bağlantısı doğrulandı, {dead} ölü")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Görsel doğrulama hatası: {e}")
+            await asyncio.sleep(self.verify_interval)
+
+    async def start(self) -> None:
+        """Tabloyu yükler ve doğrulayıcıyı başlatır (FastAPI startup)"""
+        if not self._loaded:
+            try:
+                await self.store.run(self.load)
+            except Exception as e:
+                print(f"Görsel URL tablosu yüklenemedi: {e}")
+        if self.verify_interval > 0 and (self._verify_task is None or self._verify_task.done()):
+            self._verify_task = asyncio.create_task(self._verify_loop())
+
+    async def stop(self) -> None:
+        if self._verify_task is not None:
+            self._verify_task.cancel()
+            try:
+                await self._verify_task
+            except asyncio.CancelledError:
+                pass
+            self._verify_task = None
+
+    def stats(self) -> Dict[str, int]:
+        self._ensure_loaded()
+        alive = sum(1 for entry in self._entries.values() if entry.alive)
+        return {"entries": len(self._entries), "alive": alive, "dead": len(self._entries) - alive}
+
+
+# Global instance
+image_url_store = ImageURLStore(local_store)
@@ -0,0 +1,388 @@
+"""
+MET Catalog - Yerel MET open-access kataloğu ve ters indeks
+
+Toplu içe aktarılan MET eserleri yerel SQLite deposunda tutulur. Her eser
+için dönem, stil, müze ve kültür alanlarından normalize edilmiş terimler
+çıkarılır; filtreler canlı API yerine bu terim tablosundan, tüm koleksiyon
+üzerinde yanıtlanır. Renk terimleri görselden hesaplanır ve renk indeksi
+tarafından yazılır (bkz. services/color_index.py).
+"""
+
+import csv
+import json
+import logging
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.local_store import LocalStore, local_store
+from app.name_index import normalize_name
+
+logger = logging.getLogger(__name__)
+
+CatalogRecord = Dict[str, Any]
+
+# Filtre alanı -> indeks faseti
+FILTER_FACETS = {
+    "periods": "period",
+    "styles": "style",
+    "museums": "museum",
+    "cultures": "culture",
+    "colors": "color",
+}
+
+# Görselden türetilen faset: içe aktarmada silinmez, henüz hesaplanmadıysa filtrelenmez
+COLOR_FACET = "color"
+
+# Başlangıç yılına göre türetilen dönemler (filtre seçenekleriyle aynı adlar)
+PERIOD_RANGES: List[Tuple[str, int, int]] = [
+    ("Rönesans", 1400, 1599),
+    ("Barok", 1600, 1749),
+    ("Klasik", 1750, 1849),
+    ("Modern", 1850, 1969),
+    ("Çağdaş", 1970, 9999),
+]
+
+# Türkçe filtre değerlerinin MET verisindeki karşılıkları
+FACET_SYNONYMS: Dict[str, Dict[str, List[str]]] = {
+    "period": {
+        "ronesans": ["renaissance"],
+        "barok": ["baroque"],
+        "klasik": ["classical", "neoclassical", "neoclassicism"],
+        "modern": ["modern", "modernism"],
+        "cagdas": ["contemporary"],
+    },
+    "style": {
+        "empresyonizm": ["impressionism", "impressionist"],
+        "ekspresyonizm": ["expressionism", "expressionist"],
+        "kubizm": ["cubism", "cubist"],
+        "surrealizm": ["surrealism", "surrealist"],
+        "realizm": ["realism", "realist"],
+        "romantizm": ["romanticism", "romantic"],
+    },
+    "museum": {
+        "met": ["met museum", "metropolitan museum of art"],
+    },
+    "culture": {
+        "osmanli": ["ottoman", "turkish"],
+        "bizans": ["byzantine"],
+        "hollanda": ["dutch", "netherlandish"],
+        "avrupa": ["european", "dutch", "french", "italian", "spanish", "flemish", "german", "british"],
+        "amerikan": ["american"],
+        "japon": ["japanese"],
+        "cin": ["chinese"],
+    },
+}
+
+MET_MUSEUM_NAME = "MET Museum"
+
+
+def period_for_year(year: Optional[int]) -> Optional[str]:
+    """Yıla karşılık gelen dönem adı"""
+    if year is None:
+        return None
+    for name, start, end in PERIOD_RANGES:
+        if start <= year <= end:
+            return name
+    return None
+
+
+def facet_terms(value: str) -> Set[str]:
+    """Bir alan değerinin indeks terimleri: tam değer ve kelimeleri"""
+    key = normalize_name(value)
+    if not key:
+        return set()
+    terms = {key}
+    terms.update(word for word in key.split() if len(word) > 2)
+    return terms
+
+
+def query_terms(facet: str, values: Iterable[str]) -> Set[str]:
+    """Filtre değerlerini eş anlamlılarıyla birlikte sorgu terimlerine çevirir"""
+    synonyms = FACET_SYNONYMS.get(facet, {})
+    terms = set()
+    for value in values:
+        key = normalize_name(value)
+        if not key:
+            continue
+        terms.add(key)
+        terms.update(normalize_name(synonym) for synonym in synonyms.get(key, []))
+    return terms
+
+
+def _parse_int(value: Any) -> Optional[int]:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        match = re.search(r"-?\d{3,4}", str(value or ""))
+        return int(match.group()) if match else None
+
+
+def _truthy(value: Any) -> bool:
+    return str(value).strip().lower() in ("true", "1", "yes")
+
+
+def record_from_csv_row(row: Dict[str, str]) -> Optional[CatalogRecord]:
+    """MetObjects.csv satırını katalog kaydına çevirir"""
+    object_id = _parse_int(row.get("Object ID"))
+    if object_id is None:
+        return None
+    tags = [tag for tag in (row.get("Tags") or "").split("|") if tag]
+    return {
+        "object_id": object_id,
+        "title": row.get("Title") or "Bilinmeyen Eser",
+        "artist": row.get("Artist Display Name") or "Bilinmeyen Sanatçı",
+        "year_text": row.get("Object Date") or "",
+        "year": _parse_int(row.get("Object Begin Date")),
+        "period": row.get("Period") or "",
+        "classification": row.get("Classification") or "",
+        "culture": row.get("Culture") or "",
+        "medium": row.get("Medium") or "",
+        "dimensions": row.get("Dimensions") or "",
+        "department": row.get("Department") or "",
+        "nationality": row.get("Artist Nationality") or "",
+        "tags": tags,
+        "image_url": row.get("Primary Image") or "",
+        "description": "",
+        "is_public_domain": _truthy(row.get("Is Public Domain")),
+    }
+
+
+def record_from_api_object(obj: Dict[str, Any]) -> Optional[CatalogRecord]:
+    """MET /objects yanıtını (JSON dökümü) katalog kaydına çevirir"""
+    object_id = _parse_int(obj.get("objectID"))
+    if object_id is None:
+        return None
+    tags = [tag.get("term") for tag in (obj.get("tags") or []) if isinstance(tag, dict) and tag.get("term")]
+    return {
+        "object_id": object_id,
+        "title": obj.get("title") or "Bilinmeyen Eser",
+        "artist": obj.get("artistDisplayName") or "Bilinmeyen Sanatçı",
+        "year_text": obj.get("objectDate") or "",
+        "year": _parse_int(obj.get("objectBeginDate")),
+        "period": obj.get("period") or "",
+        "classification": obj.get("classification") or "",
+        "culture": obj.get("culture") or "",
+        "medium": obj.get("medium") or "",
+        "dimensions": obj.get("dimensions") or "",
+        "department": obj.get("department") or "",
+        "nationality": obj.get("artistNationality") or "",
+        "tags": tags,
+        "image_url": obj.get("primaryImage") or "",
+        "description": obj.get("objectDescription") or "",
+        "is_public_domain": bool(obj.get("isPublicDomain")),
+    }
+
+
+def read_dump(path: str) -> Iterator[CatalogRecord]:
+    """CSV, JSON veya JSON Lines MET dökümünü kayıt kayıt okur"""
+    lower = path.lower()
+    if lower.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                record = record_from_csv_row(row)
+                if record:
+                    yield record
+        return
+
+    with open(path, encoding="utf-8") as f:
+        if lower.endswith((".jsonl", ".ndjson")):
+            objects: Iterable[Dict] = (json.loads(line) for line in f if line.strip())
+        else:
+            data = json.load(f)
+            objects = data.get("objects", []) if isinstance(data, dict) else data
+        for obj in objects:
+            record = record_from_api_object(obj)
+            if record:
+                yield record
+
+
+class METCatalog:
+    """Yerel MET kataloğu ve fasetli ters indeks"""
+
+    def __init__(self, store: LocalStore):
+        self.store = store
+        self.store.register_schema(
+            """CREATE TABLE IF NOT EXISTS met_catalog (
+                object_id INTEGER PRIMARY KEY,
+                has_image INTEGER NOT NULL,
+                year INTEGER,
+                data TEXT NOT NULL
+            )""",
+            """CREATE TABLE IF NOT EXISTS met_catalog_terms (
+                facet TEXT NOT NULL,
+                term TEXT NOT NULL,
+                object_id INTEGER NOT NULL,
+                PRIMARY KEY (facet, term, object_id)
+            ) WITHOUT ROWID""",
+            "CREATE INDEX IF NOT EXISTS ix_met_catalog_terms_object ON met_catalog_terms (object_id)",
+        )
+
+    @staticmethod
+    def to_artwork(record: CatalogRecord) -> Dict:
+        """Katalog kaydını API eser formatına çevirir (METMuseumService.parse_artwork ile aynı)"""
+        derived_period = period_for_year(record.get("year"))
+        return {
+            "id": str(record["object_id"]),
+            "title": record["title"],
+            "artist": record["artist"],
+            "year": record.get("year_text") or "Bilinmeyen Tarih",
+            "period": record.get("period") or derived_period or "Bilinmeyen Dönem",
+            "style": record.get("classification") or "Bilinmeyen Stil",
+            "museum": MET_MUSEUM_NAME,
+            "imageUrl": record.get("image_url", ""),
+            "description": record.get("description") or "Açıklama bulunamadı",
+            "culture": record.get("culture", ""),
+            "medium": record.get("medium", ""),
+            "dimensions": record.get("dimensions", "")
+        }
+
+    @staticmethod
+    def terms_for(record: CatalogRecord) -> Set[Tuple[str, str]]:
+        """Bir kaydın (faset, terim) çiftleri"""
+        terms: Set[Tuple[str, str]] = set()
+
+        period_values = [record.get("period", "")]
+        derived_period = period_for_year(record.get("year"))
+        if derived_period:
+            period_values.append(derived_period)
+        for value in period_values:
+            terms.update(("period", term) for term in facet_terms(value))
+
+        for value in [record.get("classification", ""), *record.get("tags", [])]:
+            terms.update(("style", term) for term in facet_terms(value))
+        terms.update(("museum", term) for term in facet_terms(MET_MUSEUM_NAME))
+        terms.update(("museum", term) for term in facet_terms("Metropolitan Museum of Art"))
+        for value in (record.get("culture", ""), record.get("nationality", "")):
+            terms.update(("culture", term) for term in facet_terms(value))
+        return terms
+
+    # Yazma (içe aktarma betiği tarafından, senkron)
+
+    def ingest(self, records: Iterable[CatalogRecord]) -> int:
+        """Kayıtları kataloğa ve indekse yazar (aynı ID'ler güncellenir)"""
+        records = list(records)
+        if not records:
+            return 0
+        object_ids = [(record["object_id"],) for record in records]
+        self.store.executemany(
+            "DELETE FROM met_catalog_terms WHERE object_id = ? AND facet != ?",
+            [(object_id, COLOR_FACET) for (object_id,) in object_ids],
+        )
+        self.store.executemany(
+            """INSERT INTO met_catalog (object_id, has_image, year, data) VALUES (?, ?, ?, ?)
+               ON CONFLICT(object_id) DO UPDATE SET
+                   has_image = excluded.has_image, year = excluded.year, data = excluded.data""",
+            [
+                (
+                    record["object_id"],
+                    1 if record.get("image_url") else 0,
+                    record.get("year"),
+                    json.dumps(self.to_artwork(record), ensure_ascii=False),
+                )
+                for record in records
+            ],
+        )
+        self.store.executemany(
+            "INSERT OR IGNORE INTO met_catalog_terms (facet, term, object_id) VALUES (?, ?, ?)",
+            [
+                (facet, term, record["object_id"])
+                for record in records
+                for facet, term in self.terms_for(record)
+            ],
+        )
+        return len(records)
+
+    def set_image(self, object_id: int, image_url: str) -> None:
+        """Sonradan bulunan görsel URL'sini kataloğa işler"""
+        row = self.store.fetchone("SELECT data FROM met_catalog WHERE object_id = ?", (object_id,))
+        if row is None:
+            return
+        artwork = json.loads(row["data"])
+        artwork["imageUrl"] = image_url
+        self.store.execute(
+            "UPDATE met_catalog SET has_image = ?, data = ? WHERE object_id = ?",
+            (1 if image_url else 0, json.dumps(artwork, ensure_ascii=False), object_id),
+        )
+
+    def set_colors(self, colors: Iterable[Tuple[int, Iterable[str]]]) -> None:
+        """Eserlerin renk etiketlerini (ör. "Sıcak", "Pastel") indekse yazar"""
+        colors = [(object_id, list(labels)) for object_id, labels in colors]
+        self.store.executemany(
+            "DELETE FROM met_catalog_terms WHERE facet = ? AND object_id = ?",
+            [(COLOR_FACET, object_id) for object_id, _ in colors],
+        )
+        self.store.executemany(
+            "INSERT OR IGNORE INTO met_catalog_terms (facet, term, object_id) VALUES (?, ?, ?)",
+            [
+                (COLOR_FACET, normalize_name(label), object_id)
+                for object_id, labels in colors
+                for label in labels
+            ],
+        )
+
+    # Okuma
+
+    def image_urls(self) -> List[Tuple[int, str]]:
+        """Görseli olan eserlerin (object_id, görsel URL'si) çiftleri"""
+        rows = self.store.fetchall("SELECT object_id, data FROM met_catalog WHERE has_image = 1 ORDER BY object_id")
+        return [(row["object_id"], json.loads(row["data"]).get("imageUrl", "")) for row in rows]
+
+    def _has_terms(self, facet: str) -> bool:
+        return self.store.fetchone("SELECT 1 FROM met_catalog_terms WHERE facet = ? LIMIT 1", (facet,)) is not None
+
+    def count(self) -> int:
+        row = self.store.fetchone("SELECT COUNT(*) AS n FROM met_catalog")
+        return row["n"] if row else 0
+
+    def is_available(self) -> bool:
+        """Katalog içe aktarılmış mı"""
+        try:
+            return self.store.fetchone("SELECT 1 FROM met_catalog LIMIT 1") is not None
+        except Exception as e:
+            logger.warning(f"MET catalog unavailable: {e}")
+            return False
+
+    def _matching_query(self, filters: Dict) -> Tuple[Optional[str], List[Any]]:
+        """Filtrelerin kesişimini veren alt sorgu; filtre yoksa (None, [])"""
+        clauses = []
+        params: List[Any] = []
+        for filter_name, facet in FILTER_FACETS.items():
+            values = filters.get(filter_name)
+            if not values:
+                continue
+            if facet == COLOR_FACET and not self._has_terms(facet):
+                continue
+            terms = sorted(query_terms(facet, values))
+            if not terms:
+                continue
+            placeholders = ", ".join("?" for _ in terms)
+            clauses.append(
+                f"SELECT object_id FROM met_catalog_terms WHERE facet = ? AND term IN ({placeholders})"
+            )
+            params.extend([facet, *terms])
+        if not clauses:
+            return None, []
+        return " INTERSECT ".join(clauses), params
+
+    def search(self, filters: Dict, limit: int = 50, offset: int = 0) -> Tuple[List[Dict], int]:
+        """Filtrelere uyan eserler (görseli olanlar önce) ve toplam eşleşme sayısı"""
+        subquery, params = self._matching_query(filters)
+        where = f"WHERE object_id IN ({subquery})" if subquery else ""
+        total_row = self.store.fetchone(f"SELECT COUNT(*) AS n FROM met_catalog {where}", params)
+        rows = self.store.fetchall(
+            f"""SELECT data FROM met_catalog {where}
+                ORDER BY has_image DESC, object_id
+                LIMIT ? OFFSET ?""",
+            [*params, limit, offset],
+        )
+        return [json.loads(row["data"]) for row in rows], (total_row["n"] if total_row else 0)
+
+    async def search_async(self, filters: Dict, limit: int = 50, offset: int = 0) -> Tuple[List[Dict], int]:
+        return await self.store.run(self.search, filters, limit, offset)
+
+    async def is_available_async(self) -> bool:
+        return await self.store.run(self.is_available)
+
+
+# Global instance
+met_catalog = METCatalog(local_store)
@@ -0,0 +1,255 @@
+"""
+Perceptual Hash Index for ArtStoryAI
+Katalog görsellerinin pHash indeksi: yüklenen görselin bilinen bir eser
+olup olmadığı vision modeline gitmeden, milisaniyeler içinde anlaşılır
+
+- Kaynaklar: eser sayfası manuel görselleri (public/artworks), filtre
+  görselleri (manual_images) ve çözümlenmiş görsel tablosundaki canlı
+  URL'ler (görsel proxy'sinin disk önbelleği üzerinden bir kez indirilir)
+- Hash'ler yerel SQLite deposunda kaynak parmak iziyle (dosyada boyut ve
+  mtime, URL kaydında URL'nin kendisi) saklanır; yalnızca değişen kaynaklar
+  süreç havuzunda yeniden hash'lenir
+- Arama BK-tree üzerinde Hamming uzaklığıyla yapılır
+"""
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app import image_processing
+from app.bk_tree import BKTree
+from app.image_proxy import image_proxy
+from app.local_store import LocalStore, local_store
+from app.manual_artworks import manual_artwork_manager
+from app.manual_asset_catalog import ManualAsset, artwork_image_catalog, filter_image_catalog
+from app.services.content_store import artwork_content_store
+from app.services.image_url_store import ResolvedImage, image_url_store
+
+# 64 bitten en fazla bu kadarı farklıysa aynı eser sayılır
+DEFAULT_MATCH_DISTANCE = 8
+DEFAULT_SYNC_INTERVAL_SECONDS = 6 * 3600
+HASH_CONCURRENCY = 4
+
+CATALOG_ARTWORK = "artwork_image"
+CATALOG_FILTER = "filter_image"
+CATALOG_RESOLVED = "resolved_image"
+
+
+@dataclass
+class _Source:
+    """Hash'lenecek bir katalog görseli"""
+    key: str
+    fingerprint: str
+    location: str
+    record: Dict[str, Any] = field(default_factory=dict)
+    # Uzak kaynaklar proxy önbelleği üzerinden yerel dosyaya çevrilir
+    remote: bool = False
+
+
+def _record(artwork_name: str, data: Dict[str, Any], image_url: str, catalog: str) -> Dict[str, Any]:
+    return {
+        "artwork_name": artwork_name,
+        "artist": data.get("artist") or "Bilinmeyen Sanatçı",
+        "year": data.get("year") or "Bilinmeyen",
+        "movement": data.get("movement") or data.get("period") or data.get("style") or "Bilinmeyen",
+        "description": data.get("description") or "",
+        "image_url": image_url,
+        "catalog": catalog,
+    }
+
+
+class PerceptualHashIndex:
+    """Persisted pHash table with an in-memory BK-tree for near-duplicate lookups"""
+
+    def __init__(self, store: LocalStore):
+        self.store = store
+        self.max_distance = int(os.getenv("PHASH_MATCH_DISTANCE", DEFAULT_MATCH_DISTANCE))
+        self.sync_interval = int(os.getenv("PHASH_SYNC_INTERVAL_SECONDS", DEFAULT_SYNC_INTERVAL_SECONDS))
+        self._tree: BKTree[Dict[str, Any]] = BKTree()
+        self._sync_task: Optional[asyncio.Task] = None
+        self.store.register_schema(
+            """CREATE TABLE IF NOT EXISTS image_hashes (
+                source TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                phash TEXT NOT NULL,
+                record TEXT NOT NULL,
+                hashed_at REAL NOT NULL
+            )""",
+        )
+
+    # Kaynaklar
+
+    @staticmethod
+    def _asset_source(asset: ManualAsset, catalog: str) -> _Source:
+        if catalog == CATALOG_ARTWORK:
+            data = manual_artwork_manager.get_manual_artwork(asset.name) or asset.metadata
+            name = data.get("title") or asset.name
+            image_url = f"/manual-images/{asset.name}"
+        else:
+            data = asset.metadata
+            name = data.get("title") or asset.stem.replace("_", " ").title()
+            image_url = f"/manual_images/{asset.filename}"
+        return _Source(
+            key=f"{catalog}:{asset.path}",
+            fingerprint=f"{asset.size}:{asset.mtime_ns}",
+            location=str(asset.path),
+            record=_record(name, data, image_url, catalog),
+        )
+
+    @staticmethod
+    def _resolved_source(entry: ResolvedImage) -> _Source:
+        return _Source(
+            key=f"{CATALOG_RESOLVED}:{entry.name_key}",
+            fingerprint=entry.image_url,
+            location=entry.image_url,
+            record={"name_key": entry.name_key, "provider": entry.provider},
+            remote=True,
+        )
+
+    def _sources(self) -> List[_Source]:
+        sources = [self._asset_source(asset, CATALOG_ARTWORK) for asset in artwork_image_catalog.all_assets()]
+        sources += [self._asset_source(asset, CATALOG_FILTER) for asset in filter_image_catalog.all_assets()]
+        sources += [self._resolved_source(entry) for entry in image_url_store.alive_entries()]
+        return sources
+
+    @staticmethod
+    async def _resolved_record(source: _Source) -> Dict[str, Any]:
+        """Çözümlenmiş görselin eser bilgisi: manuel kayıt, yoksa kayıtlı içerik (üretim yapılmaz)"""
+        name_key = source.record["name_key"]
+        data = manual_artwork_manager.get_manual_artwork(name_key)
+        if data is None:
+            data = await artwork_content_store.get(name_key) or {}
+        name = data.get("title") or data.get("art_name") or name_key.title()
+        return _record(name, data, source.location, CATALOG_RESOLVED)
+
+    async def _hash_source(self, source: _Source, semaphore: asyncio.Semaphore) -> Optional[Tuple]:
+        async with semaphore:
+            try:
+                if source.remote:
+                    path = str(await image_proxy.original(source.location))
+                    record = await self._resolved_record(source)
+                else:
+                    path, record = source.location, source.record
+                phash = await image_processing.run(image_processing.hash_file, path)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"pHash hesaplanamadı ({source.location}): {e}")
+                return None
+        return (source.key, source.fingerprint, f"{phash:016x}", json.dumps(record, ensure_ascii=False), time.time())
+
+    # Depo
+
+    def _load_rows(self) -> Dict[str, Tuple[str, str, str]]:
+        rows = self.store.fetchall("SELECT source, fingerprint, phash, record FROM image_hashes")
+        return {row["source"]: (row["fingerprint"], row["phash"], row["record"]) for row in rows}
+
+    def _save_rows(self, rows: List[Tuple], removed: List[str]) -> None:
+        self.store.executemany(
+            """INSERT INTO image_hashes (source, fingerprint, phash, record, hashed_at)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(source) DO UPDATE SET
+                   fingerprint = excluded.fingerprint, phash = excluded.phash,
+                   record = excluded.record, hashed_at = excluded.hashed_at""",
+            rows,
+        )
+        self.store.executemany("DELETE FROM image_hashes WHERE source = ?", [(key,) for key in removed])
+
+    def _build_tree(self, rows: Dict[str, Tuple[str, str, str]]) -> None:
+        tree: BKTree[Dict[str, Any]] = BKTree()
+        for _, phash, record in rows.values():
+            tree.add(int(phash, 16), json.loads(record))
+        self._tree = tree
+
+    # İndeksleme
+
+    async def sync(self) -> int:
+        """Değişen kaynakları hash'ler, kaldırılanları siler; hash'lenen kaynak sayısını döner"""
+        rows = await self.store.run(self._load_rows)
+        sources = {source.key: source for source in self._sources()}
+        # Önce mevcut hash'lerle aranabilir hale gel
+        self._build_tree({key: row for key, row in rows.items() if key in sources})
+
+        stale = [source for key, source in sources.items()
+                 if key not in rows or rows[key][0] != source.fingerprint]
+        removed = [key for key in rows if key not in sources]
+        semaphore = asyncio.Semaphore(HASH_CONCURRENCY)
+        hashed = [row for row in await asyncio.gather(*(self._hash_source(source, semaphore) for source in stale))
+                  if row is not None]
+        if not hashed and not removed:
+            return 0
+
+        await self.store.run(self._save_rows, hashed, removed)
+        for key in removed:
+            rows.pop(key)
+        for key, fingerprint, phash, record, _ in hashed:
+            rows[key] = (fingerprint, phash, record)
+        self._build_tree(rows)
+        return len(hashed)
+
+    async def _sync_loop(self) -> None:
+        while True:
+            try:
+                hashed = await self.sync()
+                if hashed:
+                    print(f"🖼️ {hashed} katalog görseli hash'lendi ({len(self._tree)} kayıt)")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"pHash indeksi güncelleme hatası: {e}")
+            if self.sync_interval <= 0:
+                return
+            await asyncio.sleep(self.sync_interval)
+
+    async def start(self) -> None:
+        """İndeksi arka planda oluşturur ve periyodik olarak günceller (FastAPI startup)"""
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+
+    # Arama
+
+    def lookup(self, phash: int) -> Optional[Dict[str, Any]]:
+        """Eşik içindeki en yakın katalog kaydı, uzaklığıyla birlikte"""
+        match = self._tree.nearest(phash, self.max_distance)
+        if match is None:
+            return None
+        distance, record = match
+        return {**record, "distance": distance}
+
+    def match_analysis(self, phash: int) -> Optional[Dict[str, Any]]:
+        """Yakın kopya bulunursa vision analizi biçiminde katalog kaydı"""
+        match = self.lookup(phash)
+        if match is None:
+            return None
+        return {
+            "artwork_name": match["artwork_name"],
+            "artist": match["artist"],
+            "year": match["year"],
+            "movement": match["movement"],
+            "description": match["description"],
+            "confidence": round(1 - match["distance"] / 64, 2),
+            "catalog_match": {
+                "catalog": match["catalog"],
+                "image_url": match["image_url"],
+                "distance": match["distance"],
+            },
+        }
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._tree), "max_distance": self.max_distance}
+
+
+# Global instance
+phash_index = PerceptualHashIndex(local_store)
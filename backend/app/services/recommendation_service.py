@@ -9,8 +9,10 @@ This service provides intelligent artwork recommendations based on:
 - User preferences
 """
 
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Hashable, Optional, Tuple
+import re
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import logging
@@ -99,6 +101,11 @@ class ArtworkSimilarityCalculator:
     
     def _is_same_artist(self, artist1: str, artist2: str) -> bool:
         """Check if two artist names refer to the same person"""
+        canonical1 = self.canonical_artist(artist1)
+        return canonical1 is not None and canonical1 == self.canonical_artist(artist2)
+    
+    def canonical_artist(self, artist: str) -> Optional[str]:
+        """Resolve a known artist alias to its main name"""
         # Common variations
         variations = {
             'leonardo da vinci': ['leonardo', 'da vinci', 'vinci'],
@@ -108,12 +115,20 @@ class ArtworkSimilarityCalculator:
             'salvador dali': ['dali'],
         }
         
+        artist_lower = artist.lower()
         for main_name, aliases in variations.items():
-            if (artist1.lower() in [main_name] + aliases and 
-                artist2.lower() in [main_name] + aliases):
-                return True
+            if artist_lower in [main_name] + aliases:
+                return main_name
         
-        return False
+        return None
+    
+    def movement_group(self, movement: str) -> Optional[int]:
+        """Index of the related-movement group a movement belongs to"""
+        movement_lower = movement.lower()
+        for i, group in enumerate(self._get_related_movements()):
+            if movement_lower in group:
+                return i
+        return None
     
     def _get_related_movements(self) -> List[List[str]]:
         """Get groups of related art movements"""
@@ -126,11 +141,225 @@ class ArtworkSimilarityCalculator:
         ]
 
 
+class ThemeIndex:
+    """
+    Corpus-level TF-IDF index over artwork stories
+
+    The vectorizer is fitted once over every story in the catalog. Rows are
+    L2-normalized, so the cosine similarity of one artwork against the whole
+    corpus is a single sparse matrix-vector product.
+    """
+    
+    def __init__(self):
+        self.vectorizer = TfidfVectorizer(
+            max_features=1000,
+            stop_words='english',
+            ngram_range=(1, 2)
+        )
+        self.matrix: Optional[sparse.csr_matrix] = None
+        self.size = 0
+        self.positions: Dict[str, int] = {}
+        self.fingerprint: Optional[Hashable] = None
+    
+    @staticmethod
+    def corpus_fingerprint(artworks: List[Dict]) -> int:
+        """Cheap change detector for the indexed corpus"""
+        return hash(tuple(
+            (artwork.get('art_name', ''), artwork.get('story', '') or '')
+            for artwork in artworks
+        ))
+    
+    def build(self, artworks: List[Dict], fingerprint: Optional[Hashable] = None) -> None:
+        """(Re)build the index over the given artworks"""
+        stories = [artwork.get('story', '') or '' for artwork in artworks]
+        self.size = len(artworks)
+        self.positions = {}
+        for i, artwork in enumerate(artworks):
+            self.positions.setdefault(artwork.get('art_name', ''), i)
+        try:
+            self.matrix = self.vectorizer.fit_transform(stories).tocsr()
+        except ValueError:
+            # Empty vocabulary (no usable story text)
+            self.matrix = None
+        self.fingerprint = (
+            fingerprint if fingerprint is not None else self.corpus_fingerprint(artworks)
+        )
+        logger.info(f"Theme index built over {len(artworks)} artworks")
+    
+    def ensure(self, artworks: List[Dict], fingerprint: Optional[Hashable] = None) -> None:
+        """Rebuild the index only when the corpus has changed"""
+        if fingerprint is None:
+            fingerprint = self.corpus_fingerprint(artworks)
+        if fingerprint != self.fingerprint:
+            self.build(artworks, fingerprint)
+    
+    def query_vector(self, artwork: Dict) -> Optional[sparse.csr_matrix]:
+        """TF-IDF row for an artwork (indexed row or transformed story)"""
+        if self.matrix is None:
+            return None
+        position = self.positions.get(artwork.get('art_name', ''))
+        if position is not None:
+            return self.matrix[position]
+        story = artwork.get('story', '') or ''
+        if not story:
+            return None
+        return self.vectorizer.transform([story])
+    
+    def similarities(self, artwork: Dict) -> np.ndarray:
+        """Cosine similarity of the artwork against every indexed artwork"""
+        vector = self.query_vector(artwork)
+        if vector is None:
+            return np.zeros(self.size)
+        return np.asarray((self.matrix @ vector.T).todense()).ravel()
+
+
+def parse_year(value) -> float:
+    """First 3-4 digit year in a value ("1503-1519" -> 1503), NaN if none"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value) if value else np.nan
+    match = re.search(r'\d{3,4}', str(value or ''))
+    return float(match.group()) if match else np.nan
+
+
+class ArtworkFeatureMatrix:
+    """
+    Columnar encoding of the catalog for vectorized scoring
+
+    Artist, period, movement and theme signals are precomputed as arrays so
+    that scoring a target against every candidate is a handful of NumPy
+    expressions instead of a Python loop over pairs.
+    """
+    
+    MISSING = -1
+    UNKNOWN = -2
+    
+    def __init__(self, similarity_calculator: ArtworkSimilarityCalculator):
+        self.calculator = similarity_calculator
+        self.theme_index = ThemeIndex()
+        self.artworks: List[Dict] = []
+        self.fingerprint: Optional[Hashable] = None
+        self._vocab: Dict[str, Dict[str, int]] = {}
+        self.artist_ids = np.array([], dtype=np.int32)
+        self.canonical_artist_ids = np.array([], dtype=np.int32)
+        self.years = np.array([], dtype=np.float64)
+        self.movement_ids = np.array([], dtype=np.int32)
+        self.movement_group_ids = np.array([], dtype=np.int32)
+        self.names = np.array([], dtype=object)
+    
+    @staticmethod
+    def corpus_fingerprint(artworks: List[Dict]) -> int:
+        """Cheap change detector for every encoded field"""
+        return hash(tuple(
+            (
+                artwork.get('art_name', ''),
+                str(artwork.get('artist', '')),
+                str(artwork.get('year', '')),
+                str(artwork.get('movement', '')),
+                artwork.get('story', '') or '',
+            )
+            for artwork in artworks
+        ))
+    
+    def _encode_value(self, column: str, value: Optional[str], grow: bool) -> int:
+        if not value:
+            return self.MISSING
+        vocab = self._vocab.setdefault(column, {})
+        if value not in vocab:
+            if not grow:
+                return self.UNKNOWN
+            vocab[value] = len(vocab)
+        return vocab[value]
+    
+    def _encode(self, artwork: Dict, grow: bool) -> Tuple[int, int, float, int, int]:
+        artist = str(artwork.get('artist', '') or '').lower()
+        movement = str(artwork.get('movement', '') or '').lower()
+        canonical = self.calculator.canonical_artist(artist) if artist else None
+        group = self.calculator.movement_group(movement) if movement else None
+        return (
+            self._encode_value('artist', artist, grow),
+            self._encode_value('canonical_artist', canonical, grow),
+            parse_year(artwork.get('year')),
+            self._encode_value('movement', movement, grow),
+            self.MISSING if group is None else group,
+        )
+    
+    def build(self, artworks: List[Dict], fingerprint: Optional[Hashable] = None) -> None:
+        """Encode all artworks into columnar arrays"""
+        if fingerprint is None:
+            fingerprint = self.corpus_fingerprint(artworks)
+        self._vocab = {}
+        rows = [self._encode(artwork, grow=True) for artwork in artworks]
+        columns = list(zip(*rows)) if rows else [(), (), (), (), ()]
+        self.artist_ids = np.array(columns[0], dtype=np.int32)
+        self.canonical_artist_ids = np.array(columns[1], dtype=np.int32)
+        self.years = np.array(columns[2], dtype=np.float64)
+        self.movement_ids = np.array(columns[3], dtype=np.int32)
+        self.movement_group_ids = np.array(columns[4], dtype=np.int32)
+        self.names = np.array([artwork.get('art_name') for artwork in artworks], dtype=object)
+        self.theme_index.build(artworks, fingerprint)
+        self.artworks = list(artworks)
+        self.fingerprint = fingerprint
+    
+    def ensure(self, artworks: List[Dict], fingerprint: Optional[Hashable] = None) -> None:
+        """Rebuild the encoding only when the catalog has changed"""
+        if fingerprint is None:
+            # Catalog snapshots carry a version, so no need to hash the corpus
+            version = getattr(artworks, 'version', None)
+            if version is not None:
+                fingerprint = ('catalog', version)
+            else:
+                fingerprint = self.corpus_fingerprint(artworks)
+        if fingerprint != self.fingerprint:
+            self.build(artworks, fingerprint)
+    
+    def signals(self, target: Dict) -> Dict[str, np.ndarray]:
+        """Per-signal similarity of the target against every artwork"""
+        artist_id, canonical_id, year, movement_id, group_id = self._encode(target, grow=False)
+        
+        same_artist = (self.artist_ids == artist_id) & (artist_id >= 0)
+        same_canonical = (self.canonical_artist_ids == canonical_id) & (canonical_id >= 0)
+        artist = np.where(same_artist, 1.0, np.where(same_canonical, 0.9, 0.0))
+        
+        with np.errstate(invalid='ignore'):
+            year_diff = np.abs(self.years - year)
+        period = np.select(
+            [year_diff <= 10, year_diff <= 100, year_diff <= 1000, ~np.isnan(year_diff)],
+            [0.9, 0.7, 0.3, 0.1],
+            default=0.0
+        )
+        
+        same_movement = (self.movement_ids == movement_id) & (movement_id >= 0)
+        same_group = (self.movement_group_ids == group_id) & (group_id >= 0)
+        movement = np.where(same_movement, 1.0, np.where(same_group, 0.8, 0.0))
+        
+        return {
+            'artist': artist,
+            'period': period,
+            'movement': movement,
+            'theme': self.theme_index.similarities(target),
+            'year_diff': year_diff,
+            'same_artist': same_artist,
+            'same_movement': same_movement,
+        }
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, via argpartition"""
+    if k <= 0 or scores.size == 0:
+        return np.array([], dtype=int)
+    if k < scores.size:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.size)
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
 class RecommendationEngine:
     """Main recommendation engine for artworks"""
     
     def __init__(self):
         self.similarity_calculator = ArtworkSimilarityCalculator()
+        self.features = ArtworkFeatureMatrix(self.similarity_calculator)
         self.weights = {
             'artist': 0.4,      # Artist similarity weight
             'period': 0.2,      # Period similarity weight
@@ -138,6 +367,26 @@ class RecommendationEngine:
             'theme': 0.15       # Theme similarity weight
         }
     
+    @property
+    def theme_index(self) -> ThemeIndex:
+        return self.features.theme_index
+    
+    def score_artworks(
+        self, 
+        target_artwork: Dict, 
+        all_artworks: List[Dict]
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Weighted similarity of the target against every artwork at once"""
+        self.features.ensure(all_artworks)
+        signals = self.features.signals(target_artwork)
+        scores = (
+            signals['artist'] * self.weights['artist'] +
+            signals['period'] * self.weights['period'] +
+            signals['movement'] * self.weights['movement'] +
+            signals['theme'] * self.weights['theme']
+        )
+        return np.round(scores, 3), signals
+    
     def get_similar_artworks(
         self, 
         target_artwork: Dict, 
@@ -156,38 +405,25 @@ class RecommendationEngine:
             List of recommended artworks with similarity scores
         """
         try:
-            recommendations = []
+            scores, signals = self.score_artworks(target_artwork, all_artworks)
             
-            for artwork in all_artworks:
-                # Skip the target artwork itself
-                if artwork.get('art_name') == target_artwork.get('art_name'):
-                    continue
-                
-                # Calculate overall similarity score
-                similarity_score = self._calculate_overall_similarity(
-                    target_artwork, artwork
-                )
-                
-                # Debug log
-                print(f"🔍 Similarity: {artwork.get('art_name')} -> {similarity_score}")
-                
-                if similarity_score > 0.01:  # Minimum similarity threshold (düşürüldü)
-                    recommendations.append({
-                        'artwork': artwork,
-                        'similarity_score': similarity_score,
-                        'similarity_reasons': self._get_similarity_reasons(
-                            target_artwork, artwork
-                        )
-                    })
+            # Skip the target artwork itself
+            target_name = target_artwork.get('art_name')
+            scores[self.features.names == target_name] = 0.0
             
-            # Sort by similarity score (highest first)
-            recommendations.sort(
-                key=lambda x: x['similarity_score'], 
-                reverse=True
-            )
+            # Minimum similarity threshold
+            scores[scores <= 0.01] = 0.0
+            recommendations = []
+            for i in top_k_indices(scores, limit):
+                if scores[i] <= 0.0:
+                    break
+                recommendations.append({
+                    'artwork': self.features.artworks[i],
+                    'similarity_score': float(scores[i]),
+                    'similarity_reasons': self._reasons_from_signals(signals, i)
+                })
             
-            # Return top recommendations
-            return recommendations[:limit]
+            return recommendations
             
         except Exception as e:
             logger.error(f"Recommendation generation error: {e}")
@@ -201,18 +437,11 @@ class RecommendationEngine:
     ) -> List[Dict]:
         """Get recommendations for other artworks by the same artist"""
         try:
-            artist_artworks = [
-                artwork for artwork in all_artworks 
-                if artwork.get('artist', '').lower() == artist_name.lower()
-            ]
+            self.features.ensure(all_artworks)
+            signals = self.features.signals({'artist': artist_name})
             
             # Sort by year (most recent first)
-            artist_artworks.sort(
-                key=lambda x: x.get('year', 0), 
-                reverse=True
-            )
-            
-            return artist_artworks[:limit]
+            return self._rank(signals['same_artist'], self._years_descending(), limit)
             
         except Exception as e:
             logger.error(f"Artist recommendation error: {e}")
@@ -226,104 +455,58 @@ class RecommendationEngine:
     ) -> List[Dict]:
         """Get recommendations for artworks from the same period"""
         try:
-            period_artworks = []
-            
-            for artwork in all_artworks:
-                artwork_year = artwork.get('year', 0)
-                if artwork_year and abs(artwork_year - year) <= 50:  # 50 year window
-                    period_artworks.append(artwork)
-            
-            # Sort by year similarity
-            period_artworks.sort(
-                key=lambda x: abs(x.get('year', 0) - year)
-            )
+            self.features.ensure(all_artworks)
+            year_diff = self.features.signals({'year': year})['year_diff']
             
-            return period_artworks[:limit]
+            # 50 year window, sorted by year similarity
+            with np.errstate(invalid='ignore'):
+                in_period = year_diff <= 50
+            return self._rank(in_period, year_diff, limit)
             
         except Exception as e:
             logger.error(f"Period recommendation error: {e}")
             return []
     
-    def _calculate_overall_similarity(
+    def get_movement_recommendations(
         self, 
-        artwork1: Dict, 
-        artwork2: Dict
-    ) -> float:
-        """Calculate overall similarity score between two artworks"""
+        movement_name: str, 
+        all_artworks: List[Dict], 
+        limit: int = 5
+    ) -> List[Dict]:
+        """Get recommendations for artworks from the same art movement"""
         try:
-            # Artist similarity
-            artist_sim = self.similarity_calculator.calculate_artist_similarity(
-                artwork1.get('artist', ''),
-                artwork2.get('artist', '')
-            )
-            
-            # Period similarity
-            period_sim = self.similarity_calculator.calculate_period_similarity(
-                artwork1.get('year', 0),
-                artwork2.get('year', 0)
-            )
-            
-            # Movement similarity
-            movement_sim = self.similarity_calculator.calculate_movement_similarity(
-                artwork1.get('movement', ''),
-                artwork2.get('movement', '')
-            )
-            
-            # Theme similarity (using story/description)
-            theme_sim = self.similarity_calculator.calculate_text_similarity(
-                artwork1.get('story', ''),
-                artwork2.get('story', '')
-            )
+            self.features.ensure(all_artworks)
+            signals = self.features.signals({'movement': movement_name})
             
-            # Weighted average
-            overall_score = (
-                artist_sim * self.weights['artist'] +
-                period_sim * self.weights['period'] +
-                movement_sim * self.weights['movement'] +
-                theme_sim * self.weights['theme']
-            )
-            
-            # Debug log
-            print(f"🔍 Similarity breakdown: artist={artist_sim}, period={period_sim}, movement={movement_sim}, theme={theme_sim} -> overall={overall_score}")
-            
-            return round(overall_score, 3)
+            # Sort by year (most recent first)
+            return self._rank(signals['same_movement'], self._years_descending(), limit)
             
         except Exception as e:
-            logger.error(f"Overall similarity calculation error: {e}")
-            return 0.0
+            logger.error(f"Movement recommendation error: {e}")
+            return []
     
-    def _get_similarity_reasons(
-        self, 
-        artwork1: Dict, 
-        artwork2: Dict
-    ) -> List[str]:
-        """Get reasons why two artworks are similar"""
+    def _years_descending(self) -> np.ndarray:
+        """Sort key for most-recent-first ordering, unknown years last"""
+        years = self.features.years
+        return np.where(np.isnan(years), np.inf, -years)
+    
+    def _rank(self, mask: np.ndarray, keys: np.ndarray, limit: int) -> List[Dict]:
+        """Artworks selected by mask, ordered by ascending key"""
+        candidates = np.flatnonzero(mask)
+        order = candidates[np.argsort(keys[candidates], kind='stable')][:limit]
+        return [self.features.artworks[i] for i in order]
+    
+    def _reasons_from_signals(self, signals: Dict[str, np.ndarray], i: int) -> List[str]:
+        """Similarity reasons for candidate i from precomputed signals"""
         reasons = []
-        
-        # Artist reason
-        if (artwork1.get('artist', '').lower() == 
-            artwork2.get('artist', '').lower()):
+        if signals['same_artist'][i]:
             reasons.append("Aynı sanatçı")
-        
-        # Period reason
-        year1 = artwork1.get('year', 0)
-        year2 = artwork2.get('year', 0)
-        if year1 and year2 and abs(year1 - year2) <= 50:
+        if signals['year_diff'][i] <= 50:
             reasons.append("Aynı dönem")
-        
-        # Movement reason
-        if (artwork1.get('movement', '').lower() == 
-            artwork2.get('movement', '').lower()):
+        if signals['same_movement'][i]:
             reasons.append("Aynı sanat akımı")
-        
-        # Theme reason (if similarity > 0.3)
-        theme_sim = self.similarity_calculator.calculate_text_similarity(
-            artwork1.get('story', ''),
-            artwork2.get('story', '')
-        )
-        if theme_sim > 0.3:
+        if signals['theme'][i] > 0.3:
             reasons.append("Benzer tema")
-        
         return reasons
 
 
@@ -4,9 +4,12 @@ Temporary replacement for Redis cache
 """
 
 import time
-from typing import Any, Optional, Dict
+from typing import Any, Dict, Iterable, Mapping, Optional
 import asyncio
 
+from app.cache_policy import get_or_refresh, jittered
+from app.memoize import memoize
+
 class SimpleCacheService:
     """Simple in-memory cache service"""
     
@@ -49,6 +52,18 @@ class SimpleCacheService:
         self.stats["misses"] += 1
         return None
     
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several values in one pass; missing keys are omitted"""
+        results = {}
+        now = time.time()
+        for key in keys:
+            if key in self.cache and now <= self.cache_ttl.get(key, now):
+                results[key] = self.cache[key]
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+        return results
+    
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set value in cache"""
         self.cache[key] = value
@@ -56,10 +71,21 @@ class SimpleCacheService:
         if ttl is None:
             ttl = self.default_ttl
         
-        self.cache_ttl[key] = time.time() + ttl
+        self.cache_ttl[key] = time.time() + jittered(ttl)
         self.stats["sets"] += 1
         return True
     
+    async def set_many(self, items: Mapping[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values in one pass"""
+        for key, value in items.items():
+            await self.set(key, value, ttl)
+        return True
+    
+    async def get_or_refresh(self, key: str, loader, soft_ttl: int, hard_ttl: Optional[int] = None,
+                             cacheable=None) -> Any:
+        """Stale-while-revalidate: soft TTL sonrası eski değer döner, arka planda yenilenir"""
+        return await get_or_refresh(self, key, loader, soft_ttl, hard_ttl, cacheable)
+    
     async def delete(self, key: str) -> bool:
         """Delete key from cache"""
         if key in self.cache:
@@ -135,23 +161,5 @@ class SimpleCacheService:
 redis_cache = SimpleCacheService()
 
 def redis_cache_decorator(ttl: int = 3600, key_prefix: str = ""):
-    """Cache decorator for functions"""
-    def decorator(func):
-        async def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = f"{key_prefix}:{func.__name__}:{hash(str(args) + str(kwargs))}"
-            
-            # Try to get from cache
-            cached_result = await redis_cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            # Execute function
-            result = await func(*args, **kwargs)
-            
-            # Cache result
-            await redis_cache.set(cache_key, result, ttl)
-            
-            return result
-        return wrapper
-    return decorator
+    """Cache decorator for functions (sync or async, stable keys); see app.memoize"""
+    return memoize(ttl=ttl, namespace=key_prefix or None, cache=redis_cache)
@@ -0,0 +1,143 @@
+"""
+Single Flight for ArtStoryAI
+Aynı anahtar için eşzamanlı pahalı çağrıları tek bir çalıştırmada birleştirir
+
+Bir anahtar için ilk çağıran işi başlatır; iş sürerken gelen diğer çağıranlar
+aynı sonucu bekler. İş, çağıranlardan bağımsız bir görev olarak çalışır: bir
+çağıranın iptal edilmesi veya zaman aşımına uğraması diğerlerini etkilemez.
+cancel_abandoned=True olan gruplarda bekleyen sayılır; son bekleyen de
+ayrılırsa paylaşılan iş iptal edilir (ör. yarışı kaybeden sağlayıcı istekleri).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from app.name_index import normalize_name
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def name_key(art_name: str) -> str:
+    """Eser adı anahtarı: yazım farkları aynı uçuşta birleşir"""
+    return normalize_name(art_name)
+
+
+def prompt_key(*parts: Any) -> str:
+    """Model + istek gövdesinden kararlı sha256 anahtarı"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Coalesces concurrent calls per key into one shared task"""
+
+    def __init__(self, name: str, cancel_abandoned: bool = False):
+        self.name = name
+        self.cancel_abandoned = cancel_abandoned
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        # Görev -> sonucunu bekleyen çağıran sayısı (yalnızca cancel_abandoned)
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.abandoned = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]],
+                 timeout: Optional[float] = None) -> T:
+        """
+        Anahtar için uçuştaki işi bekler, yoksa factory ile başlatır.
+
+        timeout yalnızca bu çağıranın bekleme süresidir; paylaşılan iş
+        tamamlanıp sonucunu (ör. önbelleğe) yazmaya devam eder. Grup
+        cancel_abandoned ise iş, sonucunu bekleyen kimse kalmayınca iptal edilir.
+        """
+        self.calls += 1
+        task = self._flights.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(factory())
+            self._flights[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        else:
+            self.coalesced += 1
+
+        if self.cancel_abandoned:
+            self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # shield: çağıranın iptali paylaşılan görevi iptal etmez
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            if self.cancel_abandoned:
+                self._leave(key, task)
+
+    def _leave(self, key: Hashable, task: asyncio.Task) -> None:
+        waiters = self._waiters.pop(task, 1) - 1
+        if waiters > 0:
+            self._waiters[task] = waiters
+        elif not task.done():
+            # Son bekleyen ayrıldı: yeni çağıranlar iptal edilen göreve bağlanmasın
+            self.abandoned += 1
+            if self._flights.get(key) is task:
+                del self._flights[key]
+            task.cancel()
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.errors += 1
+            logger.debug(f"Single flight {self.name}:{key} failed: {error}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "abandoned": self.abandoned,
+            "in_flight": self.in_flight,
+        }
+
+
+# Global instances
+# Eser kaydı üretimi (görsel + AI içerik), normalize eser adıyla
+artwork_flights = SingleFlight("artwork_content")
+# Görsel sağlayıcı şelalesi, normalize eser adıyla
+image_flights = SingleFlight("artwork_image")
+# OpenAI completion çağrıları, istek hash'iyle
+llm_flights = SingleFlight("openai_completion")
+# Stale-while-revalidate önbellek dolumları ve yenilemeleri, önbellek anahtarıyla
+refresh_flights = SingleFlight("cache_refresh")
+# app.memoize ile sarılmış async fonksiyonlar, memo anahtarıyla; bekleyeni kalmayan çağrı iptal edilir
+memo_flights = SingleFlight("memoized_call", cancel_abandoned=True)
+# Görsel proxy kaynak indirmeleri ve küçük resim üretimleri
+thumbnail_flights = SingleFlight("image_thumbnail")
+
+SINGLE_FLIGHT_GROUPS = (
+    artwork_flights, image_flights, llm_flights, refresh_flights, memo_flights, thumbnail_flights
+)
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    return {group.name: group.stats() for group in SINGLE_FLIGHT_GROUPS}
@@ -0,0 +1,56 @@
+"""
+Katalog görsellerinin renk özelliklerini hesaplama betiği
+
+Filtre görselleri ve içe aktarılmış MET kataloğundaki görselli eserler için
+k-means paleti, sıcak/soğuk oranları, doygunluk ve parlaklık istatistiklerini
+hesaplar; "Renk" filtresinin kullandığı indeksleri günceller. Yalnızca yeni
+veya görseli değişen eserler işlenir, betik yarıda kesilirse kaldığı yerden
+devam eder. Uygulama da aynı işi arka planda küçük partiler halinde yapar.
+
+Kullanım:
+    python compute_color_features.py
+    python compute_color_features.py --batch-size 500 --limit 2000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from app import image_processing
+from app.http_client import http_client
+from app.services.color_index import color_index
+
+
+async def run(batch_size: int, limit: int = None) -> int:
+    await http_client.startup()
+    total = 0
+    try:
+        while limit is None or total < limit:
+            size = batch_size if limit is None else min(batch_size, limit - total)
+            computed = await color_index.sync(limit=size)
+            if not computed:
+                break
+            total += computed
+            print(f"🎨 {total} görselin renk özellikleri hesaplandı")
+    finally:
+        await http_client.shutdown()
+        image_processing.shutdown_executor()
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Katalog görsellerinin renk özelliklerini hesaplar")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--limit", type=int, help="En fazla bu kadar görsel")
+    args = parser.parse_args()
+
+    started = time.time()
+    total = asyncio.run(run(args.batch_size, args.limit))
+    print(f"✅ Toplam {total} görsel {time.time() - started:.1f} sn içinde işlendi")
+    print(f"📚 Renk indeksi: {color_index.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+MET open-access kataloğunu içe aktarma betiği
+
+MetObjects.csv (https://github.com/metmuseum/openaccess) veya MET /objects
+yanıtlarından oluşan JSON / JSON Lines dökümünü okur; eserleri `artworks`
+tablosuna ve filtrelerin kullandığı yerel ters indekse yazar.
+
+Kullanım:
+    python ingest_met_catalog.py fixtures/met_objects_sample.csv
+    python ingest_met_catalog.py MetObjects.csv --classification Paintings --skip-db
+"""
+
+import argparse
+import re
+import sys
+import time
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+from app.services.met_catalog import CatalogRecord, met_catalog, read_dump
+
+
+def batched(records: Iterable[CatalogRecord], size: int) -> Iterator[List[CatalogRecord]]:
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def save_to_database(records: List[CatalogRecord]) -> None:
+    """Kayıtları `artworks` tablosuna external_id ile upsert eder"""
+    from app.database import SessionLocal
+    from app.models import Artwork
+
+    external_ids = [f"met_{record['object_id']}" for record in records]
+    db = SessionLocal()
+    try:
+        existing = {
+            artwork.external_id: artwork
+            for artwork in db.query(Artwork).filter(Artwork.external_id.in_(external_ids))
+        }
+        for external_id, record in zip(external_ids, records):
+            artwork = existing.get(external_id)
+            if artwork is None:
+                artwork = Artwork(external_id=external_id, source="met_open_access")
+                db.add(artwork)
+            year_text = record.get("year_text") or ""
+            artwork.title = record["title"][:200]
+            artwork.artist = record["artist"][:100]
+            artwork.year = record.get("year")
+            artwork.year_text = year_text[:50] or None
+            artwork.period = (record.get("period") or "")[:100] or None
+            artwork.style = (record.get("classification") or "")[:100] or None
+            artwork.culture = (record.get("culture") or "")[:100] or None
+            artwork.medium = (record.get("medium") or "")[:255] or None
+            artwork.museum = "MET Museum"
+            artwork.image_url = (record.get("image_url") or "")[:500] or None
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="MET open-access kataloğunu içe aktarır")
+    parser.add_argument("path", help="MetObjects.csv, .json veya .jsonl dökümü")
+    parser.add_argument("--classification", help="Yalnızca bu sınıflandırmayı içeren eserler (ör. Paintings)")
+    parser.add_argument("--public-domain-only", action="store_true", help="Yalnızca kamu malı eserler")
+    parser.add_argument("--limit", type=int, help="En fazla bu kadar eser")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--skip-db", action="store_true", help="Yalnızca yerel indeksi güncelle")
+    args = parser.parse_args()
+
+    records: Iterable[CatalogRecord] = read_dump(args.path)
+    if args.classification:
+        pattern = re.compile(re.escape(args.classification), re.IGNORECASE)
+        records = (r for r in records if pattern.search(r.get("classification", "")))
+    if args.public_domain_only:
+        records = (r for r in records if r.get("is_public_domain"))
+    if args.limit:
+        records = islice(records, args.limit)
+
+    use_db = not args.skip_db
+    started = time.time()
+    total = 0
+    for batch in batched(records, args.batch_size):
+        met_catalog.ingest(batch)
+        if use_db:
+            try:
+                save_to_database(batch)
+            except Exception as e:
+                print(f"⚠️ Veritabanına yazılamadı, yalnızca yerel indeks güncelleniyor: {e}")
+                use_db = False
+        total += len(batch)
+        print(f"📥 {total} eser içe aktarıldı")
+
+    print(f"✅ Toplam {total} eser {time.time() - started:.1f} sn içinde içe aktarıldı")
+    print(f"📚 Katalogdaki eser sayısı: {met_catalog.count()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+BK-Tree Test Dosyası
+pHash indeksinin Hamming uzaklığı aramalarını test eder
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.bk_tree import BKTree, hamming
+
+
+def test_search_matches_linear_scan():
+    """Ağaç araması tüm kayıtları taramakla aynı sonucu verir"""
+    print("🧪 Testing BK-tree search...")
+
+    rng = random.Random(42)
+    hashes = [rng.getrandbits(64) for _ in range(2000)]
+    tree = BKTree()
+    for index, value in enumerate(hashes):
+        tree.add(value, index)
+    assert len(tree) == len(hashes)
+
+    for _ in range(50):
+        query = rng.choice(hashes) ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64))
+        expected = sorted(
+            (hamming(query, value), index) for index, value in enumerate(hashes)
+            if hamming(query, value) <= 10
+        )
+        assert sorted(tree.search(query, 10)) == expected
+    print("✅ BK-tree search OK")
+
+
+def test_nearest_and_duplicates():
+    """Aynı hash'e sahip kayıtlar korunur; en yakın kayıt döner"""
+    print("🧪 Testing nearest lookup...")
+
+    tree = BKTree()
+    tree.add(0b1111, "a")
+    tree.add(0b1111, "b")
+    tree.add(0b0000, "c")
+    assert tree.nearest(0b0111, 2) == (1, "a")
+    assert [item for _, item in tree.search(0b1111, 0)] == ["a", "b"]
+    assert tree.nearest(0b1111 << 32, 3) is None
+    assert BKTree().nearest(0, 64) is None
+    print("✅ Nearest lookup OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI BK-Tree Test Suite")
+    print("=" * 50)
+
+    test_search_matches_linear_scan()
+    test_nearest_and_duplicates()
+
+    print("\n🎉 All tests completed successfully!")
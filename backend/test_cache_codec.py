@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Önbellek Kodlayıcı Test Dosyası
+msgpack/JSON gövdelerini, zstd sıkıştırmayı ve eski JSON değerlerini test eder
+
+msgpack, orjson ve zstandard isteğe bağlıdır; kurulu olmayan kütüphanenin
+testi atlanır.
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import cache_codec
+
+VALUE = {
+    "art_name": "Cennet Bahçesinden Kovulma",
+    "artist": "Masaccio",
+    "year": 1425,
+    "tags": ["Rönesans", "fresk"],
+    "score": 0.75,
+    "image": None,
+}
+LARGE_VALUE = {**VALUE, "story": "Âdem ile Havva cennetten kovulur. " * 200}
+
+
+class _Codec:
+    """cache_codec'in isteğe bağlı kütüphanelerini test süresince değiştirir"""
+
+    def __init__(self, **overrides):
+        self.overrides = overrides
+        self.saved = {}
+
+    def __enter__(self):
+        for name, value in self.overrides.items():
+            self.saved[name] = getattr(cache_codec, name)
+            setattr(cache_codec, name, value)
+
+    def __exit__(self, *exc):
+        for name, value in self.saved.items():
+            setattr(cache_codec, name, value)
+
+
+def test_json_roundtrip():
+    """msgpack yokken JSON gövdesi yazılır (orjson varsa onunla, yoksa json ile)"""
+    print("🧪 Testing JSON round-trip...")
+
+    with _Codec(msgpack=None, _compressor=None):
+        raw = cache_codec.encode(VALUE)
+        assert raw[:2] == cache_codec.FORMAT_JSON + cache_codec.COMPRESSION_NONE
+        assert cache_codec.decode(raw) == VALUE
+        assert cache_codec.decode(cache_codec.encode(LARGE_VALUE)) == LARGE_VALUE
+
+    with _Codec(msgpack=None, orjson=None, _compressor=None):
+        raw = cache_codec.encode(VALUE)
+        assert raw[:2] == b"J0" and cache_codec.decode(raw) == VALUE
+    print("✅ JSON round-trip OK")
+
+
+def test_msgpack_roundtrip():
+    """msgpack kuruluysa varsayılan biçim msgpack'tir"""
+    print("🧪 Testing msgpack round-trip...")
+
+    if cache_codec.msgpack is None:
+        print("⏭️ msgpack kurulu değil, atlandı")
+        return
+    with _Codec(_compressor=None):
+        raw = cache_codec.encode(VALUE)
+        assert raw[:2] == cache_codec.FORMAT_MSGPACK + cache_codec.COMPRESSION_NONE
+        assert cache_codec.decode(raw) == VALUE
+        assert len(raw) < len(json.dumps(VALUE, ensure_ascii=False).encode("utf-8"))
+    print("✅ msgpack round-trip OK")
+
+
+def test_zstd_roundtrip():
+    """Büyük gövdeler sıkıştırılır, küçükler ham kalır"""
+    print("🧪 Testing zstd round-trip...")
+
+    if cache_codec.zstandard is None:
+        print("⏭️ zstandard kurulu değil, atlandı")
+        return
+    raw = cache_codec.encode(LARGE_VALUE)
+    assert raw[1:2] == cache_codec.COMPRESSION_ZSTD
+    assert len(raw) < len(json.dumps(LARGE_VALUE).encode("utf-8")) // 4
+    assert cache_codec.decode(raw) == LARGE_VALUE
+    assert cache_codec.encode(VALUE)[1:2] == cache_codec.COMPRESSION_NONE
+
+    # Sıkıştırılmış değer zstandard olmadan okunamaz
+    with _Codec(_decompressor=None):
+        try:
+            cache_codec.decode(raw)
+            assert False, "ValueError bekleniyordu"
+        except ValueError:
+            pass
+    print("✅ zstd round-trip OK")
+
+
+def test_legacy_json():
+    """Başlıksız eski JSON metinleri (str veya bytes) okunmaya devam eder"""
+    print("🧪 Testing legacy JSON values...")
+
+    legacy = json.dumps(VALUE, ensure_ascii=False)
+    assert cache_codec.decode(legacy) == VALUE
+    assert cache_codec.decode(legacy.encode("utf-8")) == VALUE
+    assert cache_codec.decode("[1, 2, 3]") == [1, 2, 3]
+    assert cache_codec.decode('"Mona Lisa"') == "Mona Lisa"
+    print("✅ Legacy JSON OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI Cache Codec Test Suite")
+    print("=" * 50)
+
+    test_json_roundtrip()
+    test_msgpack_roundtrip()
+    test_zstd_roundtrip()
+    test_legacy_json()
+
+    print("\n🎉 All tests completed successfully!")
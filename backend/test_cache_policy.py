@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Önbellek Politikası Test Dosyası
+Stale-while-revalidate okumasını ve TTL jitter'ını test eder
+"""
+
+import sys
+import os
+import asyncio
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.cache_policy import ENVELOPE_REFRESH_AT, get_or_refresh, jittered, unwrap
+from app.cache_service import ArtworkCache
+from app.simple_cache import SimpleCacheService
+
+
+async def test_stale_while_revalidate():
+    """Soft TTL sonrası eski değer hemen döner, yenileme arka planda yapılır"""
+    print("🧪 Testing stale-while-revalidate...")
+
+    cache = SimpleCacheService()
+    loads = []
+
+    async def loader():
+        loads.append(time.time())
+        await asyncio.sleep(0.05)
+        return f"v{len(loads)}"
+
+    # İlk okuma senkron üretir, eşzamanlı okumalar tek üretimi bekler
+    results = await asyncio.gather(*[get_or_refresh(cache, "k", loader, soft_ttl=60) for _ in range(5)])
+    assert results == ["v1"] * 5 and len(loads) == 1
+
+    # Soft TTL'i geçmiş gibi yap: eski değer döner, arka planda yenilenir
+    cache.cache["k"][ENVELOPE_REFRESH_AT] = time.time() - 1
+    assert await get_or_refresh(cache, "k", loader, soft_ttl=60) == "v1"
+    await asyncio.sleep(0.1)
+    assert len(loads) == 2
+    assert await get_or_refresh(cache, "k", loader, soft_ttl=60) == "v2"
+
+    # Hard TTL dolunca kayıt yok, senkron yeniden üretilir
+    cache.cache_ttl["k"] = time.time() - 1
+    assert await get_or_refresh(cache, "k", loader, soft_ttl=60) == "v3"
+    print("✅ SWR OK")
+
+
+async def test_batch_get_many():
+    """get_many tek geçişte bulunanları döner; SWR zarfları unwrap ile açılır"""
+    print("🧪 Testing batch get_many/set_many...")
+
+    cache = SimpleCacheService()
+    await cache.set_many({"a": 1, "b": 2}, ttl=60)
+
+    async def loader():
+        return "c-value"
+
+    await get_or_refresh(cache, "c", loader, soft_ttl=60)
+    found = await cache.get_many(["a", "b", "c", "missing"])
+    assert set(found) == {"a", "b", "c"}
+    assert [unwrap(found[k]) for k in ("a", "b", "c")] == [1, 2, "c-value"]
+    print("✅ Batch OK")
+
+
+class FakeL2:
+    """Kalan TTL'leri bilinen Redis yerine geçen bellek içi L2"""
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    async def get_with_ttl(self, key):
+        return self.entries.get(key)
+
+    async def get_many_with_ttl(self, keys):
+        return {key: self.entries[key] for key in keys if key in self.entries}
+
+
+async def test_l2_promotion_ttl():
+    """L2'den L1'e taşınan kayıt Redis'te kalan süreden uzun yaşamaz"""
+    print("🧪 Testing L2 -> L1 promotion TTL...")
+
+    cache = ArtworkCache(max_bytes=1024 * 1024)
+    cache.redis_enabled = True
+    cache.redis_cache = FakeL2({
+        "negative": ({"miss": True}, 600.0),
+        "forever": ("v", None),
+        "expiring": ("x", 0.2),
+        "batch": ("b", 30.0),
+    })
+
+    def l1_ttl(key):
+        entry = cache.cache.window.get(key) or cache.cache.probation.get(key) or cache.cache.protected.get(key)
+        return entry.expires_at - time.time() if entry else None
+
+    assert await cache.get("negative") == {"miss": True}
+    assert 590 < l1_ttl("negative") <= 600
+    assert await cache.get("forever") == "v"
+    assert l1_ttl("forever") > cache.default_ttl - 10
+    # Bir saniyeden az kalan kayıt L1'e alınmaz
+    assert await cache.get("expiring") == "x" and l1_ttl("expiring") is None
+
+    found = await cache.get_many(["batch", "missing"])
+    assert found == {"batch": "b"} and 20 < l1_ttl("batch") <= 30
+    print("✅ Promotion TTL OK")
+
+
+def test_jitter():
+    """TTL'ler ±%10 içinde dağılır"""
+    print("🧪 Testing TTL jitter...")
+
+    values = [jittered(1000) for _ in range(200)]
+    assert all(900 <= v <= 1100 for v in values)
+    assert len(set(values)) > 1
+    print("✅ Jitter OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI Cache Policy Test Suite")
+    print("=" * 50)
+
+    asyncio.run(test_stale_while_revalidate())
+    asyncio.run(test_batch_get_many())
+    asyncio.run(test_l2_promotion_ttl())
+    test_jitter()
+
+    print("\n🎉 All tests completed successfully!")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Renk Özellikleri Test Dosyası
+Özellik vektörünün paketlenmesini ve "Renk" filtresi etiketlerini test eder
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.color_features import (
+    COLOR_LABELS, FEATURE_LENGTH, PALETTE_COLORS, color_labels, pack, palette_rgb, unpack,
+)
+
+
+def features(warm=0.0, cool=0.0, neutral=0.0, saturation=0.0, luminance=0.5, colorfulness=0.0, rgb=(0.5, 0.5, 0.5)):
+    palette = [*rgb, 1.0] + [0.0] * (PALETTE_COLORS - 1) * 4
+    return [warm, cool, neutral, saturation, 0.05, luminance, 0.1, colorfulness] + palette
+
+
+def test_pack_roundtrip():
+    """Vektör float16 olarak 2 bayt/değer saklanır"""
+    print("🧪 Testing feature packing...")
+
+    vector = features(warm=0.7, saturation=0.5, rgb=(0.8, 0.25, 0.125))
+    assert len(vector) == FEATURE_LENGTH
+    blob = pack(vector)
+    assert len(blob) == FEATURE_LENGTH * 2
+    assert all(abs(a - b) < 1e-3 for a, b in zip(unpack(blob), vector))
+    assert palette_rgb(unpack(blob)) == [{"rgb": (204, 64, 32), "ratio": 1.0}]
+    print("✅ Feature packing OK")
+
+
+def test_labels():
+    """Eşikler filtre seçenekleriyle aynı adlı etiketler üretir"""
+    print("🧪 Testing color labels...")
+
+    cases = [
+        (features(warm=0.8, cool=0.05, saturation=0.6, colorfulness=0.5), ["Sıcak", "Renkli", "Canlı"]),
+        (features(warm=0.1, cool=0.6, saturation=0.3, luminance=0.4), ["Soğuk"]),
+        (features(neutral=0.95, saturation=0.03), ["Monokrom"]),
+        (features(warm=0.4, cool=0.35, saturation=0.2, luminance=0.8), ["Pastel"]),
+        (features(warm=0.3, cool=0.3, saturation=0.5, luminance=0.2, colorfulness=0.6), ["Renkli"]),
+    ]
+    for vector, expected in cases:
+        labels = color_labels(vector)
+        print(f"  -> {labels}")
+        assert labels == expected, labels
+        assert set(labels) <= set(COLOR_LABELS)
+    print("✅ Color labels OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI Color Features Test Suite")
+    print("=" * 50)
+
+    test_pack_roundtrip()
+    test_labels()
+
+    print("\n🎉 All tests completed successfully!")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Faset İndeksi Test Dosyası
+Bitmap birleşim/kesişim, alt dize eşleşmesi ve gevşetme sırasını test eder
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.facet_index import FacetIndex, iter_bits
+
+ARTWORKS = [
+    {"title": "Venüs'ün Doğuşu", "period": "Erken Rönesans", "style": "Klasik", "museum": "Uffizi"},
+    {"title": "Atina Okulu", "period": "Yüksek Rönesans", "style": "Klasik", "museum": "Vatican Museums"},
+    {"title": "Gece Devriyesi", "period": "Barok", "style": "Realizm", "museum": "Rijksmuseum"},
+    {"title": "Yıldızlı Gece", "period": "Modern", "style": "Ekspresyonizm", "museum": "MoMA",
+     "colors": ["Soğuk", "Canlı"]},
+]
+
+
+def titles(index: FacetIndex, bits: int):
+    return [artwork["title"] for artwork in index.select(bits)]
+
+
+def test_union_and_intersection():
+    """Aynı fasetteki değerler birleşir, farklı fasetler kesişir"""
+    print("🧪 Testing union/intersection...")
+
+    index = FacetIndex(ARTWORKS)
+    assert list(iter_bits(0b1010)) == [1, 3]
+    assert titles(index, index.query({"periods": ["Barok", "Modern"]})) == ["Gece Devriyesi", "Yıldızlı Gece"]
+    assert titles(index, index.query({"periods": ["Rönesans"], "museums": ["Uffizi"]})) == ["Venüs'ün Doğuşu"]
+    assert index.query({"periods": ["Barok"], "styles": ["Klasik"]}) == 0
+    # Boş filtre listesi uygulanmaz
+    assert index.query({"periods": []}) == index.all_bits
+    print("✅ Union/intersection OK")
+
+
+def test_substring_matching():
+    """Filtre değeri normalize faset değerlerinde alt dize olarak aranır"""
+    print("🧪 Testing substring matching...")
+
+    index = FacetIndex(ARTWORKS)
+    assert titles(index, index.query({"periods": ["rönesans"]})) == ["Venüs'ün Doğuşu", "Atina Okulu"]
+    assert titles(index, index.query({"periods": ["YÜKSEK RÖNESANS"]})) == ["Atina Okulu"]
+    assert titles(index, index.query({"museums": ["vatican"]})) == ["Atina Okulu"]
+    # Çoğul alan adları da indekslenir
+    assert titles(index, index.query({"colors": ["Soğuk"]})) == ["Yıldızlı Gece"]
+    print("✅ Substring matching OK")
+
+
+def test_facets_without_data_ignored():
+    """Verisi olmayan fasetteki filtre sonucu boşaltmaz"""
+    print("🧪 Testing facets without data...")
+
+    index = FacetIndex(ARTWORKS)
+    assert not index.has_facet("sizes") and index.has_facet("colors")
+    assert index.query({"sizes": ["Büyük"], "periods": ["Barok"]}) == 0b0100
+    print("✅ Facets without data OK")
+
+
+def test_relaxation_order():
+    """Sonuç yoksa önce yalnızca dönem, o da boşsa yalnızca stil korunur"""
+    print("🧪 Testing relaxation order...")
+
+    index = FacetIndex(ARTWORKS)
+    bits, relaxed = index.search({"periods": ["Barok"], "styles": ["Klasik"]})
+    assert relaxed == "periods" and titles(index, bits) == ["Gece Devriyesi"]
+
+    # Dönem tek başına da sonuç vermezse stil denenir
+    bits, relaxed = index.search({"periods": ["Çağdaş"], "styles": ["Klasik"]})
+    assert relaxed == "styles" and titles(index, bits) == ["Venüs'ün Doğuşu", "Atina Okulu"]
+
+    bits, relaxed = index.search({"periods": ["Çağdaş"], "styles": ["Kübizm"]})
+    assert bits == 0 and relaxed is None
+
+    bits, relaxed = index.search({"periods": ["Modern"]})
+    assert relaxed is None and titles(index, bits) == ["Yıldızlı Gece"]
+    print("✅ Relaxation order OK")
+
+
+def test_always_include_and_extended():
+    """always_include maskesi her sonuçta kalır; eklenen eserler sona indekslenir"""
+    print("🧪 Testing always_include...")
+
+    base = FacetIndex(ARTWORKS[:2])
+    index = base.extended(ARTWORKS[2:])
+    assert index.artworks == ARTWORKS and base.artworks == ARTWORKS[:2]
+    assert base.query({"periods": ["Barok"]}) == 0
+    assert base.extended([]) is base
+
+    catalog_bits = 0b1000
+    bits, relaxed = index.search({"periods": ["Rönesans"]}, always_include=catalog_bits)
+    assert relaxed is None and titles(index, bits) == ["Venüs'ün Doğuşu", "Atina Okulu", "Yıldızlı Gece"]
+    # Filtre hiçbir şeye uymasa da maske döner, gevşetme yapılmaz
+    bits, relaxed = index.search({"periods": ["Çağdaş"]}, always_include=catalog_bits)
+    assert bits == catalog_bits and relaxed is None
+    print("✅ always_include OK")
+
+
+def test_facet_counts():
+    """Faset sayıları verilen sonuç kümesi üzerinden, çoktan aza sıralı"""
+    print("🧪 Testing facet counts...")
+
+    index = FacetIndex(ARTWORKS)
+    counts = index.facet_counts()
+    assert counts["styles"] == {"Klasik": 2, "Ekspresyonizm": 1, "Realizm": 1}
+    assert list(counts["styles"]) == ["Klasik", "Ekspresyonizm", "Realizm"]
+    assert counts["sizes"] == {}
+
+    counts = index.facet_counts(index.query({"periods": ["Rönesans"]}))
+    assert counts["museums"] == {"Uffizi": 1, "Vatican Museums": 1}
+    assert counts["colors"] == {}
+    print("✅ Facet counts OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI Facet Index Test Suite")
+    print("=" * 50)
+
+    test_union_and_intersection()
+    test_substring_matching()
+    test_facets_without_data_ignored()
+    test_relaxation_order()
+    test_always_include_and_extended()
+    test_facet_counts()
+
+    print("\n🎉 All tests completed successfully!")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Görsel Iska Kaydı Test Dosyası
+Sağlayıcı başına üstel bekleme pencerelerini test eder
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.local_store import LocalStore
+from app.services.image_miss_store import ImageMissStore
+
+
+async def test_backoff_windows():
+    """Iskalanan sağlayıcılar bekleme süresince atlanır, süre her ıskada ikiye katlanır"""
+    print("🧪 Testing image miss backoff...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = LocalStore(os.path.join(directory, "store.sqlite3"))
+        misses = ImageMissStore(store)
+
+        assert await misses.blocked_providers("Unknown Work") == set()
+        await misses.record_misses("Unknown Work", ["fetch_met_museum_image", "fetch_wikimedia_image"])
+        # Normalize ad: yazım farkları aynı kayda düşer
+        assert await misses.blocked_providers("unknown  work") == {"fetch_met_museum_image", "fetch_wikimedia_image"}
+
+        await misses.record_misses("Unknown Work", ["fetch_met_museum_image"])
+        row = store.fetchone("SELECT misses, last_miss_at, retry_at FROM image_misses WHERE provider = ?",
+                             ("fetch_met_museum_image",))
+        assert row["misses"] == 2
+        assert abs((row["retry_at"] - row["last_miss_at"]) - 2 * misses.base_delay) < 1
+        assert misses.retry_delay(30) == misses.max_delay
+
+        await misses.clear("Unknown Work")
+        assert await misses.blocked_providers("Unknown Work") == set()
+        store.close()
+    print("✅ Backoff OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI Image Miss Store Test Suite")
+    print("=" * 50)
+
+    asyncio.run(test_backoff_windows())
+
+    print("\n🎉 All tests completed successfully!")
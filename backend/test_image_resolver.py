@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Görsel Çözümleyici Test Dosyası
+Sağlayıcı yarışını ve ıska kayıtlarını ağ olmadan, sahte sağlayıcılarla test eder
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import aiohttp
+from yarl import URL
+
+from app.features.image_resolver import ImageResolver
+from app.features.image_sources import fetch_art_institute_image, fetch_met_museum_image, fetch_wikimedia_image
+from app.http_client import http_client
+from app.local_store import LocalStore
+from app.services.image_miss_store import ImageMissStore
+from app.single_flight import memo_flights
+
+
+def http_error(status: int) -> aiohttp.ClientResponseError:
+    url = URL("https://example.org/api")
+    return aiohttp.ClientResponseError(aiohttp.RequestInfo(url, "GET", {}, url), (), status=status)
+
+
+def stub_resolver(store: LocalStore, providers) -> ImageResolver:
+    """Sahte sağlayıcılarla, her sağlayıcı tek sorgu olacak şekilde çözümleyici"""
+    resolver = ImageResolver(grace_period=0.05, miss_store=ImageMissStore(store))
+    resolver.providers = providers
+    resolver.build_candidates = lambda art_name: [(provider, art_name) for provider in providers]
+    return resolver
+
+
+def delayed(name: str, delay: float, result, log):
+    """delay saniye sonra result döndüren, iptal edilirse log'a yazan sahte sağlayıcı"""
+    async def provider(query):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            log.append(name)
+            raise
+        return result
+    provider.__name__ = name
+    return provider
+
+
+async def test_grace_period_prefers_priority():
+    """Bekleme süresi içinde gelen yüksek öncelikli sonuç, önce gelen düşük öncelikliyi geçer"""
+    print("🧪 Testing grace period override...")
+
+    cancelled = []
+    resolver = ImageResolver(grace_period=0.2)
+    candidates = [
+        (delayed("fetch_high", 0.1, "https://example.org/high.jpg", cancelled), "q"),
+        (delayed("fetch_low", 0.01, "https://example.org/low.jpg", cancelled), "q"),
+    ]
+    assert await resolver._race(candidates) == ("https://example.org/high.jpg", "fetch_high")
+    assert cancelled == []
+    print("✅ Grace override OK")
+
+
+async def test_late_hit_ignored():
+    """Bekleme süresinden sonra gelen sonuç yok sayılır, kaybeden görevler iptal edilir"""
+    print("🧪 Testing late hits...")
+
+    cancelled = []
+    resolver = ImageResolver(grace_period=0.05)
+    candidates = [
+        (delayed("fetch_late", 0.5, "https://example.org/late.jpg", cancelled), "q"),
+        (delayed("fetch_slow_miss", 0.5, None, cancelled), "q"),
+        (delayed("fetch_fast", 0.01, "https://example.org/fast.jpg", cancelled), "q"),
+    ]
+    started = asyncio.get_running_loop().time()
+    assert await resolver._race(candidates) == ("https://example.org/fast.jpg", "fetch_fast")
+    assert asyncio.get_running_loop().time() - started < 0.3
+    assert sorted(cancelled) == ["fetch_late", "fetch_slow_miss"]
+    print("✅ Late hits OK")
+
+
+async def test_memoized_losers_cancelled():
+    """Önbellekli gerçek sağlayıcılarda da kaybeden HTTP istekleri iptal edilir"""
+    print("🧪 Testing memoized provider cancellation...")
+
+    cancelled = []
+    original = http_client.get_json
+
+    async def fake_get_json(provider, url, params=None, **kwargs):
+        if provider == "art_institute":
+            return {"data": [{"image_id": "abc"}]}
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(provider)
+            raise
+        return {}
+
+    http_client.get_json = fake_get_json
+    try:
+        # Önceki çalıştırmaların önbelleğine düşmemek için benzersiz sorgu
+        query = f"Race Test {os.getpid()} {asyncio.get_running_loop().time()}"
+        resolver = ImageResolver(grace_period=0.05)
+        candidates = [(fetch_art_institute_image, query), (fetch_met_museum_image, query),
+                      (fetch_wikimedia_image, query)]
+        url, provider = await resolver._race(candidates)
+        assert provider == "fetch_art_institute_image" and "/abc/" in url
+        await asyncio.sleep(0.05)
+        assert sorted(cancelled) == ["met_museum", "wikimedia"]
+        assert memo_flights.in_flight == 0
+    finally:
+        http_client.get_json = original
+    print("✅ Memoized provider cancellation OK")
+
+
+async def test_blocked_providers_not_called():
+    """Tüm sağlayıcılar bekleme süresindeyse hiçbir sağlayıcı çağrılmaz"""
+    print("🧪 Testing blocked providers...")
+
+    calls = []
+
+    async def fetch_first(query):
+        calls.append("first")
+        return None
+
+    async def fetch_second(query):
+        calls.append("second")
+        return None
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = LocalStore(os.path.join(directory, "store.sqlite3"))
+        resolver = stub_resolver(store, [fetch_first, fetch_second])
+
+        await resolver.miss_store.record_misses("Lost Work", ["fetch_first", "fetch_second"])
+        assert await resolver.resolve_with_provider("Lost Work") is None
+        assert calls == []
+        store.close()
+    print("✅ Blocked providers OK")
+
+
+async def test_miss_classification():
+    """Boş sonuç ve 4xx ıska sayılır; 5xx, 429 ve ağ hataları sayılmaz"""
+    print("🧪 Testing miss classification...")
+
+    async def fetch_empty(query):
+        return None
+
+    async def fetch_not_found(query):
+        raise http_error(404)
+
+    async def fetch_unavailable(query):
+        raise http_error(503)
+
+    async def fetch_rate_limited(query):
+        raise http_error(429)
+
+    async def fetch_timeout(query):
+        raise asyncio.TimeoutError()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = LocalStore(os.path.join(directory, "store.sqlite3"))
+        resolver = stub_resolver(store, [fetch_empty, fetch_not_found, fetch_unavailable,
+                                         fetch_rate_limited, fetch_timeout])
+
+        assert await resolver.resolve_with_provider("Lost Work") is None
+        assert await resolver.miss_store.blocked_providers("Lost Work") == {"fetch_empty", "fetch_not_found"}
+        store.close()
+    print("✅ Miss classification OK")
+
+
+async def test_transient_error_does_not_exempt_provider():
+    """Bir sorgudaki zaman aşımı, aynı sağlayıcının diğer sorgulardaki kesin yanıtını geçersiz kılmaz"""
+    print("🧪 Testing transient errors...")
+
+    async def fetch_flaky(query):
+        if query == "slow":
+            raise asyncio.TimeoutError()
+        return None
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = LocalStore(os.path.join(directory, "store.sqlite3"))
+        resolver = stub_resolver(store, [fetch_flaky])
+        resolver.build_candidates = lambda art_name: [(fetch_flaky, "slow"), (fetch_flaky, art_name)]
+
+        assert await resolver.resolve_with_provider("Lost Work") is None
+        assert await resolver.miss_store.blocked_providers("Lost Work") == {"fetch_flaky"}
+        store.close()
+    print("✅ Transient errors OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI Image Resolver Test Suite")
+    print("=" * 50)
+
+    asyncio.run(test_grace_period_prefers_priority())
+    asyncio.run(test_late_hit_ignored())
+    asyncio.run(test_memoized_losers_cancelled())
+    asyncio.run(test_blocked_providers_not_called())
+    asyncio.run(test_miss_classification())
+    asyncio.run(test_transient_error_does_not_exempt_provider())
+
+    print("\n🎉 All tests completed successfully!")
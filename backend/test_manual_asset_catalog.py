@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Manuel Görsel Kataloğu Test Dosyası
+Manifest yüklemesini ve klasör değişikliklerinin artımlı uygulanmasını test eder
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.manual_asset_catalog import ManualAssetCatalog
+
+
+def test_manifest_metadata():
+    """Manifestteki bilgiler dosyalara, eksik olanlar dosya adından türetilir"""
+    print("🧪 Testing manifest loading...")
+
+    directory = Path(tempfile.mkdtemp())
+    (directory / "davut.jpg").write_bytes(b"jpg")
+    (directory / "sari_ev.png").write_bytes(b"png")
+    (directory / "notlar.txt").write_text("görsel değil")
+    (directory / "manifest.json").write_text(
+        '{"artworks": {"davut.jpg": {"title": "Davut", "artist": "Michelangelo"}}}',
+        encoding="utf-8",
+    )
+
+    catalog = ManualAssetCatalog(directory)
+    assert sorted(catalog.assets) == ["davut.jpg", "sari_ev.png"]
+    assert catalog.get("davut.jpg").metadata["artist"] == "Michelangelo"
+    assert catalog.get("davut.jpg").name == "Davut"
+    assert catalog.get("sari_ev.png").name == "sari ev"
+    print("✅ Manifest OK")
+
+
+def test_incremental_refresh():
+    """Yalnızca değişen dosyalar dinleyicilere bildirilir"""
+    print("🧪 Testing incremental refresh...")
+
+    directory = Path(tempfile.mkdtemp())
+    (directory / "a.jpg").write_bytes(b"a")
+    catalog = ManualAssetCatalog(directory)
+
+    events = []
+    catalog.add_listener(lambda added, removed: events.append(
+        ([a.filename for a in added], [r.filename for r in removed])
+    ))
+    assert events == [(["a.jpg"], [])]
+
+    assert catalog.refresh() is False
+    (directory / "b.jpg").write_bytes(b"b")
+    assert catalog.refresh() is True
+    assert events[-1] == (["b.jpg"], [])
+
+    catalog.register("b.jpg", {"artwork_name": "Bee"})
+    assert events[-1] == (["b.jpg"], ["b.jpg"])
+    assert catalog.get("b.jpg").name == "Bee"
+
+    (directory / "a.jpg").unlink()
+    version = catalog.version
+    assert catalog.refresh() is True
+    assert events[-1] == ([], ["a.jpg"])
+    assert catalog.version == version + 1
+    print("✅ Refresh OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI Manual Asset Catalog Test Suite")
+    print("=" * 50)
+
+    test_manifest_metadata()
+    test_incremental_refresh()
+
+    print("\n🎉 All tests completed successfully!")
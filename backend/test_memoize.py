@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Memoize Test Dosyası
+Sync/async önbellek dekoratörünü, kararlı anahtarları ve negatif önbelleği test eder
+"""
+
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.cache_service import ArtworkCache
+from app.memoize import memo_key, memoize
+from app.simple_cache import SimpleCacheService
+
+
+async def test_async_memoize():
+    """Async sonuçlar saklanır, eşzamanlı çağrılar tek çalıştırmada birleşir"""
+    print("🧪 Testing async memoize...")
+
+    cache = SimpleCacheService()
+    calls = []
+
+    @memoize(ttl=60, namespace="test", negative_ttl=5, cache=cache)
+    async def lookup(name):
+        calls.append(name)
+        await asyncio.sleep(0.05)
+        return None if name == "missing" else name.upper()
+
+    results = await asyncio.gather(*[lookup("mona") for _ in range(5)])
+    assert results == ["MONA"] * 5 and calls == ["mona"]
+    assert await lookup("mona") == "MONA" and len(calls) == 1
+
+    # Negatif sonuç da (kısa TTL ile) saklanır
+    assert await lookup("missing") is None
+    assert await lookup("missing") is None
+    assert calls.count("missing") == 1
+    print("✅ Async memoize OK")
+
+
+def test_sync_memoize():
+    """Sync fonksiyonlar da sarılır; fallback sonuçları saklanmaz"""
+    print("🧪 Testing sync memoize...")
+
+    calls = []
+
+    @memoize(ttl=60, namespace="test", cacheable=lambda result: result != "fallback")
+    def describe(name, style="short"):
+        calls.append(name)
+        return "fallback" if name == "error" else f"{name}:{style}"
+
+    assert describe("scream", style="long") == "scream:long"
+    assert describe("scream", style="long") == "scream:long"
+    assert describe("error") == "fallback"
+    assert describe("error") == "fallback"
+    assert calls == ["scream", "error", "error"]
+    print("✅ Sync memoize OK")
+
+
+class FakeSyncRedis:
+    """Worker'lar arasında paylaşılan L2 yerine geçen sözlük"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get_with_ttl_sync(self, key):
+        return self.entries.get(key)
+
+    def set_sync(self, key, value, ttl=None):
+        self.entries[key] = (value, float(ttl))
+        return True
+
+
+def test_sync_shared_l2():
+    """Sync yol da L2'ye yazar: başka bir worker'ın L1'i boşken değer L2'den gelir"""
+    print("🧪 Testing sync L2 sharing...")
+
+    shared = FakeSyncRedis()
+    workers = [ArtworkCache(max_bytes=1024 * 1024) for _ in range(2)]
+    for worker in workers:
+        worker.redis_enabled = True
+        worker.redis_cache = shared
+
+    key = memo_key("test:describe", ("scream",), {})
+    workers[0].set_shared_sync(key, "scream:short", 60)
+    assert key in shared.entries
+    assert workers[1].get_shared_sync(key) == "scream:short"
+    assert workers[1].l2_hits == 1
+    # İkinci okuma L1'den
+    assert workers[1].get_shared_sync(key) == "scream:short" and workers[1].l2_hits == 1
+    print("✅ Sync L2 sharing OK")
+
+
+def test_stable_keys():
+    """Anahtarlar hash() yerine sha256 ile üretilir; kwargs sırası önemsizdir"""
+    print("🧪 Testing stable keys...")
+
+    key = memo_key("ns", ("a",), {"x": 1, "y": 2})
+    assert key == memo_key("ns", ("a",), {"y": 2, "x": 1})
+    assert key.startswith("memo:ns:") and len(key.rsplit(":", 1)[1]) == 64
+    print("✅ Stable keys OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI Memoize Test Suite")
+    print("=" * 50)
+
+    asyncio.run(test_async_memoize())
+    test_sync_memoize()
+    test_sync_shared_l2()
+    test_stable_keys()
+
+    print("\n🎉 All tests completed successfully!")
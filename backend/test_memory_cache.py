@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+L1 Önbellek Test Dosyası
+Bayt bütçesi, TinyLFU kabul politikası ve zamanlayıcı çarkını test eder
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.memory_cache import TimerWheel, TinyLFUCache
+
+
+def test_byte_budget_and_admission():
+    """Bellek bütçesi aşılmaz, sık erişilen anahtarlar taramaya dayanır"""
+    print("🧪 Testing byte budget and TinyLFU admission...")
+
+    cache = TinyLFUCache(200_000)
+    for i in range(10):
+        cache.set(f"hot{i}", "h" * 200, 3600)
+        for _ in range(10):
+            cache.get(f"hot{i}")
+
+    # Tek seferlik anahtarlarla tarama
+    for i in range(5000):
+        cache.set(f"scan{i}", "s" * 200, 3600)
+        assert cache.total_bytes <= cache.max_bytes
+
+    kept = sum(f"hot{i}" in cache for i in range(10))
+    stats = cache.stats()
+    print(f"  hot keys kept: {kept}/10, stats: {stats}")
+    assert kept == 10
+    assert stats["evictions"] + stats["rejections"] > 0
+    assert stats["memory_usage"] == cache.total_bytes
+    print("✅ Budget OK")
+
+
+def test_expiry():
+    """Süresi dolan girdiler okunmaz ve çark tarafından temizlenir"""
+    print("🧪 Testing expiry...")
+
+    wheel = TimerWheel(now=0)
+    wheel.schedule("a", 2.5)
+    wheel.schedule("b", 5000)  # çark süresinden uzun
+    assert wheel.advance(3) == ["a"]
+    assert wheel.advance(4200) == []
+    assert wheel.advance(5001) == ["b"]
+
+    cache = TinyLFUCache(10_000)
+    cache.set("gone", {"title": "Davut"}, 0)
+    assert cache.get("gone") is None
+    assert len(cache) == 0 and cache.total_bytes == 0
+    assert cache.stats()["expired_keys"] == 1
+    print("✅ Expiry OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI Memory Cache Test Suite")
+    print("=" * 50)
+
+    test_byte_budget_and_admission()
+    test_expiry()
+
+    print("\n🎉 All tests completed successfully!")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+MET Katalog Test Dosyası
+Örnek MET dökümünün içe aktarılmasını ve indeksli filtrelemeyi test eder
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.local_store import LocalStore
+from app.services.met_catalog import METCatalog, read_dump
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "met_objects_sample.csv")
+
+
+def test_catalog_filters():
+    """Dönem, stil, müze ve kültür filtreleri indeksten yanıtlanır"""
+    print("🧪 Testing MET catalog ingestion and filters...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LocalStore(os.path.join(tmp, "catalog.sqlite3"))
+        catalog = METCatalog(store)
+        ingested = catalog.ingest(read_dump(FIXTURE))
+        print(f"✅ {ingested} eser içe aktarıldı")
+        assert catalog.count() == ingested == 12
+
+        cases = [
+            ({"periods": ["Barok"]}, {"Young Woman with a Water Pitcher", "Aristotle with a Bust of Homer"}),
+            ({"styles": ["Empresyonizm"]}, {
+                "Wheat Field with Cypresses",
+                "The Monet Family in Their Garden at Argenteuil",
+                "Rehearsal of the Ballet Onstage",
+            }),
+            ({"styles": ["Kübizm"], "periods": ["Modern"]}, {"Gertrude Stein"}),
+            ({"cultures": ["Osmanlı"]}, {"Carpet with Floral Design"}),
+            ({"museums": ["Louvre"]}, set()),
+        ]
+        for filters, expected in cases:
+            artworks, total = catalog.search(filters)
+            titles = {artwork["title"] for artwork in artworks}
+            print(f"  {filters} -> {sorted(titles)}")
+            assert titles == expected, f"{filters}: {titles}"
+            assert total == len(expected)
+
+        # Aynı dökümü tekrar içe aktarmak kayıtları çoğaltmaz
+        catalog.ingest(read_dump(FIXTURE))
+        assert catalog.count() == 12
+        store.close()
+    print("✅ Catalog filters OK")
+
+
+def test_color_facet():
+    """Renk terimleri görselden hesaplanana kadar filtre uygulanmaz; yeniden içe aktarmada korunur"""
+    print("🧪 Testing MET catalog color facet...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LocalStore(os.path.join(tmp, "catalog.sqlite3"))
+        catalog = METCatalog(store)
+        catalog.ingest(read_dump(FIXTURE))
+        assert catalog.search({"colors": ["Sıcak"]})[1] == 12
+
+        artworks, _ = catalog.search({}, limit=2)
+        first, second = (int(artwork["id"]) for artwork in artworks)
+        catalog.set_colors([(first, ["Sıcak", "Canlı"]), (second, ["Soğuk"])])
+        assert catalog.search({"colors": ["Sıcak"]})[1] == 1
+        assert catalog.search({"colors": ["sicak", "Soğuk"]})[1] == 2
+        assert catalog.search({"colors": ["Monokrom"]})[1] == 0
+
+        catalog.ingest(read_dump(FIXTURE))
+        assert catalog.search({"colors": ["Canlı"]})[1] == 1
+        # Etiketler değişince eskileri silinir
+        catalog.set_colors([(first, ["Pastel"])])
+        assert catalog.search({"colors": ["Sıcak"]})[1] == 0
+        store.close()
+    print("✅ Color facet OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI MET Catalog Test Suite")
+    print("=" * 50)
+
+    test_catalog_filters()
+    test_color_facet()
+
+    print("\n🎉 All tests completed successfully!")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+İsim İndeksi Test Dosyası
+Eser adı normalizasyonu ve bulanık eşleştirmenin doğru çalıştığını test eder
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.name_index import NameIndex, normalize_name
+
+
+def test_normalize_name():
+    """Türkçe harf, aksan ve kesme işareti normalizasyonu"""
+    print("🧪 Testing name normalization...")
+
+    cases = {
+        "Venüs'ün Doğuşu": "venusun dogusu",
+        "İSTANBUL": "istanbul",
+        "IRISES": "irises",
+        "Campbell’ın Çorba Kutuları": "campbellin corba kutulari",
+        "  Sarı   Ev  ": "sari ev",
+        "Weeping-woman": "weeping woman",
+    }
+    for raw, expected in cases.items():
+        result = normalize_name(raw)
+        print(f"  {raw!r} -> {result!r}")
+        assert result == expected, f"{raw!r}: {result!r} != {expected!r}"
+    print("✅ Normalization OK")
+
+
+def test_name_index_lookup():
+    """Exact, alias, prefix and fuzzy lookups with deterministic ranking"""
+    print("\n🧪 Testing name index lookups...")
+
+    index = NameIndex()
+    index.add("Osman Hamdi Bey", "osman", aliases=["Kaplumbağa Terbiyecisi"])
+    index.add("Davut", "davut", aliases=["David"])
+    index.add("Sarı Ev", "sari_ev", aliases=["sarıev"])
+    index.add("Kafe Terasta Gece", "kafe")
+    index.add("Kafe", "kafe_short")
+
+    assert index.lookup("Davut") == "davut"
+    assert index.lookup("DAVİD") == "davut"
+    assert index.lookup("kaplumbaga terbiyecisi") == "osman"
+    assert index.lookup("sari ev") == "sari_ev"
+    # Ön ek eşleşmesi: en yakın uzunluktaki isim kazanır
+    assert index.lookup("Kafe Teras") == "kafe"
+    assert index.lookup("kafe") == "kafe_short"
+    assert index.lookup("bilinmeyen eser") is None
+
+    # Yazım hatası toleransı
+    index.remove("Kafe")
+    assert index.lookup("kafe terasda gece") == "kafe"
+
+    index.remove("Davut")
+    assert index.lookup("david") is None
+    print("✅ Lookups OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI Name Index Test Suite")
+    print("=" * 50)
+
+    test_normalize_name()
+    test_name_index_lookup()
+
+    print("\n🎉 All tests completed successfully!")
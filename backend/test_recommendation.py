@@ -126,6 +126,57 @@ def test_recommendation_engine():
         print(f"   - {artwork['art_name']} by {artwork['artist']} ({artwork['year']})")
 
 
+def test_theme_index():
+    """Test the corpus-level theme index"""
+    print("\n🧪 Testing Theme Index...")
+    
+    from app.services.recommendation_service import ThemeIndex, top_k_indices
+    
+    corpus = [
+        {'art_name': 'A', 'story': 'A beautiful landscape painting with rivers'},
+        {'art_name': 'B', 'story': 'A beautiful landscape artwork with mountains'},
+        {'art_name': 'C', 'story': 'Anti-war painting depicting the horrors of war'},
+    ]
+    index = ThemeIndex()
+    index.ensure(corpus)
+    scores = index.similarities(corpus[0])
+    print(f"✅ Theme scores for 'A': {scores}")
+    assert scores.shape == (3,)
+    assert scores[1] > scores[2]
+    
+    # Unchanged corpus must not trigger a rebuild
+    fingerprint = index.fingerprint
+    index.ensure(list(corpus))
+    assert index.fingerprint == fingerprint
+    
+    top = top_k_indices(scores, 2)
+    print(f"✅ Top-2 indices: {list(top)}")
+    assert list(top) == [0, 1]
+
+
+def test_artwork_catalog():
+    """Test that the catalog snapshot is shared and versioned"""
+    print("\n🧪 Testing Artwork Catalog...")
+    
+    from app.artwork_catalog import artwork_catalog
+    from app.manual_artworks import manual_artwork_manager
+    
+    first = artwork_catalog.snapshot()
+    assert artwork_catalog.snapshot() is first
+    print(f"✅ Catalog v{first.version}: {len(first)} artworks")
+    
+    manual_artwork_manager.add_manual_artwork("Test Eseri", {
+        "title": "Test Eseri", "artist": "Test", "year": "1900", "movement": "Test"
+    })
+    second = artwork_catalog.snapshot()
+    assert second.version > first.version
+    assert any(a['art_name'] == "Test Eseri" for a in second)
+    
+    manual_artwork_manager.remove_manual_artwork("Test Eseri")
+    assert artwork_catalog.snapshot().version > second.version
+    print("✅ Catalog rebuilt after manual artwork changes")
+
+
 def test_api_endpoints():
     """Test the API endpoints (requires running server)"""
     print("\n🧪 Testing API Endpoints...")
@@ -233,6 +284,8 @@ if __name__ == "__main__":
     try:
         test_similarity_calculator()
         test_recommendation_engine()
+        test_theme_index()
+        test_artwork_catalog()
         test_api_endpoints()
         
         print("\n🎉 All tests completed successfully!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Single Flight Test Dosyası
+Eşzamanlı çağrıların tek çalıştırmada birleştiğini ve iptal güvenliğini test eder
+"""
+
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.single_flight import SingleFlight, name_key, prompt_key
+
+
+async def test_coalescing():
+    """Aynı anahtar için tek çalıştırma, tüm çağıranlara aynı sonuç"""
+    print("🧪 Testing coalescing...")
+
+    flights = SingleFlight("test")
+    runs = 0
+
+    async def expensive():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.05)
+        return "sonuç"
+
+    results = await asyncio.gather(*[
+        flights.do(name_key(name), expensive)
+        for name in ["Sarı Ev", "sari ev", "SARI EV", "Sarı  Ev"]
+    ])
+    assert results == ["sonuç"] * 4
+    assert runs == 1
+    stats = flights.stats()
+    print(f"  stats: {stats}")
+    assert stats["coalesced"] == 3 and stats["in_flight"] == 0
+    assert prompt_key("gpt", {"a": 1, "b": 2}) == prompt_key("gpt", {"b": 2, "a": 1})
+    print("✅ Coalescing OK")
+
+
+async def test_timeout_and_cancellation():
+    """Bir çağıranın zaman aşımı/iptali paylaşılan işi durdurmaz"""
+    print("🧪 Testing timeout and cancellation safety...")
+
+    flights = SingleFlight("test")
+
+    async def slow():
+        await asyncio.sleep(0.1)
+        return 42
+
+    impatient = asyncio.ensure_future(flights.do("k", slow, timeout=0.01))
+    cancelled = asyncio.ensure_future(flights.do("k", slow))
+    patient = asyncio.ensure_future(flights.do("k", slow))
+    await asyncio.sleep(0.02)
+    cancelled.cancel()
+
+    assert await patient == 42
+    try:
+        await impatient
+        raise AssertionError("timeout bekleniyordu")
+    except asyncio.TimeoutError:
+        pass
+    assert cancelled.cancelled()
+    assert flights.stats()["executions"] == 1 and flights.stats()["timeouts"] == 1
+    print("✅ Timeout/cancellation OK")
+
+
+async def test_cancel_abandoned():
+    """cancel_abandoned: iş, son bekleyen ayrılınca iptal edilir"""
+    print("🧪 Testing abandoned flight cancellation...")
+
+    flights = SingleFlight("test", cancel_abandoned=True)
+    finished = []
+
+    async def slow():
+        await asyncio.sleep(0.1)
+        finished.append(True)
+        return 42
+
+    first = asyncio.ensure_future(flights.do("k", slow))
+    second = asyncio.ensure_future(flights.do("k", slow))
+    await asyncio.sleep(0.01)
+    # Bir bekleyen kaldıkça iş sürer
+    first.cancel()
+    assert await second == 42 and finished == [True]
+
+    abandoned = asyncio.ensure_future(flights.do("k", slow))
+    await asyncio.sleep(0.01)
+    abandoned.cancel()
+    await asyncio.sleep(0.15)
+    assert finished == [True] and "k" not in flights
+    assert flights.stats()["abandoned"] == 1
+
+    # İptal edilen işin yerine yeni çağrı yeni bir çalıştırma başlatır
+    assert await flights.do("k", slow) == 42 and flights.stats()["executions"] == 3
+    print("✅ Abandoned cancellation OK")
+
+
+if __name__ == "__main__":
+    print("🚀 ArtStoryAI Single Flight Test Suite")
+    print("=" * 50)
+
+    asyncio.run(test_coalescing())
+    asyncio.run(test_timeout_and_cancellation())
+    asyncio.run(test_cancel_abandoned())
+
+    print("\n🎉 All tests completed successfully!")
@@ -1,4 +1,5 @@
 import React from 'react';
+import { thumbnailSrcSet, thumbnailUrl } from '../../lib/imageProxy';
 
 interface ArtworkCardProps {
   id: string;
@@ -31,7 +32,10 @@ export default function ArtworkCard({
       <div className="relative h-32 sm:h-40 md:h-48 lg:h-56 bg-gray-200">
         {imageUrl ? (
           <img
-            src={imageUrl}
+            src={thumbnailUrl(imageUrl, 640)}
+            srcSet={thumbnailSrcSet(imageUrl)}
+            sizes="(min-width: 1024px) 25vw, (min-width: 640px) 50vw, 100vw"
+            loading="lazy"
             alt={title}
             className="w-full h-full object-cover"
             onError={(e) => {
@@ -6,6 +6,7 @@ import SmartFilterModal from '../components/SmartFilterModal';
 import { useFilterArtworks } from '../hooks/useFilterArtworks';
 import Header from '../components/Header';
 import Footer from '../components/Footer';
+import { thumbnailSrcSet, thumbnailUrl } from '../../lib/imageProxy';
 
 interface Artwork {
   id: string;
@@ -261,7 +262,10 @@ const DiscoverPage = () => {
                   <div className="relative overflow-hidden rounded-t-lg">
                     {artwork.imageUrl ? (
                       <img
-                        src={artwork.imageUrl}
+                        src={thumbnailUrl(artwork.imageUrl, 640)}
+                        srcSet={thumbnailSrcSet(artwork.imageUrl)}
+                        sizes="(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"
+                        loading="lazy"
                         alt={artwork.title}
                         className="w-full h-64 object-cover transition-transform duration-300 group-hover:scale-105"
                         onError={(e) => {
@@ -0,0 +1,23 @@
+import { API_CONFIG } from './config';
+
+// Backend küçük resim proxy'sinin standart genişlikleri (app/image_proxy.py)
+export const THUMBNAIL_WIDTHS = [160, 320, 640, 1280] as const;
+
+// Proxy'den geçebilecek kaynaklar: uzak müze görselleri ve backend'in manuel görselleri
+const isProxyable = (src: string): boolean =>
+  src.startsWith('http://') ||
+  src.startsWith('https://') ||
+  src.startsWith('/manual_images/') ||
+  src.startsWith('/manual-images/');
+
+// Görselin belirtilen genişlikteki WebP/AVIF varyantının URL'si
+export function thumbnailUrl(src: string, width: number): string {
+  if (!src || !isProxyable(src) || src.endsWith('.svg')) return src;
+  return `${API_CONFIG.BASE_URL}/images/thumbnail?src=${encodeURIComponent(src)}&w=${width}`;
+}
+
+// <img srcSet> için tüm standart genişlikler
+export function thumbnailSrcSet(src: string): string | undefined {
+  if (!src || !isProxyable(src) || src.endsWith('.svg')) return undefined;
+  return THUMBNAIL_WIDTHS.map((width) => `${thumbnailUrl(src, width)} ${width}w`).join(', ');
+}